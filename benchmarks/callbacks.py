@@ -0,0 +1,357 @@
+import argparse
+import gc
+import inspect
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import src.dashboard as dashboard
+from src.cache_warmer import request_body
+from src.metrics import CALLBACK_PATH
+from src.data_preparation import month_value
+from src.data_download import MANIFEST_FILENAME
+from src.synthetic_data import DEFAULT_TARGET_DIR, load_synthetic, parse_row_count, write_database
+
+BENCHMARK_DIR = os.path.dirname(__file__)
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# Dataset sizes and number of timed repetitions per callback and scenario
+DEFAULT_SIZES = '10k,100k,1M'
+DEFAULT_REPETITIONS = 7
+
+# A callback counts as regression if its median grows by more than this share and this many milliseconds
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_MIN_MS = 1.0
+
+# Callbacks depending on the filter selection (called with the values of a scenario)
+FILTER_CALLBACKS = [
+    'aktualisiere_allgemeine_diagramme',
+    'aktualisiere_verguetungen',
+    'aktualisiere_filteroptionen',
+    'update_unternehmen_links',
+    'update_unternehmen_rechts',
+    'update_job_titel_links',
+    'update_job_titel_rechts'
+]
+
+# Navigation targets of aktualisiere_dashboard and the output it is registered for
+NAVIGATION = {'allgemein': 'nav-allgemein', 'vergleich': 'nav-vergleich'}
+NAVIGATION_OUTPUT = 'hauptinhalt.children'
+
+
+def build_scenarios(datenrahmen: pd.DataFrame) -> dict[str, dict]:
+    """Derives the filter scenarios from the values present in the dataset.
+
+    * ``ohne_filter``: initial view without any filter.
+    * ``typisch``: one portal, the most frequent federal state and the latest month, compared
+      for the most frequent job title and company.
+    * ``worst_case``: every filter set, multi-select filters with all values but one, so that
+      the largest number of bitmaps is combined while most rows stay selected.
+
+    Args:
+        datenrahmen (pd.DataFrame): The prepared dataset.
+
+    Returns:
+        dict[str, dict]: Filter values by field name per scenario.
+    """
+    def haeufigste(spalte):
+        return datenrahmen[spalte].value_counts().index[0]
+
+    def alle_ausser_einem(spalte):
+        werte = sorted(datenrahmen[spalte].dropna().unique(), key=str)
+        return werte[:-1] if len(werte) > 1 else werte
+
+    monate = [month_value(schluessel) for schluessel in sorted(datenrahmen['Monat'].unique())]
+    vergleich = {'job_titel': haeufigste('Job_Titel'), 'unternehmen': haeufigste('Unternehmen')}
+    return {
+        'ohne_filter': {},
+        'typisch': {
+            'job_portal': [haeufigste('Portal_Name')],
+            'bundesland': [haeufigste('Bundesland')],
+            'monate': monate[-1:],
+            **vergleich
+        },
+        'worst_case': {
+            'job_portal': alle_ausser_einem('Portal_Name'),
+            'bundesland': alle_ausser_einem('Bundesland'),
+            'beschaeftigungsart': 'unbefristet',
+            'position': alle_ausser_einem('Position'),
+            'zeitmodell': 'Vollzeit',
+            'berufserfahrung': 1,
+            'monate': monate[1:] or monate,
+            'unternehmensgroesse': alle_ausser_einem('Unternehmensgröße'),
+            'branche': alle_ausser_einem('Kategorie'),
+            **vergleich
+        }
+    }
+
+
+def callback_arguments(funktion, szenario: dict) -> list:
+    """Maps the values of a scenario to the parameters of a callback.
+
+    Parameters are matched by name ('monat' and 'monate' are the same filter); the left side of
+    the comparison view receives the job title and company of the scenario, the right side none.
+    """
+    argumente = []
+    for name in inspect.signature(funktion).parameters:
+        if name.endswith('_rechts'):
+            argumente.append(None)
+            continue
+        name = name.removesuffix('_links')
+        argumente.append(szenario.get('monate' if name == 'monat' else name))
+    return argumente
+
+
+def measure(aufruf, wiederholungen: int, filter_engine) -> dict:
+    """Times a call after one warm-up run and measures its peak memory in a separate run.
+
+    The memoized filter results are discarded before every run, so each run resolves the filter
+    selection again, like the first request for a new selection. The peak memory is measured with
+    tracemalloc, which slows the call down and is therefore not part of the timed runs.
+
+    Args:
+        aufruf (callable): The call to time.
+        wiederholungen (int): Number of timed runs.
+        filter_engine (FilterEngine): Filter engine of the app whose memoized results are discarded.
+
+    Returns:
+        dict: Median, 95th percentile and minimum in milliseconds and the peak memory in MB.
+    """
+    filter_engine.clear()
+    aufruf()
+
+    zeiten = []
+    for _ in range(wiederholungen):
+        filter_engine.clear()
+        start = time.perf_counter()
+        aufruf()
+        zeiten.append((time.perf_counter() - start) * 1000)
+
+    filter_engine.clear()
+    gc.collect()
+    tracemalloc.start()
+    aufruf()
+    _, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median_ms': round(float(np.median(zeiten)), 3),
+        'p95_ms': round(float(np.percentile(zeiten, 95)), 3),
+        'min_ms': round(min(zeiten), 3),
+        'peak_mb': round(spitze / 1024 / 1024, 3)
+    }
+
+
+def load_dataset(zeilen: int) -> pd.DataFrame:
+    """Loads the synthetic dataset of the given size, generating it (with snapshot) on first use."""
+    verzeichnis = os.path.join(DEFAULT_TARGET_DIR, str(zeilen))
+    if not os.path.exists(os.path.join(verzeichnis, MANIFEST_FILENAME)):
+        print(f"Generating synthetic dataset with {zeilen} rows in {verzeichnis} ...")
+        write_database(verzeichnis, zeilen, snapshot=True)
+    return load_synthetic(verzeichnis)
+
+
+def run_benchmarks(groessen: list[int], wiederholungen: int = DEFAULT_REPETITIONS,
+                   callbacks: list[str] | None = None) -> dict:
+    """Times the dashboard callbacks on synthetic datasets of the given sizes.
+
+    For every size, the dashboard is built with :func:`src.dashboard.create_app` on the synthetic
+    dataset. The callbacks are called directly, bypassing the result cache, once per scenario of
+    :func:`build_scenarios`. ``aktualisiere_dashboard`` depends on the triggering navigation item, so
+    it is timed per navigation target through the callback route of the Flask test client, including
+    the request handling of Dash.
+
+    Args:
+        groessen (list[int]): Row counts of the synthetic datasets.
+        wiederholungen (int, optional): Timed runs per measurement. Defaults to DEFAULT_REPETITIONS.
+        callbacks (list[str] | None, optional): Names of the callbacks to time. Defaults to all.
+
+    Returns:
+        dict: Metadata of the run and one entry per callback, scenario and size.
+    """
+    ausgewaehlt = callbacks or FILTER_CALLBACKS + ['aktualisiere_dashboard']
+    ergebnisse = []
+    print(f"{'Callback':<36}{'Szenario':<14}{'Zeilen':>10}{'Median':>15}{'p95':>15}{'Spitze':>13}")
+    for zeilen in groessen:
+        datenrahmen = load_dataset(zeilen)
+        app = dashboard.create_app(config={'CACHE_WARMUP': False}, data_source=datenrahmen)
+        filter_engine = dashboard.app_kontext(app.server).filter_engine
+        szenarien = build_scenarios(datenrahmen)
+
+        for name in ausgewaehlt:
+            funktion = getattr(dashboard, name)
+            funktion = getattr(funktion, '__wrapped__', funktion)
+
+            if name == 'aktualisiere_dashboard':
+                client = app.server.test_client()
+                pfad = app.get_relative_path(f"/{CALLBACK_PATH}")
+                faelle = {}
+                for ziel, button in NAVIGATION.items():
+                    anfrage = request_body(NAVIGATION_OUTPUT, app.callback_map[NAVIGATION_OUTPUT],
+                                           {f'{button}.n_clicks': 1})
+                    anfrage['changedPropIds'] = [f'{button}.n_clicks']
+
+                    def aufruf(anfrage=anfrage):
+                        antwort = client.post(pfad, json=anfrage)
+                        if antwort.status_code != 200:
+                            raise RuntimeError(f"{name} failed with status {antwort.status_code}")
+                        return antwort
+                    faelle[ziel] = aufruf
+            else:
+                faelle = {szenario: lambda argumente=callback_arguments(funktion, werte): funktion(*argumente)
+                          for szenario, werte in szenarien.items()}
+
+            for szenario, aufruf in faelle.items():
+                # The callbacks read the data of the app from its context
+                with app.server.app_context():
+                    messung = measure(aufruf, wiederholungen, filter_engine)
+                ergebnisse.append({'callback': name, 'szenario': szenario, 'zeilen': zeilen, **messung})
+                print(f"{name:<36}{szenario:<14}{zeilen:>10}{messung['median_ms']:>12.2f} ms"
+                      f"{messung['p95_ms']:>12.2f} ms{messung['peak_mb']:>10.1f} MB")
+
+        del datenrahmen, app, filter_engine
+        gc.collect()
+
+    return {'meta': run_metadata(wiederholungen), 'ergebnisse': ergebnisse}
+
+
+def run_metadata(wiederholungen: int) -> dict:
+    """Describes the environment of a benchmark run, so results of different machines can be told apart."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=BENCHMARK_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'zeitpunkt': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'rechner': platform.node(),
+        'prozessor': platform.processor() or platform.machine(),
+        'wiederholungen': wiederholungen
+    }
+
+
+def compare_results(basis: dict, aktuell: dict, schwelle: float = DEFAULT_THRESHOLD,
+                    min_ms: float = DEFAULT_MIN_MS) -> list[dict]:
+    """Compares the medians of two benchmark runs.
+
+    Args:
+        basis (dict): Stored baseline run.
+        aktuell (dict): Current run.
+        schwelle (float, optional): Relative change of the median counting as regression or
+            improvement. Defaults to DEFAULT_THRESHOLD.
+        min_ms (float, optional): Minimum absolute change in milliseconds, so that noise of very
+            fast callbacks is not reported. Defaults to DEFAULT_MIN_MS.
+
+    Returns:
+        list[dict]: One entry per measurement contained in both runs, with the relative change
+        and a status ('regression', 'verbesserung' or 'unveraendert').
+    """
+    def schluessel(eintrag):
+        return eintrag['callback'], eintrag['szenario'], eintrag['zeilen']
+
+    vorher = {schluessel(eintrag): eintrag for eintrag in basis['ergebnisse']}
+    vergleich = []
+    for eintrag in aktuell['ergebnisse']:
+        alt = vorher.get(schluessel(eintrag))
+        if alt is None:
+            continue
+        differenz = eintrag['median_ms'] - alt['median_ms']
+        aenderung = differenz / alt['median_ms'] if alt['median_ms'] else 0.0
+        status = 'unveraendert'
+        if abs(differenz) >= min_ms and aenderung > schwelle:
+            status = 'regression'
+        elif abs(differenz) >= min_ms and aenderung < -schwelle:
+            status = 'verbesserung'
+        vergleich.append({'callback': eintrag['callback'], 'szenario': eintrag['szenario'],
+                          'zeilen': eintrag['zeilen'], 'basis_ms': alt['median_ms'],
+                          'aktuell_ms': eintrag['median_ms'], 'aenderung': round(aenderung, 3), 'status': status})
+    return vergleich
+
+
+def print_comparison(vergleich: list[dict]) -> None:
+    """Prints the comparison of two runs as a table."""
+    print(f"{'Callback':<36}{'Szenario':<14}{'Zeilen':>10}{'Basis (ms)':>12}{'Aktuell (ms)':>14}"
+          f"{'Änderung':>10}  Status")
+    for eintrag in vergleich:
+        print(f"{eintrag['callback']:<36}{eintrag['szenario']:<14}{eintrag['zeilen']:>10}"
+              f"{eintrag['basis_ms']:>12.2f}{eintrag['aktuell_ms']:>14.2f}{eintrag['aenderung']:>10.1%}"
+              f"  {eintrag['status']}")
+
+
+def _read_json(dateipfad: str) -> dict:
+    with open(dateipfad, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(dateipfad: str, daten: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(dateipfad)), exist_ok=True)
+    with open(dateipfad, 'w', encoding='utf-8') as f:
+        json.dump(daten, f, indent=2, ensure_ascii=False)
+
+
+def main(argumente: list[str] | None = None) -> int:
+    """Command line interface: ``run`` times the callbacks, ``compare`` checks two result files.
+
+    Returns:
+        int: Exit code, 1 if the comparison found a regression.
+    """
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the dashboard callbacks.")
+    befehle = parser.add_subparsers(dest='befehl', required=True)
+
+    ausfuehren = befehle.add_parser('run', help="Time the callbacks and store the results as JSON")
+    ausfuehren.add_argument('--zeilen', default=DEFAULT_SIZES,
+                            help=f"Comma-separated dataset sizes (default: {DEFAULT_SIZES})")
+    ausfuehren.add_argument('--wiederholungen', type=int, default=DEFAULT_REPETITIONS)
+    ausfuehren.add_argument('--callbacks', help="Comma-separated callback names (default: all)")
+    ausfuehren.add_argument('--ausgabe', help="Result file (default: benchmarks/results/<timestamp>.json)")
+    ausfuehren.add_argument('--als-baseline', action='store_true', help=f"Also store the results as {BASELINE_PATH}")
+    ausfuehren.add_argument('--baseline', help="Compare the results with this baseline afterwards")
+
+    vergleichen = befehle.add_parser('compare', help="Compare a result file with the baseline")
+    vergleichen.add_argument('aktuell', help="Result file of the current run")
+    vergleichen.add_argument('--baseline', default=BASELINE_PATH)
+
+    for unterbefehl in (ausfuehren, vergleichen):
+        unterbefehl.add_argument('--schwelle', type=float, default=DEFAULT_THRESHOLD,
+                                 help="Relative slowdown of the median counting as regression")
+        unterbefehl.add_argument('--min-ms', type=float, default=DEFAULT_MIN_MS,
+                                 help="Minimum absolute slowdown in milliseconds")
+    argumente = parser.parse_args(argumente)
+
+    if argumente.befehl == 'run':
+        groessen = [parse_row_count(wert) for wert in argumente.zeilen.split(',')]
+        callbacks = argumente.callbacks.split(',') if argumente.callbacks else None
+        aktuell = run_benchmarks(groessen, argumente.wiederholungen, callbacks)
+        ausgabe = argumente.ausgabe or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+        _write_json(ausgabe, aktuell)
+        print(f"Results written to: {ausgabe}")
+        if argumente.als_baseline:
+            _write_json(BASELINE_PATH, aktuell)
+            print(f"Baseline written to: {BASELINE_PATH}")
+        if not argumente.baseline:
+            return 0
+        basis = _read_json(argumente.baseline)
+    else:
+        aktuell = _read_json(argumente.aktuell)
+        basis = _read_json(argumente.baseline)
+
+    vergleich = compare_results(basis, aktuell, argumente.schwelle, argumente.min_ms)
+    print_comparison(vergleich)
+    regressionen = [eintrag for eintrag in vergleich if eintrag['status'] == 'regression']
+    print(f"{len(regressionen)} regression(s) of {len(vergleich)} measurements")
+    return 1 if regressionen else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+import requests
+from src.metrics import callback_label, parse_outputs
+
+DEFAULT_URL = 'http://localhost:8050'
+DEFAULT_USERS = 30
+DEFAULT_DURATION = 60.0
+
+# Mean pause of a simulated user between two interactions in seconds (0 = no pauses)
+DEFAULT_THINK_TIME = 2.0
+
+# Multi-select filters changed by the simulated users
+FILTER_IDS = [
+    'filter-job-portal',
+    'filter-bundesland',
+    'filter-monat',
+    'filter-branche',
+    'filter-position',
+    'filter-unternehmensgroesse'
+]
+
+# Maximum number of cascading rounds triggered by one interaction
+MAX_CASCADE = 5
+
+REQUEST_TIMEOUT = 120
+
+
+def collect_components(knoten, werte: dict, ids: set) -> None:
+    """Collects the properties of all components with an id from a layout (sub)tree."""
+    if isinstance(knoten, list):
+        for kind in knoten:
+            collect_components(kind, werte, ids)
+        return
+    if not isinstance(knoten, dict) or 'props' not in knoten:
+        return
+    eigenschaften = knoten['props']
+    komponente = eigenschaften.get('id')
+    if isinstance(komponente, str):
+        ids.add(komponente)
+        for name, wert in eigenschaften.items():
+            if name != 'children':
+                werte[(komponente, name)] = wert
+    for wert in eigenschaften.values():
+        if isinstance(wert, (dict, list)):
+            collect_components(wert, werte, ids)
+
+
+class LoadStatistics:
+    """Thread-safe collection of the latencies and errors per callback."""
+
+    def __init__(self):
+        self._sperre = threading.Lock()
+        self.latenzen = defaultdict(list)
+        self.fehler = defaultdict(int)
+        self.sequenzen = []
+
+    def record(self, name: str, sekunden: float, fehler: bool) -> None:
+        with self._sperre:
+            self.latenzen[name].append(sekunden * 1000)
+            if fehler:
+                self.fehler[name] += 1
+
+    def record_sequence(self, sekunden: float) -> None:
+        with self._sperre:
+            self.sequenzen.append(sekunden)
+
+    def report(self, dauer: float) -> dict:
+        """Summarizes throughput, latency percentiles and error rates per callback."""
+        def zusammenfassung(latenzen, fehler):
+            return {
+                'anfragen': len(latenzen),
+                'fehlerquote': round(fehler / len(latenzen), 4) if latenzen else 0.0,
+                'p50_ms': round(float(np.percentile(latenzen, 50)), 1) if latenzen else None,
+                'p90_ms': round(float(np.percentile(latenzen, 90)), 1) if latenzen else None,
+                'p99_ms': round(float(np.percentile(latenzen, 99)), 1) if latenzen else None,
+                'max_ms': round(max(latenzen), 1) if latenzen else None
+            }
+
+        with self._sperre:
+            alle = [latenz for latenzen in self.latenzen.values() for latenz in latenzen]
+            return {
+                'dauer_s': round(dauer, 1),
+                'sequenzen': len(self.sequenzen),
+                'durchsatz_rps': round(len(alle) / dauer, 2) if dauer else 0.0,
+                'gesamt': zusammenfassung(alle, sum(self.fehler.values())),
+                'callbacks': {name: zusammenfassung(latenzen, self.fehler[name])
+                              for name, latenzen in sorted(self.latenzen.items())}
+            }
+
+
+class SimulatedUser:
+    """Browser session replaying dashboard interactions via ``/_dash-update-component``.
+
+    The session keeps the current property values of all rendered components, like the Dash
+    renderer in the browser. Changing a property sends every callback depending on it, and the
+    properties returned by these callbacks trigger the dependent callbacks in turn (cascading
+    filter options). Components rendered by a callback, e.g. the comparison page, trigger their
+    initial callbacks.
+
+    Args:
+        basis_url (str): URL of the running dashboard.
+        statistik (LoadStatistics): Shared collection of the measurements.
+        denkzeit (float): Mean pause between two interactions in seconds.
+        rng (random.Random): Random generator of this user.
+    """
+
+    def __init__(self, basis_url: str, statistik: LoadStatistics, denkzeit: float, rng: random.Random):
+        self.basis_url = basis_url.rstrip('/')
+        self.statistik = statistik
+        self.denkzeit = denkzeit
+        self.rng = rng
+        self.sitzung = requests.Session()
+        self.werte = {}
+        self.ids = set()
+        self.kinder = {}
+        self.abhaengigkeiten = []
+
+    def _get(self, pfad: str, name: str):
+        start = time.perf_counter()
+        try:
+            antwort = self.sitzung.get(self.basis_url + pfad, timeout=REQUEST_TIMEOUT)
+            fehler = antwort.status_code >= 400
+        except requests.RequestException:
+            antwort, fehler = None, True
+        self.statistik.record(name, time.perf_counter() - start, fehler)
+        return antwort if not fehler else None
+
+    def open_dashboard(self) -> None:
+        """Loads the page, its layout and callback definitions and runs the initial callbacks."""
+        self._get('/', 'GET /')
+        layout = self._get('/_dash-layout', 'GET /_dash-layout')
+        abhaengigkeiten = self._get('/_dash-dependencies', 'GET /_dash-dependencies')
+        if layout is None or abhaengigkeiten is None:
+            raise RuntimeError(f"Dashboard at {self.basis_url} is not reachable")
+
+        self.werte, self.ids, self.kinder = {}, set(), {}
+        collect_components(layout.json(), self.werte, self.ids)
+        # Pattern-matching and clientside callbacks are not replayed
+        self.abhaengigkeiten = [
+            abhaengigkeit for abhaengigkeit in abhaengigkeiten.json()
+            if not abhaengigkeit.get('clientside_function')
+            and all(isinstance(eingabe['id'], str) for eingabe in abhaengigkeit['inputs'] + abhaengigkeit['state'])
+        ]
+        self._run_initial(self.ids)
+
+    def _is_rendered(self, abhaengigkeit: dict) -> bool:
+        komponenten = [eingabe['id'] for eingabe in abhaengigkeit['inputs']]
+        komponenten += [komponente for komponente, _ in parse_outputs(abhaengigkeit['output'])]
+        return all(komponente in self.ids for komponente in komponenten)
+
+    def _run_initial(self, neue_ids: set) -> None:
+        """Runs the initial callbacks of newly rendered components."""
+        initial = [
+            abhaengigkeit for abhaengigkeit in self.abhaengigkeiten
+            if not abhaengigkeit.get('prevent_initial_call') and self._is_rendered(abhaengigkeit)
+            and any(komponente in neue_ids for komponente, _ in parse_outputs(abhaengigkeit['output']))
+        ]
+        self._run(initial, [])
+
+    def change(self, komponente: str, eigenschaft: str, wert) -> None:
+        """Sets a property like a user interaction and runs all callbacks depending on it."""
+        self.werte[(komponente, eigenschaft)] = wert
+        geaendert = [(komponente, eigenschaft)]
+        for _ in range(MAX_CASCADE):
+            betroffen = [
+                abhaengigkeit for abhaengigkeit in self.abhaengigkeiten
+                if self._is_rendered(abhaengigkeit)
+                and any((eingabe['id'], eingabe['property']) in geaendert for eingabe in abhaengigkeit['inputs'])
+            ]
+            if not betroffen:
+                return
+            geaendert = self._run(betroffen, geaendert)
+
+    def _run(self, abhaengigkeiten: list[dict], ausloeser: list[tuple]) -> list[tuple]:
+        """Sends the given callbacks and applies their responses; returns the changed properties."""
+        geaendert, neue_ids = [], set()
+        for abhaengigkeit in abhaengigkeiten:
+            ausgaben = parse_outputs(abhaengigkeit['output'])
+            ausgaben_liste = [{'id': komponente, 'property': eigenschaft} for komponente, eigenschaft in ausgaben]
+            nutzlast = {
+                'output': abhaengigkeit['output'],
+                'outputs': ausgaben_liste if abhaengigkeit['output'].startswith('..') else ausgaben_liste[0],
+                'inputs': [{**eingabe, 'value': self.werte.get((eingabe['id'], eingabe['property']))}
+                           for eingabe in abhaengigkeit['inputs']],
+                'state': [{**zustand, 'value': self.werte.get((zustand['id'], zustand['property']))}
+                          for zustand in abhaengigkeit['state']],
+                'changedPropIds': [f"{komponente}.{eigenschaft}" for komponente, eigenschaft in ausloeser
+                                   if {'id': komponente, 'property': eigenschaft} in abhaengigkeit['inputs']]
+            }
+
+            start = time.perf_counter()
+            try:
+                antwort = self.sitzung.post(f"{self.basis_url}/_dash-update-component", json=nutzlast,
+                                            timeout=REQUEST_TIMEOUT)
+                fehler = antwort.status_code >= 400
+            except requests.RequestException:
+                antwort, fehler = None, True
+            self.statistik.record(callback_label(abhaengigkeit['output']), time.perf_counter() - start, fehler)
+
+            # 204: the callback prevented the update
+            if fehler or antwort.status_code == 204:
+                continue
+            for komponente, eigenschaften in antwort.json().get('response', {}).items():
+                for eigenschaft, wert in eigenschaften.items():
+                    self.werte[(komponente, eigenschaft)] = wert
+                    geaendert.append((komponente, eigenschaft))
+                    if eigenschaft == 'children':
+                        # The new children replace the components rendered there before
+                        self.ids -= self.kinder.get(komponente, set())
+                        self.kinder[komponente] = set()
+                        collect_components(wert, self.werte, self.kinder[komponente])
+                        self.ids |= self.kinder[komponente]
+                        neue_ids |= self.kinder[komponente]
+
+        if neue_ids:
+            self._run_initial(neue_ids)
+        return geaendert
+
+    def _options(self, komponente: str) -> list:
+        optionen = self.werte.get((komponente, 'options')) or []
+        return [option['value'] if isinstance(option, dict) else option for option in optionen]
+
+    def _pause(self) -> None:
+        if self.denkzeit > 0:
+            time.sleep(self.rng.expovariate(1 / self.denkzeit))
+
+    def run_sequence(self) -> None:
+        """Replays one typical session: open the dashboard, change filters, compare two companies."""
+        start = time.perf_counter()
+        self.open_dashboard()
+        self._pause()
+
+        # Change one to three filters, each time picking from the current (cascaded) options
+        for komponente in self.rng.sample(FILTER_IDS, self.rng.randint(1, 3)):
+            optionen = self._options(komponente)
+            if optionen:
+                self.change(komponente, 'value', self.rng.sample(optionen, self.rng.randint(1, min(3, len(optionen)))))
+            self._pause()
+
+        # Switch to the comparison page and pick a company on both sides
+        self.change('nav-vergleich', 'n_clicks', 1)
+        self._pause()
+        for komponente in ('filter-unternehmen-links', 'filter-unternehmen-rechts'):
+            optionen = self._options(komponente)
+            if optionen:
+                self.change(komponente, 'value', self.rng.choice(optionen))
+            self._pause()
+
+        self.statistik.record_sequence(time.perf_counter() - start)
+
+
+def run_load_test(basis_url: str = DEFAULT_URL, benutzer: int = DEFAULT_USERS, dauer: float = DEFAULT_DURATION,
+                  denkzeit: float = DEFAULT_THINK_TIME, anlaufzeit: float = 0.0, seed: int = 0) -> dict:
+    """Runs concurrent simulated users against a running dashboard.
+
+    Every user repeats the interaction sequence of :meth:`SimulatedUser.run_sequence` until the
+    duration has elapsed; sequences started before that are finished.
+
+    Args:
+        basis_url (str, optional): URL of the dashboard. Defaults to DEFAULT_URL.
+        benutzer (int, optional): Number of concurrent users. Defaults to DEFAULT_USERS.
+        dauer (float, optional): Duration of the test in seconds. Defaults to DEFAULT_DURATION.
+        denkzeit (float, optional): Mean pause between interactions in seconds. Defaults to DEFAULT_THINK_TIME.
+        anlaufzeit (float, optional): Seconds over which the start of the users is spread. Defaults to 0.
+        seed (int, optional): Seed of the random choices of the users. Defaults to 0.
+
+    Returns:
+        dict: Settings of the run, throughput, latency percentiles and error rates per callback.
+    """
+    statistik = LoadStatistics()
+    ende = time.monotonic() + dauer
+
+    def benutzer_ausfuehren(nummer):
+        time.sleep(anlaufzeit * nummer / benutzer)
+        nutzer = SimulatedUser(basis_url, statistik, denkzeit, random.Random(seed * 100_000 + nummer))
+        while time.monotonic() < ende:
+            try:
+                nutzer.run_sequence()
+            except Exception as e:
+                statistik.record('sequenz', 0.0, True)
+                print(f"User {nummer}: {e}")
+                time.sleep(1)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=benutzer) as pool:
+        list(pool.map(benutzer_ausfuehren, range(benutzer)))
+
+    bericht = statistik.report(time.perf_counter() - start)
+    bericht['einstellungen'] = {'url': basis_url, 'benutzer': benutzer, 'dauer_s': dauer, 'denkzeit_s': denkzeit,
+                                'anlaufzeit_s': anlaufzeit, 'zeitpunkt': datetime.now().isoformat(timespec='seconds')}
+    return bericht
+
+
+def print_report(bericht: dict) -> None:
+    """Prints the throughput and the latencies per callback as a table."""
+    print(f"{bericht['einstellungen']['benutzer']} users, {bericht['dauer_s']} s, "
+          f"{bericht['sequenzen']} sequences, {bericht['durchsatz_rps']} requests/s")
+    print(f"{'Callback':<48}{'Anfragen':>10}{'Fehler':>9}{'p50 (ms)':>10}{'p90 (ms)':>10}"
+          f"{'p99 (ms)':>10}{'max (ms)':>10}")
+    zeilen = list(bericht['callbacks'].items()) + [('gesamt', bericht['gesamt'])]
+    for name, werte in zeilen:
+        print(f"{name[:47]:<48}{werte['anfragen']:>10}{werte['fehlerquote']:>9.1%}{werte['p50_ms'] or 0:>10.1f}"
+              f"{werte['p90_ms'] or 0:>10.1f}{werte['p99_ms'] or 0:>10.1f}{werte['max_ms'] or 0:>10.1f}")
+
+
+def serve(zeilen: int, workers: int, threads: int, port: int) -> None:
+    """Serves the dashboard with gunicorn on a synthetic dataset of the given size."""
+    from src.dashboard import create_app
+    from src.main import run_production_server
+    from benchmarks.callbacks import load_dataset
+
+    run_production_server(create_app(data_source=load_dataset(zeilen)).server, workers, threads, port)
+
+
+def main(argumente: list[str] | None = None) -> int:
+    """Command line interface: ``serve`` starts the dashboard on synthetic data, ``run`` drives the load."""
+    from src.main import GUNICORN_THREADS, GUNICORN_WORKERS, PORT
+    from src.synthetic_data import parse_row_count
+
+    parser = argparse.ArgumentParser(description="Load test of the dashboard with concurrent simulated users.")
+    befehle = parser.add_subparsers(dest='befehl', required=True)
+
+    starten = befehle.add_parser('serve', help="Serve the dashboard with gunicorn on a synthetic dataset")
+    starten.add_argument('--zeilen', type=parse_row_count, default=parse_row_count('1M'))
+    starten.add_argument('--workers', type=int, default=GUNICORN_WORKERS)
+    starten.add_argument('--threads', type=int, default=GUNICORN_THREADS)
+    starten.add_argument('--port', type=int, default=PORT)
+
+    ausfuehren = befehle.add_parser('run', help="Run simulated users against a running dashboard")
+    ausfuehren.add_argument('--url', default=DEFAULT_URL)
+    ausfuehren.add_argument('--benutzer', type=int, default=DEFAULT_USERS, help="Number of concurrent users")
+    ausfuehren.add_argument('--dauer', type=float, default=DEFAULT_DURATION, help="Duration in seconds")
+    ausfuehren.add_argument('--denkzeit', type=float, default=DEFAULT_THINK_TIME,
+                            help="Mean pause between interactions in seconds (0 = no pauses)")
+    ausfuehren.add_argument('--anlaufzeit', type=float, default=0.0, help="Seconds to spread the user start over")
+    ausfuehren.add_argument('--seed', type=int, default=0)
+    ausfuehren.add_argument('--ausgabe', help="Store the report as JSON")
+    argumente = parser.parse_args(argumente)
+
+    if argumente.befehl == 'serve':
+        serve(argumente.zeilen, argumente.workers, argumente.threads, argumente.port)
+        return 0
+
+    bericht = run_load_test(argumente.url, argumente.benutzer, argumente.dauer, argumente.denkzeit,
+                            argumente.anlaufzeit, argumente.seed)
+    print_report(bericht)
+    if argumente.ausgabe:
+        os.makedirs(os.path.dirname(os.path.abspath(argumente.ausgabe)), exist_ok=True)
+        with open(argumente.ausgabe, 'w', encoding='utf-8') as f:
+            json.dump(bericht, f, indent=2, ensure_ascii=False)
+    return 1 if bericht['gesamt']['fehlerquote'] > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
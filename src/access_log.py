@@ -0,0 +1,328 @@
+import argparse
+from collections import defaultdict
+from datetime import datetime
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+import flask
+import numpy as np
+from src.metrics import CALLBACK_PATH, WARMUP_HEADER, callback_label
+
+# Log every filter callback request as one JSON line (disable with ACCESS_LOG=0)
+ACCESS_LOG_ENABLED = os.getenv("ACCESS_LOG", "1") == "1"
+ACCESS_LOG_PATH = os.getenv("ACCESS_LOG_PATH", os.path.join(Path(__file__).parent, "cache", "access_log.jsonl"))
+
+# Size from which the log is rotated, and number of rotated files kept (access_log.jsonl.1, .2, ...)
+ACCESS_LOG_MAX_BYTES = int(float(os.getenv("ACCESS_LOG_MAX_MB", "50")) * 1024 * 1024)
+ACCESS_LOG_BACKUPS = int(os.getenv("ACCESS_LOG_BACKUPS", "3"))
+
+# Only the values of the filter components are logged; other inputs and all states (e.g. the
+# admin password or the job title list) never leave the request
+FILTER_PREFIX = 'filter-'
+
+# Number of rows per table of the analysis
+DEFAULT_TOP = 10
+
+
+def _normalize_value(wert):
+    """Unifies empty selections (None, [] or '') and sorts multi-selections."""
+    if wert in (None, '', []):
+        return None
+    if isinstance(wert, list):
+        try:
+            return sorted(wert)
+        except TypeError:
+            return wert
+    return wert
+
+
+def is_filter_input(eintrag: dict) -> bool:
+    """Whether an input (of a request or a callback specification) is the value of a filter component."""
+    komponente = eintrag.get('id')
+    return (isinstance(komponente, str) and komponente.startswith(FILTER_PREFIX)
+            and eintrag.get('property') == 'value')
+
+
+def is_filter_request(daten: dict) -> bool:
+    """Whether a callback request is triggered only by filter values (see :func:`is_filter_input`)."""
+    eingaben = daten.get('inputs', [])
+    return bool(eingaben) and all(isinstance(eintrag, dict) and is_filter_input(eintrag) for eintrag in eingaben)
+
+
+def normalize_inputs(daten: dict) -> dict:
+    """Returns the filter values of a callback request as canonical mapping.
+
+    Keys are the properties ('<component id>.<property>'), values are normalized like the filter
+    keys of the result cache, so that equal selections match. Inputs of other components and the
+    state of the request are left out, so no user entries other than filter selections are kept.
+
+    Args:
+        daten (dict): Body of a request to ``/_dash-update-component`` (or any mapping with 'inputs').
+
+    Returns:
+        dict: Normalized values, sorted by key.
+    """
+    werte = {f"{eintrag['id']}.{eintrag['property']}": _normalize_value(eintrag.get('value'))
+             for eintrag in daten.get('inputs', []) if isinstance(eintrag, dict) and is_filter_input(eintrag)}
+    return dict(sorted(werte.items()))
+
+
+def inputs_hash(werte: dict) -> str:
+    """Short hash identifying a normalized input combination."""
+    inhalt = json.dumps(werte, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(inhalt.encode('utf-8')).hexdigest()[:16]
+
+
+def note_cache(treffer: bool) -> None:
+    """Records whether the result cache answered the current callback request."""
+    if flask.has_request_context() and 'zugriff_start' in flask.g:
+        flask.g.zugriff_cache = 'hit' if treffer else 'miss'
+
+
+def log_files(pfad: str = ACCESS_LOG_PATH, backups: int = ACCESS_LOG_BACKUPS) -> list[str]:
+    """Returns the existing files of a rotated log, oldest first."""
+    kandidaten = [f"{pfad}.{nummer}" for nummer in range(backups, 0, -1)] + [pfad]
+    return [kandidat for kandidat in kandidaten if os.path.exists(kandidat)]
+
+
+class AccessLog:
+    """Structured log of the filter callback requests, one JSON line per request.
+
+    Each line holds the time, the callback (its label and output string), the normalized filter
+    values with their hash, the triggering properties, the latency, the size of the response, the
+    HTTP status, whether the result cache answered it ('hit', 'miss' or null for uncached callbacks),
+    the dataset version and the process. Only callbacks triggered by filter values are logged (see
+    :func:`is_filter_request`); navigation and admin callbacks, e.g. the password check, are not.
+
+    Every line is appended with a single write, so several gunicorn workers can share one file.
+    Once the file exceeds ``max_bytes``, it is renamed to ``<pfad>.1`` (older files are shifted up
+    to ``<pfad>.<backups>``, the oldest is dropped) and a new file is started.
+
+    Args:
+        pfad (str, optional): Path of the log file. Defaults to ACCESS_LOG_PATH.
+        aktiv (bool, optional): Whether requests are logged. Defaults to ACCESS_LOG_ENABLED.
+        max_bytes (int, optional): Size from which the log is rotated. Defaults to ACCESS_LOG_MAX_BYTES.
+        backups (int, optional): Number of rotated files kept. Defaults to ACCESS_LOG_BACKUPS.
+    """
+
+    def __init__(self, pfad: str = ACCESS_LOG_PATH, aktiv: bool = ACCESS_LOG_ENABLED,
+                 max_bytes: int = ACCESS_LOG_MAX_BYTES, backups: int = ACCESS_LOG_BACKUPS):
+        self.pfad = pfad
+        self.aktiv = aktiv
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def write(self, eintrag: dict) -> None:
+        """Appends one entry to the log and rotates it when it has become too large."""
+        zeile = json.dumps(eintrag, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.pfad)), exist_ok=True)
+            datei = os.open(self.pfad, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(datei, zeile.encode('utf-8'))
+                groesse = os.fstat(datei).st_size
+            finally:
+                os.close(datei)
+            if groesse > self.max_bytes:
+                self._rotate()
+        except OSError as fehler:
+            print(f"Zugriffsprotokoll konnte nicht geschrieben werden: {fehler}")
+
+    def _rotate(self) -> None:
+        """Shifts the rotated files by one and moves the current file to ``<pfad>.1``."""
+        try:
+            if self.backups < 1:
+                os.remove(self.pfad)
+                return
+            for nummer in range(self.backups - 1, 0, -1):
+                if os.path.exists(f"{self.pfad}.{nummer}"):
+                    os.replace(f"{self.pfad}.{nummer}", f"{self.pfad}.{nummer + 1}")
+            os.replace(self.pfad, f"{self.pfad}.1")
+        except FileNotFoundError:
+            # Another worker rotated the file at the same time
+            pass
+
+    def install(self, server: flask.Flask, version: str | None = None) -> None:
+        """Logs all callback requests of a Flask server.
+
+        Args:
+            server (flask.Flask): Server of the dashboard.
+            version (str | None, optional): Version of the loaded dataset.
+        """
+
+        @server.before_request
+        def _start():
+            if (self.aktiv and flask.request.path.endswith(CALLBACK_PATH)
+                    and WARMUP_HEADER not in flask.request.headers
+                    and is_filter_request(flask.request.get_json(silent=True) or {})):
+                flask.g.zugriff_start = time.perf_counter()
+
+        @server.after_request
+        def _protokollieren(antwort):
+            start = flask.g.pop('zugriff_start', None)
+            if start is None:
+                return antwort
+            dauer_ms = (time.perf_counter() - start) * 1000
+            daten = flask.request.get_json(silent=True) or {}
+            werte = normalize_inputs(daten)
+            output = daten.get('output', 'unbekannt')
+            self.write({
+                'zeitpunkt': datetime.now().isoformat(timespec='milliseconds'),
+                'callback': callback_label(output),
+                'output': output,
+                'eingaben_hash': inputs_hash(werte),
+                'eingaben': werte,
+                'ausloeser': daten.get('changedPropIds', []),
+                'dauer_ms': round(dauer_ms, 2),
+                'bytes': antwort.calculate_content_length() or 0,
+                'status': antwort.status_code,
+                'cache': flask.g.pop('zugriff_cache', None),
+                'version': version,
+                'prozess': os.getpid()
+            })
+            return antwort
+
+
+def read_log(pfade: list[str], version: str | None = None) -> list[dict]:
+    """Reads the entries of one or more log files, skipping incomplete lines.
+
+    Args:
+        pfade (list[str]): Log files, e.g. the current file and rotated ones.
+        version (str | None, optional): Only keep entries of this dataset version.
+
+    Returns:
+        list[dict]: The entries in file order.
+    """
+    eintraege = []
+    for pfad in pfade:
+        with open(pfad, encoding='utf-8') as datei:
+            for zeile in datei:
+                try:
+                    eintrag = json.loads(zeile)
+                except json.JSONDecodeError:
+                    continue
+                if version is None or eintrag.get('version') == version:
+                    eintraege.append(eintrag)
+    return eintraege
+
+
+def frequent_combinations(eintraege: list[dict], top: int = DEFAULT_TOP) -> list[dict]:
+    """Returns the most frequently requested input combinations per callback.
+
+    Args:
+        eintraege (list[dict]): Entries of the access log.
+        top (int, optional): Number of combinations. Defaults to DEFAULT_TOP.
+
+    Returns:
+        list[dict]: Combinations with output, inputs, number of requests, cache hit rate and
+        median latency, most frequent first.
+    """
+    gruppen = defaultdict(list)
+    for eintrag in eintraege:
+        gruppen[(eintrag['output'], eintrag['eingaben_hash'])].append(eintrag)
+
+    kombinationen = []
+    for (output, _), gruppe in gruppen.items():
+        mit_cache = [eintrag for eintrag in gruppe if eintrag.get('cache')]
+        kombinationen.append({
+            'callback': gruppe[0]['callback'],
+            'output': output,
+            'eingaben': gruppe[-1]['eingaben'],
+            'anfragen': len(gruppe),
+            'trefferquote': (sum(eintrag['cache'] == 'hit' for eintrag in mit_cache) / len(mit_cache)
+                             if mit_cache else None),
+            'median_ms': float(np.median([eintrag['dauer_ms'] for eintrag in gruppe]))
+        })
+    kombinationen.sort(key=lambda kombination: (-kombination['anfragen'], -kombination['median_ms']))
+    return kombinationen[:top]
+
+
+def analyze(eintraege: list[dict], top: int = DEFAULT_TOP) -> dict:
+    """Aggregates the access log into the slowest callbacks, frequent combinations and largest payloads.
+
+    Args:
+        eintraege (list[dict]): Entries of the access log.
+        top (int, optional): Number of rows per table. Defaults to DEFAULT_TOP.
+
+    Returns:
+        dict: The keys 'anfragen', 'callbacks' (latency and size per callback, slowest first),
+        'kombinationen' (see :func:`frequent_combinations`) and 'groesste_antworten'.
+    """
+    je_callback = defaultdict(list)
+    for eintrag in eintraege:
+        je_callback[eintrag['callback']].append(eintrag)
+
+    callbacks = []
+    for name, gruppe in je_callback.items():
+        latenzen = [eintrag['dauer_ms'] for eintrag in gruppe]
+        groessen = [eintrag['bytes'] for eintrag in gruppe]
+        callbacks.append({
+            'callback': name,
+            'anfragen': len(gruppe),
+            'p50_ms': float(np.percentile(latenzen, 50)),
+            'p95_ms': float(np.percentile(latenzen, 95)),
+            'max_ms': max(latenzen),
+            'summe_s': sum(latenzen) / 1000,
+            'bytes_mittel': float(np.mean(groessen)),
+            'bytes_max': max(groessen)
+        })
+    callbacks.sort(key=lambda callback: -callback['p95_ms'])
+
+    groesste = sorted(eintraege, key=lambda eintrag: -eintrag['bytes'])[:top]
+    return {
+        'anfragen': len(eintraege),
+        'callbacks': callbacks[:top],
+        'kombinationen': frequent_combinations(eintraege, top),
+        'groesste_antworten': [{key: eintrag[key] for key in ('callback', 'bytes', 'dauer_ms', 'eingaben')}
+                               for eintrag in groesste]
+    }
+
+
+def _selection(eingaben: dict) -> str:
+    """Compact text of the set values of an input combination."""
+    gesetzt = [f"{schluessel.rsplit('.', 1)[0]}={wert}" for schluessel, wert in eingaben.items() if wert is not None]
+    return ', '.join(gesetzt) or '(keine Auswahl)'
+
+
+def print_analysis(analyse: dict) -> None:
+    """Prints the tables of :func:`analyze`."""
+    print(f"{analyse['anfragen']} Anfragen\n")
+    print("Langsamste Callbacks")
+    print(f"{'Callback':<48}{'Anfragen':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}"
+          f"{'Summe (s)':>11}{'Ø KB':>9}{'max KB':>9}")
+    for werte in analyse['callbacks']:
+        print(f"{werte['callback'][:47]:<48}{werte['anfragen']:>10}{werte['p50_ms']:>10.1f}{werte['p95_ms']:>10.1f}"
+              f"{werte['max_ms']:>10.1f}{werte['summe_s']:>11.1f}{werte['bytes_mittel'] / 1024:>9.1f}"
+              f"{werte['bytes_max'] / 1024:>9.1f}")
+
+    print("\nHäufigste Filterkombinationen")
+    print(f"{'Callback':<48}{'Anfragen':>10}{'Treffer':>9}{'p50 (ms)':>10}  Auswahl")
+    for werte in analyse['kombinationen']:
+        treffer = f"{werte['trefferquote']:.0%}" if werte['trefferquote'] is not None else '-'
+        print(f"{werte['callback'][:47]:<48}{werte['anfragen']:>10}{treffer:>9}{werte['median_ms']:>10.1f}  "
+              f"{_selection(werte['eingaben'])}")
+
+    print("\nGrößte Antworten")
+    print(f"{'Callback':<48}{'KB':>10}{'ms':>10}  Auswahl")
+    for werte in analyse['groesste_antworten']:
+        print(f"{werte['callback'][:47]:<48}{werte['bytes'] / 1024:>10.1f}{werte['dauer_ms']:>10.1f}  "
+              f"{_selection(werte['eingaben'])}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Analyzes the access log of the dashboard callbacks.")
+    parser.add_argument('pfade', nargs='*', help="Log files (default: ACCESS_LOG_PATH and its rotated files)")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="Number of rows per table")
+    parser.add_argument('--version', help="Only analyze requests on this dataset version")
+    parser.add_argument('--json', action='store_true', help="Print the analysis as JSON")
+    argumente = parser.parse_args()
+
+    analyse = analyze(read_log(argumente.pfade or log_files(), argumente.version), argumente.top)
+    if argumente.json:
+        print(json.dumps(analyse, indent=2, ensure_ascii=False))
+    else:
+        print_analysis(analyse)
+    sys.exit(0 if analyse['anfragen'] else 1)
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import threading
+import time
+import dash
+from src.access_log import ACCESS_LOG_PATH, frequent_combinations, is_filter_input, log_files, read_log
+from src.metrics import CALLBACK_PATH, WARMUP_HEADER, parse_outputs
+
+# Warm the caches after every start (disable with CACHE_WARMUP=0)
+CACHE_WARMUP = os.getenv("CACHE_WARMUP", "1") == "1"
+
+# Threads of the warm-up and number of frequent filter combinations replayed from the access log
+WARMUP_THREADS = int(os.getenv("CACHE_WARMUP_THREADS", "4"))
+WARMUP_TOP = int(os.getenv("CACHE_WARMUP_TOP", "20"))
+
+
+def is_default_view_callback(spezifikation: dict) -> bool:
+    """Whether a callback is a pure filter callback of the views: all its inputs are values of filter
+    components and it reads no state. Only these callbacks are replayed by the warm-up."""
+    eingaben = spezifikation['inputs']
+    return bool(eingaben) and not spezifikation['state'] and all(is_filter_input(eingabe) for eingabe in eingaben)
+
+
+def request_body(output: str, spezifikation: dict, werte: dict | None = None) -> dict | None:
+    """Builds the request body of a callback from the values of its inputs.
+
+    States are always sent empty: logged values are only replayed as inputs.
+
+    Args:
+        output (str): Output string of the callback (key of ``app.callback_map``).
+        spezifikation (dict): Entry of the callback in ``app.callback_map``.
+        werte (dict | None, optional): Input values by '<component id>.<property>' (see
+            :func:`src.access_log.normalize_inputs`); missing values are None.
+
+    Returns:
+        dict | None: The body for ``/_dash-update-component``, or None for callbacks with
+        pattern-matching ids, which cannot be replayed without the current layout.
+    """
+    werte = werte or {}
+    eintraege = spezifikation['inputs'] + spezifikation['state']
+    if any(not isinstance(eintrag['id'], str) for eintrag in eintraege):
+        return None
+
+    def element(eintrag, wert=None):
+        return {'id': eintrag['id'], 'property': eintrag['property'], 'value': wert}
+
+    ausgaben = [{'id': komponente, 'property': eigenschaft} for komponente, eigenschaft in parse_outputs(output)]
+    return {
+        'output': output,
+        'outputs': ausgaben if output.startswith('..') else ausgaben[0],
+        'inputs': [element(eintrag, werte.get(f"{eintrag['id']}.{eintrag['property']}"))
+                   for eintrag in spezifikation['inputs']],
+        'state': [element(eintrag) for eintrag in spezifikation['state']],
+        'changedPropIds': []
+    }
+
+
+class CacheWarmer:
+    """Precomputes the responses of the first requests after a start.
+
+    :meth:`start` sends the following callback requests through the Flask server of the app, so they
+    pass the result cache and the filter engine exactly like requests of a browser:
+
+    - every callback of the initial view without any filter (charts, KPIs and option lists)
+    - the ``top`` most frequent input combinations per callback from the access log
+
+    Only pure filter callbacks (see :func:`is_default_view_callback`) are replayed, also from the
+    log, so callbacks with side effects such as the upload of the job titles never run again.
+
+    The requests run in a background thread pool; :attr:`ready` is set when all of them are answered.
+    They carry the header ``X-Dashboard-Warmup`` and are therefore neither counted in the metrics nor
+    written to the access log. Failing requests are counted but do not delay readiness.
+
+    Args:
+        threads (int, optional): Number of threads. Defaults to WARMUP_THREADS.
+        top (int, optional): Number of replayed combinations from the access log. Defaults to WARMUP_TOP.
+        log_pfad (str, optional): Access log with the combinations. Defaults to ACCESS_LOG_PATH.
+    """
+
+    def __init__(self, threads: int = WARMUP_THREADS, top: int = WARMUP_TOP, log_pfad: str = ACCESS_LOG_PATH):
+        self.threads = threads
+        self.top = top
+        self.log_pfad = log_pfad
+        self._fertig = threading.Event()
+        self._sperre = threading.Lock()
+        self._thread = None
+        self._stand = {'status': 'nicht gestartet', 'anfragen': 0, 'erledigt': 0, 'fehler': 0, 'dauer_s': None}
+
+    @property
+    def ready(self) -> bool:
+        """Whether the warm-up has finished (or was not requested)."""
+        return self._fertig.is_set()
+
+    def requests(self, app: dash.Dash) -> list[dict]:
+        """Returns the request bodies of the warm-up: the initial view first, then the access log."""
+        anfragen = [request_body(output, spezifikation) for output, spezifikation in app.callback_map.items()
+                    if is_default_view_callback(spezifikation)]
+
+        protokolle = log_files(self.log_pfad)
+        if self.top > 0 and protokolle:
+            try:
+                kombinationen = frequent_combinations(read_log(protokolle), self.top)
+            except (OSError, KeyError) as fehler:
+                print(f"Zugriffsprotokoll für das Vorwärmen nicht lesbar: {fehler}")
+                kombinationen = []
+            for kombination in kombinationen:
+                spezifikation = app.callback_map.get(kombination['output'])
+                if spezifikation is not None and is_default_view_callback(spezifikation):
+                    anfragen.append(request_body(kombination['output'], spezifikation, kombination['eingaben']))
+
+        # Drop callbacks that cannot be replayed and identical requests
+        eindeutig = {}
+        for anfrage in anfragen:
+            if anfrage is not None:
+                eindeutig.setdefault(repr(anfrage), anfrage)
+        return list(eindeutig.values())
+
+    def start(self, app: dash.Dash, aktiv: bool | None = None) -> None:
+        """Starts the warm-up of an app in the background.
+
+        Args:
+            app (dash.Dash): The app with all callbacks registered.
+            aktiv (bool | None, optional): Whether to warm up at all. Defaults to CACHE_WARMUP.
+        """
+        self._fertig.clear()
+        if not (CACHE_WARMUP if aktiv is None else aktiv):
+            self._stand = {**self._stand, 'status': 'deaktiviert'}
+            self._fertig.set()
+            return
+
+        anfragen = self.requests(app)
+        self._stand = {'status': 'läuft', 'anfragen': len(anfragen), 'erledigt': 0, 'fehler': 0, 'dauer_s': None}
+        self._thread = threading.Thread(target=self._run, args=(app, anfragen), name='cache-warmer', daemon=True)
+        self._thread.start()
+
+    def _run(self, app: dash.Dash, anfragen: list[dict]) -> None:
+        start = time.perf_counter()
+        client = app.server.test_client()
+        pfad = app.get_relative_path(f"/{CALLBACK_PATH}")
+
+        def senden(anfrage):
+            return client.post(pfad, json=anfrage, headers={WARMUP_HEADER: '1'}).status_code
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='cache-warmer') as pool:
+                auftraege = [pool.submit(senden, anfrage) for anfrage in anfragen]
+                for auftrag in as_completed(auftraege):
+                    try:
+                        fehler = auftrag.result() >= 500
+                    except Exception:
+                        fehler = True
+                    with self._sperre:
+                        self._stand['erledigt'] += 1
+                        self._stand['fehler'] += int(fehler)
+        finally:
+            self._stand.update(status='fertig', dauer_s=round(time.perf_counter() - start, 2))
+            print(f"Caches vorgewärmt: {self._stand['erledigt']} Anfragen in {self._stand['dauer_s']} s "
+                  f"({self._stand['fehler']} fehlgeschlagen)")
+            self._fertig.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Blocks until the warm-up has finished; returns whether it did within the timeout."""
+        fertig = self._fertig.wait(timeout)
+        if fertig and self._thread is not None:
+            # Make sure the pool threads are gone, e.g. before gunicorn forks its workers
+            self._thread.join()
+        return fertig
+
+    def status(self) -> dict:
+        """Returns the state of the warm-up with its progress as share of answered requests."""
+        with self._sperre:
+            stand = dict(self._stand)
+        stand['fortschritt'] = round(stand['erledigt'] / stand['anfragen'], 3) if stand['anfragen'] else (
+            1.0 if self.ready else 0.0)
+        return stand
@@ -8,10 +8,31 @@ import plotly.express as px
 import dash_bootstrap_components as dbc
 from pathlib import Path
 import sqlite3
-import locale
 import json
 import base64
+import hashlib
+import hmac
+import time
+import flask
+from functools import wraps
+from src.access_log import AccessLog
+from src.cache_warmer import CacheWarmer
+from src import data_download
 from src.data_download import load_database, load_geojson
+from src.data_model import build_star_schema
+from src.filter_engine import FilterEngine, FilterState
+from src.memory_tracking import is_enabled as memory_tracking_enabled, summary as memory_summary, track, tracked
+from src.metrics import CONTENT_TYPE, CallbackMetrics, format_metric, phase, timed_callback
+from src.profiling import CallbackProfiler
+from src.result_cache import MemoryBackend, ResultCache, create_backend
+from src.data_preparation import (
+    COMPANY_SIZE_ORDER,
+    FINANCIAL_COLUMNS,
+    WORK_ENVIRONMENT_COLUMNS,
+    ADDITIONAL_BENEFIT_COLUMNS,
+    month_label,
+    month_value
+)
 from src.layouts import (
     get_general_dashboard_layout,
     get_comparison_dashboard_layout,
@@ -23,9 +44,6 @@ from src.MongoDB import upload_job_titles_to_mongodb
 # Determine the base directory of the project
 BASE_DIR = Path(__file__).parent
 
-# Set locale for German month names in date formatting
-locale.setlocale(locale.LC_TIME, 'de_DE.UTF-8')
-
 # Color scheme
 COLOR_1 = '#AD1B02'
 COLOR_2 = '#D85604'
@@ -33,325 +51,674 @@ COLOR_3 = '#E88D14'
 COLOR_4 = '#F3BE26'
 COLOR_5 = '#E669A2'  # Pink
 
-# Load data from the remote database (Google Drive)
-datenrahmen = load_database()
-if datenrahmen is None:
-    raise Exception("Datenbank konnte nicht geladen werden")
+# Define desired order of company sizes for consistent display
+unternehmensgroessen_sortiert = COMPANY_SIZE_ORDER
+
+# Key of the data context in the extensions of the Flask server
+EXTENSION_NAME = 'dashboard'
+
+# Password of the admin section (replace the default in production)
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "123")
 
-# Add mapping for types of employment
-beschaeftigungsart_mapping = {
-    'befristet': ['befristet'],
-    'unbefristet': ['Feste Anstellung']
+# Default configuration of create_app(); None means: use the environment variable of the same name
+DEFAULT_CONFIG = {
+    'GEOJSON_PATH': os.path.join(BASE_DIR, "bundeslaender.json"),
+    'GEOJSON_DETAIL': None,
+    'LOGO_PATH': os.path.join(BASE_DIR, "Logo-pwc.png"),
+    'RESULT_CACHE_BACKEND': None,
+    'CACHE_WARMUP': None
 }
 
-# Convert date column to datetime format
-datenrahmen['Datum'] = pd.to_datetime(datenrahmen['Datum'], format='%d.%m.%Y')
-
-# Group data for trendline plotting
-df_trend = datenrahmen.groupby(['Datum', 'Portal_Name']).size().reset_index(name='Anzahl')
-
-# Load GeoJSON file for map visualization
-deutschland_geojson = load_geojson(os.path.join(BASE_DIR, "bundeslaender.json"))
-
-# Load and encode the logo image for display in the dashboard
-logo_path = os.path.join(BASE_DIR, "Logo-pwc.png")
-if os.path.exists(logo_path):
-    with open(logo_path, "rb") as image_file:
-        encoded_image = base64.b64encode(image_file.read()).decode('ascii')
-else:
-    print("Logo-pwc.png nicht gefunden – das Logo wird nicht angezeigt.")
-
-# Extract global filter options for dashboard interactivity
-job_portale = datenrahmen['Portal_Name'].unique()
-bundeslaender = datenrahmen[datenrahmen['Land'] == 'Deutschland']['Bundesland'].unique()
-beschaeftigungsarten = datenrahmen['Beschäftigungsart'].unique()
-monate = sorted(datenrahmen['Datum'].dt.strftime('%Y-%m').unique())
-berufserfahrungslevel = datenrahmen['Berufserfahrung_vorausgesetzt'].unique()
-positionen = datenrahmen['Position'].unique()
-unternehmen = datenrahmen['Unternehmen'].unique()
-# unternehmensgroessen = datenrahmen['Unternehmensgröße'].unique()
-branchen = datenrahmen['Kategorie'].dropna().unique()
+# Callbacks of the dashboard, registered on every app built by create_app()
+CALLBACKS = []
 
-# Define desired order of company sizes for consistent display
-unternehmensgroessen_sortiert = [
-    "0-10",
-    "11-50",
-    "51-250",
-    "251-500",
-    "501-1000",
-    "1001-2500",
-    "2501-10000",
-    "10000+",
-    "Keine Angaben"
-]
-
-# Filter and keep only available sizes in defined order
-vorhandene_groessen = datenrahmen['Unternehmensgröße'].dropna().unique()
-unternehmensgroessen = [groesse for groesse in unternehmensgroessen_sortiert
-                        if groesse in vorhandene_groessen]
-
-# Initialize Dash application
-app = dash.Dash(__name__,
-                external_stylesheets=[
-                    dbc.themes.BOOTSTRAP,
-                    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
-                    # Font Awesome for icons
-                ],
-                suppress_callback_exceptions=True)
 
-# App Layout
-app.layout = html.Div([
+class DashboardContext:
+    """
+    Data and services of one dashboard app, filled by create_app().
 
-    # Temporary storage for job titles
-    dcc.Store(id='jobtitel-temp-speicher', data=load_job_titles()),
+    Every app keeps its own context in ``app.server.extensions``, so several apps (e.g. in tests or benchmarks)
+    can exist in one process without sharing their dataset, caches or metrics. Callbacks and endpoints use the
+    context of the app answering the request (see app_kontext).
+    """
 
-    # Navigation bar at the top
-    dbc.Navbar(
-        dbc.Container(
-            [
-                dbc.Row(
-                    [
-                        # Logo (left-aligned)
-                        dbc.Col(
-                            html.Img(
-                                src=f'data:image/png;base64,{encoded_image}',
-                                style={'height': '40px'}
-                            ),
-                            width="auto",
-                            className="me-2"  # Spacing to the title
-                        ),
+    def __init__(self):
+        # Loaded data, derived structures and map geometry
+        self.datenrahmen = None
+        self.sternschema = None
+        self.filter_engine = None
+        self.deutschland_geojson = None
+        self.geojson_inhalt = b''
+        self.geojson_url = None
+        self.encoded_image = ''
+        self.daten_geladen = None
+        self.ladedauer = None
+        self.startdauer = None
+        self.letzte_aktualisierung = None
+
+        # Global filter options for dashboard interactivity
+        self.job_portale = []
+        self.bundeslaender = []
+        self.monate = []
+        self.monats_labels = {}
+        self.positionen = []
+        self.branchen = []
+        self.unternehmensgroessen = []
+
+        # Cache for the figures and KPIs of the dashboard views; its backend is configured by create_app()
+        self.ergebnis_cache = ResultCache(MemoryBackend())
+
+        # Latency, call and error counts per callback, exposed under /metrics
+        self.callback_metriken = CallbackMetrics()
+
+        # One JSON line per callback request (callback, inputs, latency, payload size, cache hit), see src.access_log
+        self.zugriffs_log = AccessLog()
+
+        # Precomputes the initial view and frequent filter combinations after the start, see src.cache_warmer
+        self.cache_warmer = CacheWarmer()
+
+        # Opt-in profiler keeping the profiles of slow callbacks (CALLBACK_PROFILING or the admin section)
+        self.callback_profiler = CallbackProfiler()
+
+
+def app_kontext(server: flask.Flask | None = None) -> DashboardContext:
+    """
+    Returns the data context of a dashboard app.
 
-                        # Dashboard title
-                        dbc.Col(
-                            dbc.NavbarBrand("Dashboard - Job Analyse", className="ms-2"),
-                            width="auto"
-                        ),
-                    ],
-                    align="center",
-                    className="g-0"
-                ),
-
-                # Right-aligned navigation items
-                dbc.NavbarToggler(id="navbar-toggler"),
-                dbc.Collapse(
-                    dbc.Nav(
+    Parameters:
+        server (flask.Flask or None): Server of the app (``app.server``). Defaults to the app answering the
+            current request.
+
+    Returns:
+        DashboardContext: The context filled by create_app().
+    """
+    return (server or flask.current_app).extensions[EXTENSION_NAME]
+
+
+def is_admin_password(passwort: str | None) -> bool:
+    """
+    Checks a password against the admin password in constant time.
+
+    Parameters:
+        passwort (str or None): The user-entered password string.
+
+    Returns:
+        bool: True if the password is correct.
+    """
+    return hmac.compare_digest((passwort or "").encode(), ADMIN_PASSWORD.encode())
+
+
+def cached_callback(name, schluessel_funktion):
+    """
+    Decorator caching the return value of a callback in the result cache of the app answering the request.
+
+    Parameters:
+        name (str): Name of the cached function, part of every key.
+        schluessel_funktion (callable): Receives the arguments of the callback and returns their canonical
+            representation (see filter_schluessel).
+
+    Returns:
+        callable: Decorator for the callback (the uncached function stays available as ``__wrapped__``).
+    """
+    def decorator(funktion):
+        @wraps(funktion)
+        def wrapper(*args, **kwargs):
+            return app_kontext().ergebnis_cache.get_or_compute(name, schluessel_funktion(*args, **kwargs),
+                                                               lambda: funktion(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def dashboard_callback(*args, **kwargs):
+    """
+    Decorator collecting a callback of the dashboard; it takes the same arguments as ``app.callback``.
+
+    The callbacks are registered on the app in create_app(), so that they can be defined before the app exists.
+
+    Returns:
+        callable: Decorator returning the function unchanged.
+    """
+    def decorator(funktion):
+        CALLBACKS.append((args, kwargs, funktion))
+        return funktion
+    return decorator
+
+
+def filter_schluessel(job_portal, bundesland, beschaeftigungsart, position, zeitmodell, berufserfahrung, monate,
+                      unternehmensgroesse, branche, *vergleichsauswahl):
+    """
+    Creates the canonical cache key of a filter selection.
+
+    Selected values are sorted and empty selections (None, [] or '') are unified, so that equal selections
+    lead to the same key. The version of the loaded dataset is added by the cache itself.
+
+    Parameters:
+        job_portal, bundesland, beschaeftigungsart, position, zeitmodell, berufserfahrung, monate,
+        unternehmensgroesse, branche: Values of the global filters.
+        *vergleichsauswahl: Selected job titles and companies of the comparison view (if any).
+
+    Returns:
+        tuple: Normalized filter state and comparison selection.
+    """
+    zustand = FilterState.from_inputs(job_portal=job_portal, bundesland=bundesland,
+                                      beschaeftigungsart=beschaeftigungsart, position=position,
+                                      zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                      unternehmensgroesse=unternehmensgroesse, branche=branche)
+    return zustand, tuple(wert or None for wert in vergleichsauswahl)
+
+
+def liefere_geojson():
+    """
+    Delivers the GeoJSON of the federal states for the map.
+
+    The URL contains the version of the geometry, so browsers may cache the file permanently;
+    a changed geometry is requested under a new URL.
+
+    Returns:
+        flask.Response: The GeoJSON with caching headers and ETag.
+    """
+    kontext = app_kontext()
+    if kontext.deutschland_geojson is None:
+        flask.abort(404)
+    antwort = flask.Response(kontext.geojson_inhalt, mimetype='application/json')
+    antwort.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    antwort.add_etag()
+    return antwort.make_conditional(flask.request)
+
+
+def cache_statistik():
+    """
+    Reports the hit, miss and eviction counters and the current size of the result cache.
+
+    Returns:
+        flask.Response: The counters as JSON.
+    """
+    return flask.jsonify(app_kontext().ergebnis_cache.stats())
+
+
+def speicher_statistik():
+    """
+    Reports the peak and retained memory per callback and startup phase of the answering process.
+
+    The values are only recorded in the diagnostics mode (environment variable MEMORY_TRACKING=1);
+    on shutdown, every process additionally writes its summary to src/cache/memory/.
+
+    Returns:
+        flask.Response: The summary table as plain text.
+    """
+    return flask.Response(memory_summary(), content_type='text/plain; charset=utf-8',
+                          status=200 if memory_tracking_enabled() else 404)
+
+
+def zustand():
+    """
+    Collects the state of the process for the health endpoints.
+
+    Returns:
+        dict: Version and size of the loaded dataset, its load and startup durations, the progress of the
+        cache warm-up in percent and the result of the last database refresh (None for other data sources).
+    """
+    kontext = app_kontext()
+    vorwaermen = kontext.cache_warmer.status()
+    return {
+        'daten_geladen': kontext.datenrahmen is not None,
+        'version': kontext.filter_engine.version if kontext.filter_engine is not None else None,
+        'zeilen': len(kontext.datenrahmen) if kontext.datenrahmen is not None else 0,
+        'anzeigen': len(kontext.sternschema.anzeigen) if kontext.sternschema is not None else 0,
+        'geladen_um': kontext.daten_geladen,
+        'ladedauer_s': kontext.ladedauer,
+        'startdauer_s': kontext.startdauer,
+        'cache_vorgewaermt_prozent': round(vorwaermen['fortschritt'] * 100, 1),
+        'vorwaermen': vorwaermen,
+        'letzte_aktualisierung': kontext.letzte_aktualisierung,
+        'prozess': os.getpid()
+    }
+
+
+def lebendigkeit():
+    """
+    Liveness endpoint: answers as long as the process serves requests.
+
+    Returns:
+        flask.Response: The state of the process (see zustand) as JSON with status 200.
+    """
+    return flask.jsonify({'status': 'ok', **zustand()})
+
+
+def bereitschaft():
+    """
+    Readiness endpoint: reports whether the dashboard can answer requests fast, i.e. whether the data is
+    loaded and the cache warm-up has finished.
+
+    Returns:
+        flask.Response: The state of the process (see zustand) as JSON, with status 200 if ready and 503 otherwise.
+    """
+    kontext = app_kontext()
+    bereit = kontext.datenrahmen is not None and kontext.cache_warmer.ready
+    return flask.jsonify({'bereit': bereit, **zustand()}), (200 if bereit else 503)
+
+
+def metriken():
+    """
+    Reports the callback metrics, the loaded dataset and the result cache in the Prometheus text format.
+
+    The values belong to the process answering the request; with several gunicorn workers, every worker
+    reports its own callbacks and cache counters.
+
+    Returns:
+        flask.Response: The metrics as plain text.
+    """
+    kontext = app_kontext()
+    datenrahmen, daten_geladen = kontext.datenrahmen, kontext.daten_geladen
+    cache = kontext.ergebnis_cache.stats()
+    zaehler = [('hits', 'Number of result cache hits.'),
+               ('misses', 'Number of result cache misses.'),
+               ('evictions', 'Number of entries evicted because a limit of the result cache was reached.'),
+               ('expirations', 'Number of result cache entries removed after their lifetime.')]
+
+    text = kontext.callback_metriken.render()
+    text += format_metric('dashboard_dataset_rows', 'gauge', 'Number of rows of the loaded dataset.',
+                          [({}, len(datenrahmen) if datenrahmen is not None else 0)])
+    text += format_metric('dashboard_dataset_info', 'gauge', 'Version of the loaded dataset.',
+                          [({'version': kontext.filter_engine.version if kontext.filter_engine else ''}, 1)])
+    text += format_metric('dashboard_dataset_loaded_timestamp_seconds', 'gauge',
+                          'Unix time at which the dataset was loaded.', [({}, daten_geladen or 0)])
+    text += format_metric('dashboard_dataset_age_seconds', 'gauge', 'Seconds since the dataset was loaded.',
+                          [({}, round(time.time() - daten_geladen, 3) if daten_geladen else 0)])
+    for name, hilfe in zaehler:
+        text += format_metric(f'dashboard_result_cache_{name}_total', 'counter', hilfe,
+                              [({'backend': cache['backend']}, cache[name])])
+    text += format_metric('dashboard_result_cache_entries', 'gauge', 'Number of entries in the result cache.',
+                          [({'backend': cache['backend']}, cache['entries'])])
+    text += format_metric('dashboard_result_cache_bytes', 'gauge', 'Size of the result cache entries in bytes.',
+                          [({'backend': cache['backend']}, cache['bytes'])])
+    return flask.Response(text, content_type=CONTENT_TYPE)
+
+
+def erstelle_layout(kontext):
+    """
+    Builds the layout of the dashboard: navigation bar, global filters and the area for the dashboard views.
+
+    Parameters:
+        kontext (DashboardContext): Context of the app with the logo and the global filter options.
+
+    Returns:
+        dash.html.Div: The app layout.
+    """
+    return html.Div([
+
+        # Temporary storage for job titles
+        dcc.Store(id='jobtitel-temp-speicher', data=load_job_titles()),
+
+        # Navigation bar at the top
+        dbc.Navbar(
+            dbc.Container(
+                [
+                    dbc.Row(
                         [
-                            dbc.NavItem(
-                                dbc.NavLink("Allgemeine Analyse der Stellenanzeigen", id="nav-allgemein", href="#")),
-                            dbc.NavItem(dbc.NavLink("Vergleich der Stellenanzeigen", id="nav-vergleich", href="#")),
-                            dbc.NavItem(dbc.NavLink("Admin Bereich", id="nav-admin", href="#")),
+                            # Logo (left-aligned)
+                            dbc.Col(
+                                html.Img(
+                                    src=f'data:image/png;base64,{kontext.encoded_image}',
+                                    style={'height': '40px'}
+                                ),
+                                width="auto",
+                                className="me-2"  # Spacing to the title
+                            ),
+
+                            # Dashboard title
+                            dbc.Col(
+                                dbc.NavbarBrand("Dashboard - Job Analyse", className="ms-2"),
+                                width="auto"
+                            ),
                         ],
-                        className="ms-auto",  # Right-align nav items
-                        navbar=True
+                        align="center",
+                        className="g-0"
                     ),
-                    id="navbar-collapse",
-                    navbar=True,
-                ),
-            ],
-            fluid=True,
+
+                    # Right-aligned navigation items
+                    dbc.NavbarToggler(id="navbar-toggler"),
+                    dbc.Collapse(
+                        dbc.Nav(
+                            [
+                                dbc.NavItem(
+                                    dbc.NavLink("Allgemeine Analyse der Stellenanzeigen", id="nav-allgemein", href="#")),
+                                dbc.NavItem(dbc.NavLink("Vergleich der Stellenanzeigen", id="nav-vergleich", href="#")),
+                                dbc.NavItem(dbc.NavLink("Admin Bereich", id="nav-admin", href="#")),
+                            ],
+                            className="ms-auto",  # Right-align nav items
+                            navbar=True
+                        ),
+                        id="navbar-collapse",
+                        navbar=True,
+                    ),
+                ],
+                fluid=True,
+            ),
+            color="#6d6d6d",
+            dark=True,
         ),
-        color="#6d6d6d",
-        dark=True,
-    ),
-
-    # Main container with two-column layout
-    html.Div([
-        # Left column for filters (20% width) – ID used for visibility toggling
-        html.Div(id='filter-spalte', children=[
-            # Global filters
-            html.Div([
-
-                # Filter: Job Portal
-                html.Div([
-                    html.Label("Jobportal", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
-                    dcc.Dropdown(
-                        id='filter-job-portal',
-                        options=[{'label': opt, 'value': opt} for opt in job_portale if pd.notna(opt)],
-                        placeholder="Wähle Jobportal",
-                        multi=True,
-                        style={'marginBottom': '15px'}
-                    )
-                ]),
-
-                # Filter: Bundesland
-                html.Div([
-                    html.Label("Bundesland", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
-                    dcc.Dropdown(
-                        id='filter-bundesland',
-                        options=[{'label': opt, 'value': opt} for opt in bundeslaender if pd.notna(opt)],
-                        placeholder="Wähle Bundesland",
-                        multi=True,
-                        style={'marginBottom': '15px'}
-                    )
-                ]),
-
-                # Filter: date (Month selection)
-                html.Div([
-                    html.Label("Monat", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
-                    dcc.Dropdown(
-                        id='filter-monat',
-                        options=[{'label': pd.to_datetime(monat).strftime('%B %Y'), 'value': monat}
-                                 for monat in sorted(datenrahmen['Datum'].dt.strftime('%Y-%m').unique())],
-                        placeholder="Wähle Monat",
-                        multi=True,
-                        style={'marginBottom': '15px'}
-                    )
-                ]),
-
-                # Filter: Branche
-                html.Div([
-                    html.Label("Branche", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
-                    dcc.Dropdown(
-                        id='filter-branche',
-                        options=[{'label': opt, 'value': opt} for opt in branchen],
-                        placeholder="Wähle Branche(n)",
-                        multi=True,
-                        style={'marginBottom': '15px'}
-                    )
-                ]),
-
-                # Filter: Position
-                html.Div([
-                    html.Label("Position", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
-                    dcc.Dropdown(
-                        id='filter-position',
-                        options=[{'label': opt, 'value': opt} for opt in positionen if pd.notna(opt)],
-                        placeholder="Wähle Position",
-                        multi=True,
-                        style={'marginBottom': '15px'}
-                    )
-                ]),
-
-                # Filter: Unternehmensgröße
-                html.Div([
-                    html.Label("Unternehmensgröße",
-                               style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
-                    dcc.Dropdown(
-                        id='filter-unternehmensgroesse',
-                        options=[{'label': opt, 'value': opt} for opt in unternehmensgroessen],
-                        # Verwendet die sortierte Liste
-                        placeholder="Wähle Unternehmensgröße",
-                        multi=True,
-                        style={'marginBottom': '15px'}
-                    )
-                ]),
-
-                # Additional filters: experience, work time model, contract type
+
+        # Main container with two-column layout
+        html.Div([
+            # Left column for filters (20% width) – ID used for visibility toggling
+            html.Div(id='filter-spalte', children=[
+                # Global filters
                 html.Div([
 
-                    # Filter: Berufserfahrung
+                    # Filter: Job Portal
                     html.Div([
-                        html.Label("Berufserfahrung vorausgesetzt?", style={
-                            'fontSize': '14px',
-                            'marginBottom': '5px',
-                            'fontWeight': 'bold',
-                            'display': 'block'
-                        }),
-                        dcc.RadioItems(
-                            id='filter-berufserfahrung',
-                            options=[
-                                {'label': html.Span('Ja', style={'width': '80px', 'display': 'inline-block'}),
-                                 'value': 1},
-                                {'label': html.Span('Nein', style={'width': '80px', 'display': 'inline-block'}),
-                                 'value': 0}
-                            ],
-                            value=None,
-                            inline=True,
-                            style={'display': 'inline-block', 'marginLeft': '10px', 'verticalAlign': 'top'},
-                            labelStyle={'marginRight': '15px', 'display': 'inline-block', 'width': '80px'}
+                        html.Label("Jobportal", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
+                        dcc.Dropdown(
+                            id='filter-job-portal',
+                            options=[{'label': opt, 'value': opt} for opt in kontext.job_portale if pd.notna(opt)],
+                            placeholder="Wähle Jobportal",
+                            multi=True,
+                            style={'marginBottom': '15px'}
                         )
-                    ], style={'marginBottom': '15px'}),
+                    ]),
 
-                    # Filter: Zeitmodell
+                    # Filter: Bundesland
                     html.Div([
-                        html.Label("Zeitmodell", style={
-                            'fontSize': '14px',
-                            'marginBottom': '5px',
-                            'fontWeight': 'bold',
-                            'display': 'block'
-                        }),
-                        dcc.RadioItems(
-                            id='filter-zeitmodell',
-                            options=[
-                                {'label': html.Span('Vollzeit', style={'width': '80px', 'display': 'inline-block'}),
-                                 'value': 'Vollzeit'},
-                                {'label': html.Span('Teilzeit', style={'width': '80px', 'display': 'inline-block'}),
-                                 'value': 'Teilzeit'}
-                            ],
-                            value=None,
-                            inline=True,
-                            style={'display': 'inline-block', 'marginLeft': '10px', 'verticalAlign': 'top'},
-                            labelStyle={'marginRight': '15px', 'display': 'inline-block', 'width': '80px'}
+                        html.Label("Bundesland", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
+                        dcc.Dropdown(
+                            id='filter-bundesland',
+                            options=[{'label': opt, 'value': opt} for opt in kontext.bundeslaender if pd.notna(opt)],
+                            placeholder="Wähle Bundesland",
+                            multi=True,
+                            style={'marginBottom': '15px'}
                         )
-                    ], style={'marginBottom': '15px'}),
+                    ]),
 
-                    # Filter: Beschäftigungsart
+                    # Filter: date (Month selection)
                     html.Div([
-                        html.Label("Beschäftigungsart", style={
-                            'fontSize': '14px',
-                            'marginBottom': '5px',
-                            'fontWeight': 'bold',
-                            'display': 'block'
-                        }),
-                        dcc.RadioItems(
-                            id='filter-beschaeftigungsart',
-                            options=[
-                                {'label': html.Span('befristet', style={'width': '80px', 'display': 'inline-block'}),
-                                 'value': 'befristet'},
-                                {'label': html.Span('unbefristet', style={'width': '80px', 'display': 'inline-block'}),
-                                 'value': 'unbefristet'}
-                            ],
-                            value=None,
-                            inline=True,
-                            style={'display': 'inline-block', 'marginLeft': '10px', 'verticalAlign': 'top'},
-                            labelStyle={'marginRight': '15px', 'display': 'inline-block', 'width': '80px'}
+                        html.Label("Monat", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
+                        dcc.Dropdown(
+                            id='filter-monat',
+                            options=[{'label': kontext.monats_labels[monat], 'value': monat}
+                                     for monat in kontext.monate],
+                            placeholder="Wähle Monat",
+                            multi=True,
+                            style={'marginBottom': '15px'}
                         )
-                    ], style={'marginBottom': '15px'})
-                ]),
+                    ]),
 
-                # "Alle Filter löschen" Button
-                html.Div([
-                    dbc.Button(
-                        'Alle Filter löschen',
-                        id='filter-zuruecksetzen',
-                        color='danger',
-                        style={'width': '100%'}
-                    )
-                ])
+                    # Filter: Branche
+                    html.Div([
+                        html.Label("Branche", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
+                        dcc.Dropdown(
+                            id='filter-branche',
+                            options=[{'label': opt, 'value': opt} for opt in kontext.branchen],
+                            placeholder="Wähle Branche(n)",
+                            multi=True,
+                            style={'marginBottom': '15px'}
+                        )
+                    ]),
+
+                    # Filter: Position
+                    html.Div([
+                        html.Label("Position", style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
+                        dcc.Dropdown(
+                            id='filter-position',
+                            options=[{'label': opt, 'value': opt} for opt in kontext.positionen if pd.notna(opt)],
+                            placeholder="Wähle Position",
+                            multi=True,
+                            style={'marginBottom': '15px'}
+                        )
+                    ]),
+
+                    # Filter: Unternehmensgröße
+                    html.Div([
+                        html.Label("Unternehmensgröße",
+                                   style={'fontSize': '14px', 'marginBottom': '5px', 'fontWeight': 'bold'}),
+                        dcc.Dropdown(
+                            id='filter-unternehmensgroesse',
+                            options=[{'label': opt, 'value': opt} for opt in kontext.unternehmensgroessen],
+                            # Verwendet die sortierte Liste
+                            placeholder="Wähle Unternehmensgröße",
+                            multi=True,
+                            style={'marginBottom': '15px'}
+                        )
+                    ]),
+
+                    # Additional filters: experience, work time model, contract type
+                    html.Div([
+
+                        # Filter: Berufserfahrung
+                        html.Div([
+                            html.Label("Berufserfahrung vorausgesetzt?", style={
+                                'fontSize': '14px',
+                                'marginBottom': '5px',
+                                'fontWeight': 'bold',
+                                'display': 'block'
+                            }),
+                            dcc.RadioItems(
+                                id='filter-berufserfahrung',
+                                options=[
+                                    {'label': html.Span('Ja', style={'width': '80px', 'display': 'inline-block'}),
+                                     'value': 1},
+                                    {'label': html.Span('Nein', style={'width': '80px', 'display': 'inline-block'}),
+                                     'value': 0}
+                                ],
+                                value=None,
+                                inline=True,
+                                style={'display': 'inline-block', 'marginLeft': '10px', 'verticalAlign': 'top'},
+                                labelStyle={'marginRight': '15px', 'display': 'inline-block', 'width': '80px'}
+                            )
+                        ], style={'marginBottom': '15px'}),
+
+                        # Filter: Zeitmodell
+                        html.Div([
+                            html.Label("Zeitmodell", style={
+                                'fontSize': '14px',
+                                'marginBottom': '5px',
+                                'fontWeight': 'bold',
+                                'display': 'block'
+                            }),
+                            dcc.RadioItems(
+                                id='filter-zeitmodell',
+                                options=[
+                                    {'label': html.Span('Vollzeit', style={'width': '80px', 'display': 'inline-block'}),
+                                     'value': 'Vollzeit'},
+                                    {'label': html.Span('Teilzeit', style={'width': '80px', 'display': 'inline-block'}),
+                                     'value': 'Teilzeit'}
+                                ],
+                                value=None,
+                                inline=True,
+                                style={'display': 'inline-block', 'marginLeft': '10px', 'verticalAlign': 'top'},
+                                labelStyle={'marginRight': '15px', 'display': 'inline-block', 'width': '80px'}
+                            )
+                        ], style={'marginBottom': '15px'}),
+
+                        # Filter: Beschäftigungsart
+                        html.Div([
+                            html.Label("Beschäftigungsart", style={
+                                'fontSize': '14px',
+                                'marginBottom': '5px',
+                                'fontWeight': 'bold',
+                                'display': 'block'
+                            }),
+                            dcc.RadioItems(
+                                id='filter-beschaeftigungsart',
+                                options=[
+                                    {'label': html.Span('befristet', style={'width': '80px', 'display': 'inline-block'}),
+                                     'value': 'befristet'},
+                                    {'label': html.Span('unbefristet', style={'width': '80px', 'display': 'inline-block'}),
+                                     'value': 'unbefristet'}
+                                ],
+                                value=None,
+                                inline=True,
+                                style={'display': 'inline-block', 'marginLeft': '10px', 'verticalAlign': 'top'},
+                                labelStyle={'marginRight': '15px', 'display': 'inline-block', 'width': '80px'}
+                            )
+                        ], style={'marginBottom': '15px'})
+                    ]),
+
+                    # "Alle Filter löschen" Button
+                    html.Div([
+                        dbc.Button(
+                            'Alle Filter löschen',
+                            id='filter-zuruecksetzen',
+                            color='danger',
+                            style={'width': '100%'}
+                        )
+                    ])
+                ], style={
+                    'padding': '20px',
+                    'backgroundColor': '#f8f9fa',
+                    'borderRadius': '5px',
+                    'height': '90vh',  # Reduced height to 90vh for better layout on smaller screens
+                    'overflowY': 'auto'  # Adds scrollbar if content overflows
+                })
             ], style={
+                'width': '20%',
                 'padding': '20px',
-                'backgroundColor': '#f8f9fa',
-                'borderRadius': '5px',
-                'height': '90vh',  # Reduced height to 90vh for better layout on smaller screens
-                'overflowY': 'auto'  # Adds scrollbar if content overflows
+                'height': '90vh',
+                'boxSizing': 'border-box'  # Ensures padding is included in width calculation
+            }),
+
+            # Right column for dynamic dashboard content (takes remaining space)
+            html.Div(id='hauptinhalt', style={
+                'flex': '1',  # Occupies remaining space
+                'padding': '20px',
+                'minWidth': '0',  # Prevents overflow issues with flex layout
+                'height': '90vh',
+                'overflowY': 'auto'   # Adds scrollbar for long content
             })
         ], style={
-            'width': '20%',
-            'padding': '20px',
-            'height': '90vh',
-            'boxSizing': 'border-box'  # Ensures padding is included in width calculation
-        }),
-
-        # Right column for dynamic dashboard content (takes remaining space)
-        html.Div(id='hauptinhalt', style={
-            'flex': '1',  # Occupies remaining space
-            'padding': '20px',
-            'minWidth': '0',  # Prevents overflow issues with flex layout
+            'display': 'flex',
+            'width': '100%',
             'height': '90vh',
-            'overflowY': 'auto'   # Adds scrollbar for long content
+            'margin': '0',
+            'padding': '0'
         })
-    ], style={
-        'display': 'flex',
-        'width': '100%',
-        'height': '90vh',
-        'margin': '0',
-        'padding': '0'
-    })
-])
+    ])
+
+
+def create_app(config: dict | None = None, data_source=None) -> dash.Dash:
+    """
+    Builds the Dash application of the dashboard.
+
+    All data is loaded here instead of on import: the prepared job advertisement data, the GeoJSON of the map
+    and the logo. Afterwards, the star schema, the filter engine and the global filter options are built, the
+    result cache is configured for the loaded dataset version and all callbacks are registered on the new app.
+    Data, caches, metrics and the cache warm-up belong to the app (see DashboardContext), so several apps can be
+    built in one process without affecting each other.
+
+    Passing ``data_source`` allows running the dashboard (or timing its callbacks) on another dataset,
+    e.g. a synthetic frame, without downloading the database.
+
+    Parameters:
+        config (dict or None): Settings overriding DEFAULT_CONFIG ('GEOJSON_PATH', 'GEOJSON_DETAIL', 'LOGO_PATH',
+            'RESULT_CACHE_BACKEND', 'CACHE_WARMUP').
+        data_source (pd.DataFrame, callable or None): The prepared job advertisement frame
+            (see src.data_preparation.prepare_datenrahmen) or a function returning it.
+            Defaults to load_database.
+
+    Returns:
+        dash.Dash: The configured dashboard application.
+    """
+    konfiguration = {**DEFAULT_CONFIG, **(config or {})}
+    kontext = DashboardContext()
+    start = time.perf_counter()
+
+    # Load the prepared data (columnar snapshot, or the database from Google Drive on first start)
+    if data_source is None:
+        data_source = load_database
+    datenrahmen = data_source() if callable(data_source) else data_source
+    if datenrahmen is None:
+        raise Exception("Datenbank konnte nicht geladen werden")
+    kontext.datenrahmen = datenrahmen
+    kontext.daten_geladen = time.time()
+    kontext.ladedauer = round(time.perf_counter() - start, 3)
+    if data_source is load_database:
+        kontext.letzte_aktualisierung = data_download.letzte_aktualisierung
+
+    # Star schema: fact table with one row per job ad, used for counts and benefit sums
+    with track('startup.star_schema'):
+        kontext.sternschema = build_star_schema(datenrahmen)
+
+    # Shared filter engine: resolves and memoizes filter selections for all callbacks
+    with track('startup.filter_index'):
+        kontext.filter_engine = FilterEngine(kontext.sternschema)
+
+    # Result cache for the loaded dataset version (backend selected via RESULT_CACHE_BACKEND)
+    kontext.ergebnis_cache.configure(create_backend(konfiguration['RESULT_CACHE_BACKEND']),
+                                     kontext.filter_engine.version)
+
+    # Load GeoJSON file for map visualization
+    with track('startup.geojson'):
+        kontext.deutschland_geojson = load_geojson(konfiguration['GEOJSON_PATH'], konfiguration['GEOJSON_DETAIL'])
+
+    # Load and encode the logo image for display in the dashboard
+    logo_path = konfiguration['LOGO_PATH']
+    if os.path.exists(logo_path):
+        with open(logo_path, "rb") as image_file:
+            kontext.encoded_image = base64.b64encode(image_file.read()).decode('ascii')
+    else:
+        print("Logo-pwc.png nicht gefunden – das Logo wird nicht angezeigt.")
+
+    # Extract global filter options for dashboard interactivity
+    with track('startup.options'):
+        kontext.job_portale = datenrahmen['Portal_Name'].unique()
+        kontext.bundeslaender = datenrahmen[datenrahmen['Land'] == 'Deutschland']['Bundesland'].unique()
+        kontext.monate = [month_value(schluessel) for schluessel in sorted(datenrahmen['Monat'].unique())]
+        # German month labels (e.g. 'Mai 2025'), formatted once for all month dropdowns
+        kontext.monats_labels = {monat: month_label(monat) for monat in kontext.monate}
+        kontext.positionen = datenrahmen['Position'].unique()
+        kontext.branchen = datenrahmen['Kategorie'].dropna().unique()
+
+        # Filter and keep only available sizes in defined order
+        vorhandene_groessen = datenrahmen['Unternehmensgröße'].dropna().unique()
+        kontext.unternehmensgroessen = [groesse for groesse in unternehmensgroessen_sortiert
+                                        if groesse in vorhandene_groessen]
+
+    # Initialize Dash application
+    app = dash.Dash(__name__,
+                    external_stylesheets=[
+                        dbc.themes.BOOTSTRAP,
+                        "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"
+                        # Font Awesome for icons
+                    ],
+                    suppress_callback_exceptions=True)
+    app.server.extensions[EXTENSION_NAME] = kontext
+
+    # Serve the map geometry once as a cacheable file; map figures only reference its URL,
+    # so filter changes no longer re-transmit the state polygons
+    kontext.geojson_inhalt = json.dumps(kontext.deutschland_geojson, ensure_ascii=False,
+                                        separators=(',', ':')).encode('utf-8')
+    geojson_version = hashlib.sha256(kontext.geojson_inhalt).hexdigest()[:12]
+    kontext.geojson_url = app.get_relative_path(f"/geojson/bundeslaender.json?v={geojson_version}")
+    app.server.add_url_rule('/geojson/bundeslaender.json', view_func=liefere_geojson)
+    app.server.add_url_rule('/cache-stats', view_func=cache_statistik)
+    app.server.add_url_rule('/memory-stats', view_func=speicher_statistik)
+
+    # Time every callback request and expose the measurements under /metrics
+    kontext.callback_metriken.install(app.server)
+    app.server.add_url_rule('/metrics', view_func=metriken)
+
+    # Log every callback request for the offline analysis of hotspots and frequent filter combinations
+    kontext.zugriffs_log.install(app.server, kontext.filter_engine.version)
+
+    # App Layout
+    app.layout = erstelle_layout(kontext)
+
+    for args, kwargs, funktion in CALLBACKS:
+        app.callback(*args, **kwargs)(timed_callback(kontext.callback_profiler.wrap(tracked(funktion))))
+
+    # Health endpoints: /healthz for liveness, /readyz reports ready once the data is loaded and the caches are warm
+    app.server.add_url_rule('/healthz', view_func=lebendigkeit)
+    app.server.add_url_rule('/readyz', view_func=bereitschaft)
+
+    # Warm the caches in the background
+    kontext.startdauer = round(time.perf_counter() - start, 3)
+    kontext.cache_warmer.start(app, konfiguration['CACHE_WARMUP'])
+
+    return app
 
 
 # Callback to update the dashboard content based on the navigation bar selection
-@app.callback(
+@dashboard_callback(
     Output('hauptinhalt', 'children'),
     [Input('nav-allgemein', 'n_clicks'),
      Input('nav-vergleich', 'n_clicks'),
@@ -378,19 +745,20 @@ def aktualisiere_dashboard(nav_allgemein, nav_vergleich, nav_admin):
         dash.html.Div: The appropriate layout to render in the 'hauptinhalt' div.
     """
 
-    df = load_database()
+    kontext = app_kontext()
+    df = kontext.datenrahmen
 
     # Return error message if data could not be loaded
     if df is None or df.empty:
         return html.Div("Daten konnten nicht geladen werden.", style={"color": "red"})
 
     # Initialize helper variables based on available dataframe columns
-    job_portale = sorted(df['Portal_Name'].unique()) if 'Portal_Name' in df.columns else []
-    bundeslaender = sorted(df['Bundesland'].unique()) if 'Bundesland' in df.columns else []
-    branchen = sorted(df['Kategorie'].unique()) if 'Kategorie' in df.columns else []
-    positionen = sorted(df['Position'].unique()) if 'Position' in df.columns else []
-    unternehmensgroessen = sorted(df['Unternehmensgröße'].unique()) if 'Unternehmensgröße' in df.columns else []
-    unternehmen = sorted(df['Unternehmen'].unique()) if 'Unternehmen' in df.columns else []
+    job_portale = sorted(df['Portal_Name'].dropna().unique()) if 'Portal_Name' in df.columns else []
+    bundeslaender = sorted(df['Bundesland'].dropna().unique()) if 'Bundesland' in df.columns else []
+    branchen = sorted(df['Kategorie'].dropna().unique()) if 'Kategorie' in df.columns else []
+    positionen = sorted(df['Position'].dropna().unique()) if 'Position' in df.columns else []
+    unternehmensgroessen = sorted(df['Unternehmensgröße'].dropna().unique()) if 'Unternehmensgröße' in df.columns else []
+    unternehmen = sorted(df['Unternehmen'].dropna().unique()) if 'Unternehmen' in df.columns else []
 
     # Load the general dashboard layout by default or if no button has been clicked
     if not ctx.triggered or ctx.triggered[0]['prop_id'] == '.':
@@ -423,11 +791,12 @@ def aktualisiere_dashboard(nav_allgemein, nav_vergleich, nav_admin):
             unternehmen=unternehmen
         )
     elif button_id == 'nav-admin':
-        return get_admin_dashboard_layout()
+        return get_admin_dashboard_layout(profiling_aktiv=kontext.callback_profiler.aktiv,
+                                          profiling_schwelle_ms=kontext.callback_profiler.schwelle_ms)
 
 
 # Callback for admin password verification
-@app.callback(
+@dashboard_callback(
     [Output('admin-inhalt', 'style'),
      Output('passwort-modal', 'is_open'),
      Output('passwort-feedback', 'children')],
@@ -470,11 +839,8 @@ def passwort_prüfen(n_clicks, n_submit, passwort):
     if trigger_id not in ['passwort-bestaetigen', 'admin-passwort-eingabe']:
         return {'display': 'none'}, True, ""
 
-    # Define the correct password (replace with more secure logic in production)
-    korrektes_passwort = "123"
-
     # Check if entered password is correct
-    if passwort == korrektes_passwort:
+    if is_admin_password(passwort):
         return {'display': 'flex', 'width': '100%'}, False, "" # Show admin section, close modal
     else:
         return {'display': 'none'}, True, "Passwort ist falsch. Bitte erneut versuchen." # Keep modal open, show error
@@ -482,7 +848,7 @@ def passwort_prüfen(n_clicks, n_submit, passwort):
 
 # Callbacks – General Dashboard
 # Callback for updating figures and KPIs in the general dashboard
-@app.callback(
+@dashboard_callback(
     [Output('karte', 'figure'),
      Output('unternehmensgroesse-balken', 'figure'),
      Output('trend-linie', 'figure'),
@@ -499,6 +865,7 @@ def passwort_prüfen(n_clicks, n_submit, passwort):
      Input('filter-unternehmensgroesse', 'value'),
      Input('filter-branche', 'value')]
 )
+@cached_callback('allgemeine_diagramme', filter_schluessel)
 def aktualisiere_allgemeine_diagramme(job_portal, bundesland, beschaeftigungsart, position, zeitmodell,
                                       berufserfahrung, monate, unternehmensgroesse, branche):
     """
@@ -510,8 +877,9 @@ def aktualisiere_allgemeine_diagramme(job_portal, bundesland, beschaeftigungsart
 
     The function produces the following outputs:
 
-    - A **choropleth map** showing the number of job advertisements per German federal state.
-      Nationwide advertisements ("bundesweit") are programmatically duplicated across all states.
+    - A **choropleth map** showing the number of job advertisements per German federal state. The map is built
+      from the aggregated entries per state (``value_counts``); the count of nationwide advertisements
+      ("bundesweit") is added to every state, so each state is drawn from one row.
     - Three **key performance indicators (KPIs)**: total number of unique advertisements, number of unique job titles, and number of unique companies.
     - A **bar chart** displaying the distribution of job advertisements by company size, ordered by defined size categories.
     - A **time-series line chart** illustrating the trend of job advertisements over time, differentiated by portal.
@@ -530,107 +898,66 @@ def aktualisiere_allgemeine_diagramme(job_portal, bundesland, beschaeftigungsart
         tuple: (map figure, bar chart, line chart, total count, job title count, company count)
     """
 
-    # Create a working copy of the global dataframe
-    gefilterter_datenrahmen = datenrahmen.copy()
-
-    # Sequentially apply all filters
-    if job_portal:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[gefilterter_datenrahmen['Portal_Name'].isin(job_portal)]
-
-    if bundesland:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[gefilterter_datenrahmen['Bundesland'].isin(bundesland)]
+    kontext = app_kontext()
 
-    if beschaeftigungsart:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[
-            gefilterter_datenrahmen['Beschäftigungsart'].isin(beschaeftigungsart_mapping.get(beschaeftigungsart, []))]
+    # Resolve all filters via the shared filter engine
+    ergebnis = kontext.filter_engine.filter(job_portal=job_portal, bundesland=bundesland,
+                                            beschaeftigungsart=beschaeftigungsart, position=position,
+                                            zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                            unternehmensgroesse=unternehmensgroesse, branche=branche)
 
-    if position:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[gefilterter_datenrahmen['Position'].isin(position)]
+    # KPIs, counted on the unique job ads in the fact table of the star schema
+    gesamtanzahl = ergebnis.anzahl_anzeigen
+    anzahl_jobtitel = ergebnis.count_distinct('Job_Titel')
+    anzahl_unternehmen = ergebnis.count_distinct('Unternehmen')
 
-    if zeitmodell:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[gefilterter_datenrahmen['Zeitmodell'] == zeitmodell]
-
-    if berufserfahrung is not None:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[
-            gefilterter_datenrahmen['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-
-    if monate:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[
-            gefilterter_datenrahmen['Datum'].dt.strftime('%Y-%m').isin(monate)]
-
-    if unternehmensgroesse:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[
-            gefilterter_datenrahmen['Unternehmensgröße'].isin(unternehmensgroesse)]
-
-    if branche:
-        gefilterter_datenrahmen = gefilterter_datenrahmen[gefilterter_datenrahmen['Kategorie'].isin(branche)]
-
-    # Identify unique job ads using MongoDB_ID
-    eindeutige_anzeigen = gefilterter_datenrahmen.drop_duplicates(subset=['MongoDB_ID'])
-
-    # KPIs
-    gesamtanzahl = len(eindeutige_anzeigen)
-    anzahl_jobtitel = eindeutige_anzeigen['Job_Titel'].nunique()
-    anzahl_unternehmen = eindeutige_anzeigen['Unternehmen'].nunique()
-
-    # Handle 'bundesweit' cases by duplicating ads across all states
+    # Count the entries per federal state; nationwide ads ('bundesweit') count for every state
     #  List of all federal states
     alle_bundeslaender = ['Baden-Württemberg', 'Bayern', 'Berlin', 'Brandenburg', 'Bremen',
                           'Hamburg', 'Hessen', 'Mecklenburg-Vorpommern', 'Niedersachsen',
                           'Nordrhein-Westfalen', 'Rheinland-Pfalz', 'Saarland', 'Sachsen',
                           'Sachsen-Anhalt', 'Schleswig-Holstein', 'Thüringen']
 
-    # Create a copy for the map display only
-    karten_daten = gefilterter_datenrahmen.copy()
-
-    # Find nationwide job advertisements
-    bundesweite_anzeigen = karten_daten[karten_daten['Bundesland'] == 'bundesweit']
-
-    if not bundesweite_anzeigen.empty:
-        # Remove the original nationwide entries
-        karten_daten = karten_daten[karten_daten['Bundesland'] != 'bundesweit']
-
-        # For each nationwide job advertisement: Add one entry per federal state
-        neue_eintraege = []
-        for _, zeile in bundesweite_anzeigen.iterrows():
-            for bundesland in alle_bundeslaender:
-                neue_zeile = zeile.copy()
-                neue_zeile['Bundesland'] = bundesland
-                neue_eintraege.append(neue_zeile)
+    bundesland_anzahl = ergebnis.value_counts('Bundesland')
+    anzahl_bundesweit = bundesland_anzahl.get('bundesweit', 0)
 
-        # Add the new entries to the DataFrame
-        if neue_eintraege:
-            karten_daten = pd.concat([karten_daten, pd.DataFrame(neue_eintraege)], ignore_index=True)
+    # Aggregated map data: at most one row per federal state
+    karten_daten = pd.DataFrame({
+        'Bundesland': alle_bundeslaender,
+        'Anzahl': bundesland_anzahl.reindex(alle_bundeslaender, fill_value=0).to_numpy() + anzahl_bundesweit
+    })
+    karten_daten = karten_daten[karten_daten['Anzahl'] > 0]
 
     # Always generate the job ad map, even if there are no nationwide postings
-    karten_figur = px.choropleth(
-        karten_daten,
-        geojson=deutschland_geojson,
-        locations='Bundesland',
-        featureidkey='properties.name',
-        color=karten_daten.groupby('Bundesland')['Bundesland'].transform('size'),
-        color_continuous_scale=[COLOR_1, COLOR_2, COLOR_3, COLOR_4],
-    )
+    with phase('figure'):
+        karten_figur = px.choropleth(
+            karten_daten,
+            geojson=kontext.geojson_url,
+            locations='Bundesland',
+            featureidkey='properties.name',
+            color='Anzahl',
+            color_continuous_scale=[COLOR_1, COLOR_2, COLOR_3, COLOR_4],
+        )
 
-    karten_figur.update_geos(
-        visible=True,
-        resolution=50,
-        showcountries=True,
-        countrycolor='Black',
-        showsubunits=True,
-        subunitcolor='Gray',
-        center={"lat": 51.1657, "lon": 10.4515},
-        projection_type="mercator",
-        fitbounds="locations"
-    )
-    karten_figur.update_coloraxes(cmin=0, cmax=karten_daten.groupby('Bundesland').size().max())
-    karten_figur.update_traces(hovertemplate="<b>%{location}</b>: %{z}<extra></extra>")
+        karten_figur.update_geos(
+            visible=True,
+            resolution=50,
+            showcountries=True,
+            countrycolor='Black',
+            showsubunits=True,
+            subunitcolor='Gray',
+            center={"lat": 51.1657, "lon": 10.4515},
+            projection_type="mercator",
+            fitbounds="locations"
+        )
+        karten_figur.update_coloraxes(cmin=0, cmax=karten_daten['Anzahl'].max())
+        karten_figur.update_traces(hovertemplate="<b>%{location}</b>: %{z}<extra></extra>")
 
     # Company Size Bar Chart
     # 1. Prepare and filter data
     unternehmensgroesse_data = (
-        eindeutige_anzeigen.groupby('Unternehmensgröße')
-        .size()
+        ergebnis.ads_per_value('Unternehmensgröße')
+        .rename_axis('Unternehmensgröße')
         .reset_index(name='Anzahl')
         .rename(columns={'Unternehmensgröße': 'Kategorie'})
     )
@@ -650,91 +977,94 @@ def aktualisiere_allgemeine_diagramme(job_portal, bundesland, beschaeftigungsart
     unternehmensgroesse_data = unternehmensgroesse_data.sort_values('Kategorie')
 
     # 4. Create diagram
-    unternehmensgroesse_figur = px.bar(
-        unternehmensgroesse_data,
-        x='Kategorie',
-        y='Anzahl',
-        title='',
-        labels={'Kategorie': 'Unternehmensgröße', 'Anzahl': 'Anzahl Stellenanzeigen'},
-        category_orders={'Kategorie': vorhandene_kategorien}
-    )
+    with phase('figure'):
+        unternehmensgroesse_figur = px.bar(
+            unternehmensgroesse_data,
+            x='Kategorie',
+            y='Anzahl',
+            title='',
+            labels={'Kategorie': 'Unternehmensgröße', 'Anzahl': 'Anzahl Stellenanzeigen'},
+            category_orders={'Kategorie': vorhandene_kategorien}
+        )
 
-    # 5. Customize design
-    unternehmensgroesse_figur.update_traces(
-        marker_color=COLOR_1,
-        hovertemplate="Anzahl: %{y}<extra></extra>",
-        showlegend=False
-    )
+        # 5. Customize design
+        unternehmensgroesse_figur.update_traces(
+            marker_color=COLOR_1,
+            hovertemplate="Anzahl: %{y}<extra></extra>",
+            showlegend=False
+        )
 
-    # 6. Optimize layout
-    unternehmensgroesse_figur.update_layout(
-        xaxis_title='Unternehmensgröße',
-        yaxis_title='Anzahl Stellenanzeigen',
-        margin={'t': 30, 'b': 100},  # Platz für x-Achsenbeschriftungen
-        xaxis={'tickangle': 45}  # Beschriftungen schräg stellen für bessere Lesbarkeit
-    )
+        # 6. Optimize layout
+        unternehmensgroesse_figur.update_layout(
+            xaxis_title='Unternehmensgröße',
+            yaxis_title='Anzahl Stellenanzeigen',
+            margin={'t': 30, 'b': 100},  # Platz für x-Achsenbeschriftungen
+            xaxis={'tickangle': 45}  # Beschriftungen schräg stellen für bessere Lesbarkeit
+        )
 
     # Job Ad Trend Line Char
-    trend_data = (
-        gefilterter_datenrahmen
-        .drop_duplicates(subset=['MongoDB_ID', 'Portal_Name'])
-        .groupby(['Datum', 'Portal_Name'])
-        .size()
-        .reset_index(name='Anzahl')
-    )
-    trend_figur = px.line(
-        trend_data,
-        x='Datum',
-        y='Anzahl',
-        color='Portal_Name',
-        color_discrete_map={
-            'stepstone': COLOR_1,
-            'indeed': COLOR_3
-        },
-    )
+    with phase('dedup'):
+        trend_data = (
+            kontext.datenrahmen[['Anzeige_Nr', 'Portal_Name', 'Datum']].iloc[ergebnis.zeilen]
+            .drop_duplicates(subset=['Anzeige_Nr', 'Portal_Name'])
+            .groupby(['Datum', 'Portal_Name'], observed=True)
+            .size()
+            .reset_index(name='Anzahl')
+        )
+    with phase('figure'):
+        trend_figur = px.line(
+            trend_data,
+            x='Datum',
+            y='Anzahl',
+            color='Portal_Name',
+            color_discrete_map={
+                'stepstone': COLOR_1,
+                'indeed': COLOR_3
+            },
+        )
 
-    # Always display points (even for individual data points)
-    trend_figur.update_traces(
-        mode='lines+markers',  # Always show lines + markers
-        marker=dict(size=8),
-        hovertemplate='<b>%{fullData.name}</b>: %{y}<extra></extra>'
-    )
+        # Always display points (even for individual data points)
+        trend_figur.update_traces(
+            mode='lines+markers',  # Always show lines + markers
+            marker=dict(size=8),
+            hovertemplate='<b>%{fullData.name}</b>: %{y}<extra></extra>'
+        )
 
-    # Layout adjustments
-    trend_figur.update_layout(
-        yaxis_title='Anzahl Stellenanzeigen',
-        xaxis_title='Datum',
-        yaxis=dict(
-            # Automatic tick calculation with nicer intervals
-            tickmode='auto',
-            autorange=True,
-            rangemode='tozero',
-            # Do not display decimal places that are too small
-            tickformat=',.0f'
-        ),
-        xaxis=dict(
-            tickformat='%d.%m.%Y'
-        ),
-        hovermode='x unified',
-        hoverlabel=dict(
-            bgcolor='white',
-            font_color='black'
-        ),
-        margin=dict(t=30),
-        legend_title_text='Jobportal'
-    )
+        # Layout adjustments
+        trend_figur.update_layout(
+            yaxis_title='Anzahl Stellenanzeigen',
+            xaxis_title='Datum',
+            yaxis=dict(
+                # Automatic tick calculation with nicer intervals
+                tickmode='auto',
+                autorange=True,
+                rangemode='tozero',
+                # Do not display decimal places that are too small
+                tickformat=',.0f'
+            ),
+            xaxis=dict(
+                tickformat='%d.%m.%Y'
+            ),
+            hovermode='x unified',
+            hoverlabel=dict(
+                bgcolor='white',
+                font_color='black'
+            ),
+            margin=dict(t=30),
+            legend_title_text='Jobportal'
+        )
 
-    # Hover format
-    trend_figur.update_traces(
-        hovertemplate='<b>%{fullData.name}</b>: %{y}<extra></extra>'
-    )
+        # Hover format
+        trend_figur.update_traces(
+            hovertemplate='<b>%{fullData.name}</b>: %{y}<extra></extra>'
+        )
 
     return (karten_figur, unternehmensgroesse_figur, trend_figur,
             f"{gesamtanzahl}", f"{anzahl_jobtitel}", f"{anzahl_unternehmen}")
 
 
 # Callback to reset all filter dropdowns when the reset button is clicked
-@app.callback(
+@dashboard_callback(
     [Output('filter-job-portal', 'value'),
      Output('filter-bundesland', 'value'),
      Output('filter-beschaeftigungsart', 'value'),
@@ -764,310 +1094,110 @@ def reset_filters(n_clicks):
     return [], [], None, [], None, None, [], [], []
 
 
-# Callback to update the available job portal options based on current filter selections
-@app.callback(
-    Output('filter-job-portal', 'options'),
-    [Input('filter-bundesland', 'value'),
-     Input('filter-monat', 'value'),
-     Input('filter-branche', 'value'),
-     Input('filter-position', 'value'),
-     Input('filter-unternehmensgroesse', 'value')]
-)
-def update_job_portal_options(bundesland, monat, branche, position, unternehmensgroesse):
+def formatiere_option(wert, label, anzahl):
     """
-    Dynamically updates the job portal filter options based on other selected filters.
-
-    Only job portals that are present in the currently filtered dataset will be displayed
-    as selectable options in the dropdown menu.
+    Creates a dropdown option whose label shows the number of matching job advertisements.
 
     Parameters:
-        bundesland (list or None): Selected federal states.
-        monat (list or None): Selected months (format 'YYYY-MM').
-        branche (list or None): Selected industries/categories.
-        position (list or None): Selected job positions.
-        unternehmensgroesse (list or None): Selected company size categories.
+        wert: Value of the option as used by the filter.
+        label (str): Displayed name of the option.
+        anzahl (int): Number of job advertisements matching the option, e.g. 'Bayern (1 234)'.
 
     Returns:
-        list: A list of dictionaries with available job portal options for the dropdown.
-    """
-    # Start with a copy of the full dataset
-    gefiltert = datenrahmen.copy()
-
-    # Apply each filter if selected
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if monat:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monat)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if position:
-        gefiltert = gefiltert[gefiltert['Position'].isin(position)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-
-    # Extract available job portals after filtering
-    verfuegbare_portale = gefiltert['Portal_Name'].unique()
-    # Create dropdown option list (excluding missing values)
-    optionen = [{'label': portal, 'value': portal} for portal in sorted(verfuegbare_portale) if pd.notna(portal)]
-    return optionen
-
-
-# Callback to update the available federal state (Bundesland) options based on current filter selections
-@app.callback(
-    Output('filter-bundesland', 'options'),
-    [Input('filter-job-portal', 'value'),
-     Input('filter-monat', 'value'),
-     Input('filter-branche', 'value'),
-     Input('filter-position', 'value'),
-     Input('filter-unternehmensgroesse', 'value')]
-)
-def update_bundesland_options(job_portal, monat, branche, position, unternehmensgroesse):
+        dict: Dropdown option with 'label' and 'value' keys.
     """
-    Dynamically updates the federal state (Bundesland) filter options based on other selected filters.
-
-    Only states present in the currently filtered dataset will be shown as options.
-    This ensures that users can only select from values relevant to their current context.
+    return {'label': f"{label} ({anzahl:,})".replace(',', ' '), 'value': wert}
 
-    Parameters:
-        job_portal (list or None): Selected job portals.
-        monat (list or None): Selected months (format 'YYYY-MM').
-        branche (list or None): Selected industries/categories.
-        position (list or None): Selected job positions.
-        unternehmensgroesse (list or None): Selected company size categories.
 
-    Returns:
-        list: A list of dictionaries with available federal state options for the dropdown.
-    """
-    # Start with a full copy of the dataset
-    gefiltert = datenrahmen.copy()
-
-    # Apply each selected filter
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if monat:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monat)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if position:
-        gefiltert = gefiltert[gefiltert['Position'].isin(position)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-
-    # Only include entries from Germany and extract unique federal states
-    verfuegbare_bundeslaender = gefiltert[gefiltert['Land'] == 'Deutschland']['Bundesland'].unique()
-    # Create dropdown option list (excluding missing values)
-    optionen = [{'label': bundesland, 'value': bundesland} for bundesland in sorted(verfuegbare_bundeslaender) if
-                pd.notna(bundesland)]
-    return optionen
-
-
-# Callback to update the available month filter options based on current filter selections
-@app.callback(
-    Output('filter-monat', 'options'),
-    [Input('filter-job-portal', 'value'),
-     Input('filter-bundesland', 'value'),
-     Input('filter-branche', 'value'),
-     Input('filter-position', 'value'),
-     Input('filter-unternehmensgroesse', 'value')]
-)
-def update_monat_options(job_portal, bundesland, branche, position, unternehmensgroesse):
-    """
-    Dynamically updates the month filter options based on other selected filters.
-
-    Only months contained in the filtered results will be offered as selectable options.
-    The displayed labels are formatted as 'Month Year' (e.g. May 2025) to ensure clarity and improve user experience.
-
-    This formatting decision was made in consultation with PwC to align with their preferred reporting structure.
-    Since day-level granularity was not required for the analysis, a month-based view was intentionally implemented
-    to simplify selection and interpretation.
-
-    Parameters:
-        job_portal (list or None): Selected job portals.
-        bundesland (list or None): Selected federal states.
-        branche (list or None): Selected industries/categories.
-        position (list or None): Selected job positions.
-        unternehmensgroesse (list or None): Selected company size categories.
-
-    Returns:
-        list: A list of dictionaries with available month options for the dropdown,
-              where 'label' is a formatted month name and 'value' is the 'YYYY-MM' string.
-    """
-    # Start with a full copy of the dataset
-    gefiltert = datenrahmen.copy()
-
-    # Apply each selected filter
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if position:
-        gefiltert = gefiltert[gefiltert['Position'].isin(position)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-
-    # Extract unique months in 'YYYY-MM' format and sort them
-    verfuegbare_monate = sorted(gefiltert['Datum'].dt.strftime('%Y-%m').unique())
-    # Create dropdown option list with formatted month labels
-    optionen = [{'label': pd.to_datetime(monat).strftime('%B %Y'), 'value': monat} for monat in verfuegbare_monate]
-    return optionen
-
-
-# Callback to update the available "Branchen"/industry filter options based on current filter selections
-@app.callback(
-    Output('filter-branche', 'options'),
+# Callback to update the options of all cascading filters based on current filter selections
+@dashboard_callback(
+    [Output('filter-job-portal', 'options'),
+     Output('filter-bundesland', 'options'),
+     Output('filter-monat', 'options'),
+     Output('filter-branche', 'options'),
+     Output('filter-position', 'options'),
+     Output('filter-unternehmensgroesse', 'options')],
     [Input('filter-job-portal', 'value'),
      Input('filter-bundesland', 'value'),
      Input('filter-monat', 'value'),
+     Input('filter-branche', 'value'),
      Input('filter-position', 'value'),
      Input('filter-unternehmensgroesse', 'value')]
 )
-def update_branche_options(job_portal, bundesland, monat, position, unternehmensgroesse):
+@cached_callback('filteroptionen', lambda job_portal, bundesland, monat, branche, position, unternehmensgroesse:
+                        FilterState.from_inputs(job_portal=job_portal, bundesland=bundesland, monate=monat,
+                                                branche=branche, position=position,
+                                                unternehmensgroesse=unternehmensgroesse))
+def aktualisiere_filteroptionen(job_portal, bundesland, monat, branche, position, unternehmensgroesse):
     """
-    Dynamically updates the industry filter options based on other selected filters.
+    Dynamically updates the options of the six cascading filters based on the other selected filters.
 
-    The list of industries is predefined based on an analysis of the existing dataset.
-    Only industries present in the currently filtered dataset will be made available in the dropdown.
+    The options of each filter are computed from all other cascading filters, but not from its own selection
+    ("all filters except this one"), so that further values of the same filter remain selectable. All six
+    option lists are resolved together via the facets of the shared filter engine, and each option shows the
+    number of matching job advertisements, e.g. 'Bayern (1 234)'.
 
-    Parameters:
-        job_portal (list or None): Selected job portals.
-        bundesland (list or None): Selected federal states.
-        monat (list or None): Selected months in 'YYYY-MM' format.
-        position (list or None): Selected job positions.
-        unternehmensgroesse (list or None): Selected company size categories.
-
-    Returns:
-        list: A list of dictionaries with available industry/category options for the dropdown,
-              where each dictionary contains 'label' and 'value' keys with the industry name.
-    """
-    # Start with a full copy of the dataset
-    gefiltert = datenrahmen.copy()
-
-    # Apply filters based on current selections
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if monat:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monat)]
-    if position:
-        gefiltert = gefiltert[gefiltert['Position'].isin(position)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-
-    # Extract unique, non-null industry names and sort them
-    verfuegbare_branchen = gefiltert['Kategorie'].dropna().unique()
-    # Create dropdown option list with industry names
-    optionen = [{'label': branche, 'value': branche} for branche in sorted(verfuegbare_branchen)]
-    return optionen
+    Only values contained in the respective filtered data are offered:
 
-
-# Callback to update the available job position filter options based on current filter selections
-@app.callback(
-    Output('filter-position', 'options'),
-    [Input('filter-job-portal', 'value'),
-     Input('filter-bundesland', 'value'),
-     Input('filter-monat', 'value'),
-     Input('filter-branche', 'value'),
-     Input('filter-unternehmensgroesse', 'value')]
-)
-def update_position_options(job_portal, bundesland, monat, branche, unternehmensgroesse):
-    """
-    Dynamically updates the job position filter options based on other selected filters.
-
-    Job positions are shown only if they exist within the current filter selection.
+    - **Job portals, industries and positions** are sorted alphabetically.
+    - **Federal states** only include entries from Germany.
+    - **Months** are displayed as 'Month Year' (e.g. May 2025). This formatting decision was made in
+      consultation with PwC to align with their preferred reporting structure. Since day-level granularity
+      was not required for the analysis, a month-based view was intentionally implemented.
+    - **Company sizes** follow the predefined logical order from smallest to largest company size.
 
     Parameters:
         job_portal (list or None): Selected job portals.
         bundesland (list or None): Selected federal states.
         monat (list or None): Selected months in 'YYYY-MM' format.
         branche (list or None): Selected industries/categories.
+        position (list or None): Selected job positions.
         unternehmensgroesse (list or None): Selected company size categories.
 
     Returns:
-        list: A list of dictionaries with available job position options for the dropdown,
-              each containing 'label' and 'value' keys with the position name.
-    """
-    # Start with a full copy of the dataset
-    gefiltert = datenrahmen.copy()
-
-    # Apply filters based on current selections
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if monat:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monat)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-
-    # Extract unique, non-null job positions and sort them
-    verfuegbare_positionen = gefiltert['Position'].dropna().unique()
-    # Create dropdown option list with job position names
-    optionen = [{'label': position, 'value': position} for position in sorted(verfuegbare_positionen)]
-    return optionen
-
-
-# Callback to update the company size filter options based on current filter selections
-@app.callback(
-    Output('filter-unternehmensgroesse', 'options'),
-    [Input('filter-job-portal', 'value'),
-     Input('filter-bundesland', 'value'),
-     Input('filter-monat', 'value'),
-     Input('filter-branche', 'value'),
-     Input('filter-position', 'value')]
-)
-def update_unternehmensgroesse_options(job_portal, bundesland, monat, branche, position):
+        tuple: Option lists (dictionaries with 'label' and 'value') for the job portal, federal state,
+               month, industry, position and company size dropdowns.
     """
-    Dynamically updates the available company size options based on other selected filters.
-
-    Displayed company sizes are limited to those included in the active dataset view.
-
-    To maintain a consistent and intuitive user experience, the returned company size options
-    follow a predefined logical order - from smallest to largest company sizes - excluding null or non-occurring values in the current filter context.
-
-    Parameters:
-        job_portal (list or None): Selected job portals.
-        bundesland (list or None): Selected federal states.
-        monat (list or None): Selected months in 'YYYY-MM' format.
-        branche (list or None): Selected industries/categories.
-        position (list or None): Selected job positions.
-
-    Returns:
-        list: A list of dictionaries with available company size options for the dropdown,
-              each containing 'label' and 'value' keys with the company size name.
-    """
-    # Start with full dataset copy
-    gefiltert = datenrahmen.copy()
-
-    # Apply filters based on current selections
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if monat:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monat)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if position:
-        gefiltert = gefiltert[gefiltert['Position'].isin(position)]
-
-    # Get unique, non-null company sizes from filtered data
-    vorhandene_groessen = gefiltert['Unternehmensgröße'].dropna().unique()
-    # Keep only company sizes that exist in the filtered data,
-    # preserving the predefined order in unternehmensgroessen_sortiert
-    unternehmensgroessen = [groesse for groesse in unternehmensgroessen_sortiert if groesse in vorhandene_groessen]
-    # Create dropdown option list
-    optionen = [{'label': groesse, 'value': groesse} for groesse in unternehmensgroessen]
-    return optionen
+    kontext = app_kontext()
+    zustand = FilterState.from_inputs(job_portal=job_portal, bundesland=bundesland, monate=monat,
+                                      branche=branche, position=position, unternehmensgroesse=unternehmensgroesse)
+    facetten = kontext.filter_engine.facets(zustand, ['job_portal', 'bundesland', 'monate', 'branche', 'position',
+                                                      'unternehmensgroesse'])
+
+    # Number of job ads per available value of each filter
+    portal_anzahl = facetten['job_portal'].ads_per_value('Portal_Name')
+    bundesland_anzahl = facetten['bundesland'].ads_per_value('Bundesland')
+    monat_anzahl = facetten['monate'].ads_per_value('Monat')
+    branche_anzahl = facetten['branche'].ads_per_value('Kategorie')
+    position_anzahl = facetten['position'].ads_per_value('Position')
+    groessen_anzahl = facetten['unternehmensgroesse'].ads_per_value('Unternehmensgröße')
+
+    # Only include federal states of entries from Germany
+    gefiltert = kontext.datenrahmen[['Land', 'Bundesland']].iloc[facetten['bundesland'].zeilen]
+    deutsche_bundeslaender = set(gefiltert[gefiltert['Land'] == 'Deutschland']['Bundesland'].dropna().unique())
+
+    portal_optionen = [formatiere_option(portal, portal, portal_anzahl[portal])
+                       for portal in sorted(portal_anzahl.index)]
+    bundesland_optionen = [formatiere_option(land, land, bundesland_anzahl[land])
+                           for land in sorted(bundesland_anzahl.index) if land in deutsche_bundeslaender]
+    monat_optionen = [formatiere_option(month_value(schluessel), kontext.monats_labels[month_value(schluessel)],
+                                        monat_anzahl[schluessel])
+                      for schluessel in sorted(monat_anzahl.index)]
+    branche_optionen = [formatiere_option(branche, branche, branche_anzahl[branche])
+                        for branche in sorted(branche_anzahl.index)]
+    position_optionen = [formatiere_option(position, position, position_anzahl[position])
+                         for position in sorted(position_anzahl.index)]
+    # Keep the predefined order of company sizes
+    groessen_optionen = [formatiere_option(groesse, groesse, groessen_anzahl[groesse])
+                         for groesse in unternehmensgroessen_sortiert if groesse in groessen_anzahl.index]
+
+    return (portal_optionen, bundesland_optionen, monat_optionen, branche_optionen, position_optionen,
+            groessen_optionen)
 
 
 # Callbacks "Vergleich der Stellenanzeigen"
 # Callback for the comparison dashboard
-@app.callback(
+@dashboard_callback(
     [Output('verguetungen-balken-links', 'figure'),
      Output('verguetungen-balken-rechts', 'figure'),
      Output('titel-links', 'children'),
@@ -1086,6 +1216,7 @@ def update_unternehmensgroesse_options(job_portal, bundesland, monat, branche, p
      Input('filter-job-titel-rechts', 'value'),
      Input('filter-unternehmen-rechts', 'value')]
 )
+@cached_callback('verguetungen', filter_schluessel)
 def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, position, zeitmodell, berufserfahrung, monate,
                               unternehmensgroesse, branche, job_titel_links, unternehmen_links, job_titel_rechts,
                               unternehmen_rechts):
@@ -1106,15 +1237,16 @@ def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, positi
        Technical column names are mapped to readable, user-facing labels for display in the charts.
 
     3. **Data filtering (left and right)**:
-       The dataset is filtered independently for the left and right views using the same filter set.
+       The shared filter engine resolves the filter set together with the job title and company of each side.
        This enables the comparison of two targeted market segments.
 
     4. **Deduplication**:
-       Duplicate job advertisements are removed using a unique identifier (`MongoDB_ID`) to ensure
-       accurate visualizations and counts.
+       The selected rows (one per location and industry of an advertisement) are mapped to their advertisement
+       (`Anzeige_Nr`) in the fact table of the star schema, so every advertisement is counted once.
 
     5. **Job count calculation**:
-       For both sides, the number of unique advertisements is calculated and included in the chart titles.
+       For both sides, the number of unique advertisements is calculated and included in the chart titles; the
+       benefit counts are summed over the same advertisements.
 
     The comparison is visualized using bar charts, which were selected for their clarity in presenting
     categorical data. This format allows for intuitive side-by-side comparison and supports a clear visual representation of differences between the two selected job titles or companies.
@@ -1160,38 +1292,15 @@ def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, positi
             - str: Title text for the right side.
     """
 
+    kontext = app_kontext()
+
     # Use only existing columns in the dataframe
-    vorhandene_spalten = datenrahmen.columns.tolist()
+    vorhandene_spalten = kontext.datenrahmen.columns.tolist()
 
     # Define categories with filtering on existing columns
-    finanzielle_spalten = [col for col in [
-        'Gehalt_anhand_von_Tarifklassen',
-        'Überstundenvergütung',
-        'Gehaltserhöhungen',
-        'Aktienoptionen_Gewinnbeteiligung',
-        'Boni',
-        'Sonderzahlungen',
-        '13. Gehalt',
-        'Betriebliche_Altersvorsorge'
-    ] if col in vorhandene_spalten]
-
-    arbeitsumfeld_spalten = [col for col in [
-        'Flexible_Arbeitsmodelle',
-        'Homeoffice',
-        'Arbeitsumfeld_Ausstattung'
-    ] if col in vorhandene_spalten]
-
-    zusatzleistungen_spalten = [col for col in [
-        'Weiterbildung_und_Entwicklungsmöglichkeiten',
-        'Gesundheit_und_Wohlbefinden',
-        'Finanzielle_Vergünstigungen',
-        'Mobilitätsangebote',
-        'Verpflegung',
-        'Zusätzliche_Urlaubstage',
-        'Familien_Unterstützung',
-        'Onboarding_und_Mentoring_Programme',
-        'Teamevents_Firmenfeiern'
-    ] if col in vorhandene_spalten]
+    finanzielle_spalten = [col for col in FINANCIAL_COLUMNS if col in vorhandene_spalten]
+    arbeitsumfeld_spalten = [col for col in WORK_ENVIRONMENT_COLUMNS if col in vorhandene_spalten]
+    zusatzleistungen_spalten = [col for col in ADDITIONAL_BENEFIT_COLUMNS if col in vorhandene_spalten]
 
     # Rreadable labels for compensation types
     verguetungs_labels = {
@@ -1218,90 +1327,44 @@ def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, positi
     }
 
     # Filter data for left side
-    gefiltert_links = datenrahmen.copy()
-    if job_portal:
-        gefiltert_links = gefiltert_links[gefiltert_links['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert_links = gefiltert_links[gefiltert_links['Bundesland'].isin(bundesland)]
-    if beschaeftigungsart:
-        # Convert string to list for filtering
-        beschaeftigungsarten = beschaeftigungsart_mapping.get(beschaeftigungsart, [])
-        gefiltert_links = gefiltert_links[gefiltert_links['Beschäftigungsart'].isin(beschaeftigungsarten)]
-    if position:
-        gefiltert_links = gefiltert_links[gefiltert_links['Position'].isin(position)]
-    if zeitmodell:
-        gefiltert_links = gefiltert_links[gefiltert_links['Zeitmodell'] == zeitmodell]
-    if berufserfahrung is not None:
-        gefiltert_links = gefiltert_links[gefiltert_links['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-    if monate:
-        gefiltert_links = gefiltert_links[gefiltert_links['Datum'].dt.strftime('%Y-%m').isin(monate)]
-    if unternehmensgroesse:
-        gefiltert_links = gefiltert_links[gefiltert_links['Unternehmensgröße'].isin(unternehmensgroesse)]
-    if branche:
-        gefiltert_links = gefiltert_links[gefiltert_links['Kategorie'].isin(branche)]
-    if job_titel_links:
-        gefiltert_links = gefiltert_links[gefiltert_links['Job_Titel'] == job_titel_links]
-    if unternehmen_links:
-        gefiltert_links = gefiltert_links[gefiltert_links['Unternehmen'] == unternehmen_links]
+    ergebnis_links = kontext.filter_engine.filter(job_portal=job_portal, bundesland=bundesland,
+                                                  beschaeftigungsart=beschaeftigungsart, position=position,
+                                                  zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                                  unternehmensgroesse=unternehmensgroesse, branche=branche,
+                                                  job_titel=job_titel_links, unternehmen=unternehmen_links)
 
     # Filter data for right side
-    gefiltert_rechts = datenrahmen.copy()
-    if job_portal:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Bundesland'].isin(bundesland)]
-    if beschaeftigungsart:
-        # Convert string to list for filtering
-        beschaeftigungsarten = beschaeftigungsart_mapping.get(beschaeftigungsart, [])
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Beschäftigungsart'].isin(beschaeftigungsarten)]
-    if position:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Position'].isin(position)]
-    if zeitmodell:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Zeitmodell'] == zeitmodell]
-    if berufserfahrung is not None:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-    if monate:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Datum'].dt.strftime('%Y-%m').isin(monate)]
-    if unternehmensgroesse:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Unternehmensgröße'].isin(unternehmensgroesse)]
-    if branche:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Kategorie'].isin(branche)]
-    if job_titel_rechts:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Job_Titel'] == job_titel_rechts]
-    if unternehmen_rechts:
-        gefiltert_rechts = gefiltert_rechts[gefiltert_rechts['Unternehmen'] == unternehmen_rechts]
-
-    # Remove duplicates based on MongoDB_ID for counting
-    eindeutige_links = gefiltert_links.drop_duplicates(subset=['MongoDB_ID'])
-    eindeutige_rechts = gefiltert_rechts.drop_duplicates(subset=['MongoDB_ID'])
-
-    anzahl_links = len(eindeutige_links)
-    anzahl_rechts = len(eindeutige_rechts)
+    ergebnis_rechts = kontext.filter_engine.filter(job_portal=job_portal, bundesland=bundesland,
+                                                   beschaeftigungsart=beschaeftigungsart, position=position,
+                                                   zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                                   unternehmensgroesse=unternehmensgroesse, branche=branche,
+                                                   job_titel=job_titel_rechts, unternehmen=unternehmen_rechts)
+
+    # Number of unique job ads of both sides (fact table of the star schema)
+    anzahl_links = ergebnis_links.anzahl_anzeigen
+    anzahl_rechts = ergebnis_rechts.anzahl_anzeigen
 
     # Create titles for both sides
     titel_links = f"Betrifft hier {anzahl_links} Jobs"
     titel_rechts = f"Betrifft hier {anzahl_rechts} Jobs"
 
-    def erstelle_verguetungen_figur(daten, anzahl):
+    def erstelle_verguetungen_figur(ergebnis, anzahl):
         """
         Helper function to create a horizontal bar chart for compensation types.
 
         Parameters:
-        - daten: filtered DataFrame to use for the plot
+        - ergebnis: filter result of one side (selected job ads and their benefit sums)
         - anzahl: total number of unique jobs in the filtered data for percentage calculation
 
         Returns:
         - Plotly figure object representing the bar chart
         """
-        # Remove duplicates for consistent calculation
-        eindeutige_daten = daten.drop_duplicates(subset=['MongoDB_ID'])
-
         # List for all category data
         alle_kategorien_daten = []
 
         # 1. Process financial compensations
         if finanzielle_spalten:
-            finanzielle_daten = eindeutige_daten[finanzielle_spalten].sum().reset_index()
+            finanzielle_daten = ergebnis.benefit_sums(finanzielle_spalten).reset_index()
             finanzielle_daten.columns = ['Vergütungsart', 'Anzahl']
             finanzielle_daten['Anzahl'] = (finanzielle_daten['Anzahl'] / anzahl * 100).round(2)
             finanzielle_daten['Kategorie'] = 'Finanzielle Vergütung'
@@ -1312,7 +1375,7 @@ def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, positi
 
         # 2. Process work environment
         if arbeitsumfeld_spalten:
-            arbeitsumfeld_daten = eindeutige_daten[arbeitsumfeld_spalten].sum().reset_index()
+            arbeitsumfeld_daten = ergebnis.benefit_sums(arbeitsumfeld_spalten).reset_index()
             arbeitsumfeld_daten.columns = ['Vergütungsart', 'Anzahl']
             arbeitsumfeld_daten['Anzahl'] = (arbeitsumfeld_daten['Anzahl'] / anzahl * 100).round(2)
             arbeitsumfeld_daten['Kategorie'] = 'Arbeitsumfeld'
@@ -1323,7 +1386,7 @@ def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, positi
 
         # 3. Process additional benefits
         if zusatzleistungen_spalten:
-            zusatzleistungen_daten = eindeutige_daten[zusatzleistungen_spalten].sum().reset_index()
+            zusatzleistungen_daten = ergebnis.benefit_sums(zusatzleistungen_spalten).reset_index()
             zusatzleistungen_daten.columns = ['Vergütungsart', 'Anzahl']
             zusatzleistungen_daten['Anzahl'] = (zusatzleistungen_daten['Anzahl'] / anzahl * 100).round(2)
             zusatzleistungen_daten['Kategorie'] = 'Zusatzleistungen'
@@ -1348,74 +1411,75 @@ def aktualisiere_verguetungen(job_portal, bundesland, beschaeftigungsart, positi
         }
 
         # Create the bar chart (only if data is available)
-        if not kombiniert.empty:
-            figur = px.bar(
-                kombiniert,
-                y='Vergütungsart',
-                x='Anzahl',
-                orientation='h',
-                color='Kategorie',
-                color_discrete_map=farben,
-                labels={
-                    'Anzahl': 'Anteil der Jobs (%)',
-                    'Vergütungsart': 'Art der Vergütung',
-                    'Kategorie': 'Kategorie'
-                },
-                category_orders={"Vergütungsart": kombiniert['Vergütungsart'].tolist()},
-                text=kombiniert['Anzahl'].apply(lambda x: f"{x:.2f}%" if x > 0 else "")
-            )
-        else:
-            # Create empty placeholder chart if no data is available
-            figur = px.bar(
-                pd.DataFrame({'Vergütungsart': ['Keine Daten'], 'Anzahl': [0]}),
-                y='Vergütungsart',
-                x='Anzahl',
-                orientation='h'
+        with phase('figure'):
+            if not kombiniert.empty:
+                figur = px.bar(
+                    kombiniert,
+                    y='Vergütungsart',
+                    x='Anzahl',
+                    orientation='h',
+                    color='Kategorie',
+                    color_discrete_map=farben,
+                    labels={
+                        'Anzahl': 'Anteil der Jobs (%)',
+                        'Vergütungsart': 'Art der Vergütung',
+                        'Kategorie': 'Kategorie'
+                    },
+                    category_orders={"Vergütungsart": kombiniert['Vergütungsart'].tolist()},
+                    text=kombiniert['Anzahl'].apply(lambda x: f"{x:.2f}%" if x > 0 else "")
+                )
+            else:
+                # Create empty placeholder chart if no data is available
+                figur = px.bar(
+                    pd.DataFrame({'Vergütungsart': ['Keine Daten'], 'Anzahl': [0]}),
+                    y='Vergütungsart',
+                    x='Anzahl',
+                    orientation='h'
+                )
+            # Update trace styling
+            figur.update_traces(
+                textfont_size=12,
+                textposition='outside',
+                cliponaxis=False,
+                hovertemplate=None,
+                hoverinfo='skip'
             )
-        # Update trace styling
-        figur.update_traces(
-            textfont_size=12,
-            textposition='outside',
-            cliponaxis=False,
-            hovertemplate=None,
-            hoverinfo='skip'
-        )
-        # Update layout for better readability and formatting
-        figur.update_layout(
-            title_x=0.5,
-            yaxis={'categoryorder': 'total ascending'},
-            margin={'t': 100, 'l': 150, 'b': 50},  # Add top margin for legend spacing
-            showlegend=True,
-            legend_title_text='Kategorien',
-            plot_bgcolor='#E5ECF6',
-            paper_bgcolor='white',
-            yaxis_title=None,
-            xaxis_title='Anteil der Jobs (%)',
-            xaxis=dict(gridcolor='white', showgrid=True),
-            uniformtext_minsize=8,
-            uniformtext_mode='hide',
-            hovermode=False,
-            legend=dict(
-                orientation='h',      # Horizontal layout
-                yanchor='bottom',     # Anchor at bottom
-                y=1.02,               # Slightly above the plot
-                xanchor='center',     # Center aligned
-                x=0.5,                # Position in the middle
-                bgcolor='rgba(255,255,255,0.5)',  # Semi-transparent background
+            # Update layout for better readability and formatting
+            figur.update_layout(
+                title_x=0.5,
+                yaxis={'categoryorder': 'total ascending'},
+                margin={'t': 100, 'l': 150, 'b': 50},  # Add top margin for legend spacing
+                showlegend=True,
+                legend_title_text='Kategorien',
+                plot_bgcolor='#E5ECF6',
+                paper_bgcolor='white',
+                yaxis_title=None,
+                xaxis_title='Anteil der Jobs (%)',
+                xaxis=dict(gridcolor='white', showgrid=True),
+                uniformtext_minsize=8,
+                uniformtext_mode='hide',
+                hovermode=False,
+                legend=dict(
+                    orientation='h',      # Horizontal layout
+                    yanchor='bottom',     # Anchor at bottom
+                    y=1.02,               # Slightly above the plot
+                    xanchor='center',     # Center aligned
+                    x=0.5,                # Position in the middle
+                    bgcolor='rgba(255,255,255,0.5)',  # Semi-transparent background
+                )
             )
-        )
 
         return figur
 
-    # Use filtered datasets (with duplicates removed) to generate bar charts
-    figur_links = erstelle_verguetungen_figur(gefiltert_links, anzahl_links)
-    figur_rechts = erstelle_verguetungen_figur(gefiltert_rechts, anzahl_rechts)
+    # Use the unique job ads of both sides to generate bar charts
+    figur_links = erstelle_verguetungen_figur(ergebnis_links, anzahl_links)
+    figur_rechts = erstelle_verguetungen_figur(ergebnis_rechts, anzahl_rechts)
 
     return figur_links, figur_rechts, titel_links, titel_rechts
 
 
 # Callback for the left side
-@app.callback(
+@dashboard_callback(
     Output('filter-unternehmen-links', 'options'),
     [Input('filter-job-titel-links', 'value'),
      Input('filter-job-portal', 'value'),
@@ -1452,31 +1516,14 @@ def update_unternehmen_links(job_titel, job_portal, bundesland, beschaeftigungsa
     Returns:
         list: List of dictionaries with 'label' and 'value' for each available company.
     """
-    # Create a copy of the dataset to apply filters
-    gefiltert = datenrahmen.copy()
-
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if beschaeftigungsart:
-        gefiltert = gefiltert[
-            gefiltert['Beschäftigungsart'].isin(beschaeftigungsart_mapping.get(beschaeftigungsart, []))]
-    if zeitmodell:
-        gefiltert = gefiltert[gefiltert['Zeitmodell'] == zeitmodell]
-    if berufserfahrung is not None:
-        gefiltert = gefiltert[gefiltert['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-    if monate:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monate)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if job_titel:
-        gefiltert = gefiltert[gefiltert['Job_Titel'] == job_titel]
+    filter_engine = app_kontext().filter_engine
+    # Resolve the selected filters via the shared filter engine
+    ergebnis = filter_engine.filter(job_portal=job_portal, bundesland=bundesland, beschaeftigungsart=beschaeftigungsart,
+                                    zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                    unternehmensgroesse=unternehmensgroesse, branche=branche, job_titel=job_titel)
 
     # Extract available companies
-    verfuegbare_unternehmen = gefiltert['Unternehmen'].unique()
+    verfuegbare_unternehmen = ergebnis.values('Unternehmen')
 
     # Create options for dropdown
     optionen = [{'label': unternehmen, 'value': unternehmen}
@@ -1486,7 +1533,7 @@ def update_unternehmen_links(job_titel, job_portal, bundesland, beschaeftigungsa
 
 
 # Callback for the right side
-@app.callback(
+@dashboard_callback(
     Output('filter-unternehmen-rechts', 'options'),
     [Input('filter-job-titel-rechts', 'value'),
      Input('filter-job-portal', 'value'),
@@ -1520,31 +1567,14 @@ def update_unternehmen_rechts(job_titel, job_portal, bundesland, beschaeftigungs
     Returns:
         list: List of dictionaries with 'label' and 'value' for each available company.
     """
-    # Create a copy of the dataset to apply filters
-    gefiltert = datenrahmen.copy()
-
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if beschaeftigungsart:
-        gefiltert = gefiltert[
-            gefiltert['Beschäftigungsart'].isin(beschaeftigungsart_mapping.get(beschaeftigungsart, []))]
-    if zeitmodell:
-        gefiltert = gefiltert[gefiltert['Zeitmodell'] == zeitmodell]
-    if berufserfahrung is not None:
-        gefiltert = gefiltert[gefiltert['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-    if monate:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monate)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if job_titel:
-        gefiltert = gefiltert[gefiltert['Job_Titel'] == job_titel]
+    filter_engine = app_kontext().filter_engine
+    # Resolve the selected filters via the shared filter engine
+    ergebnis = filter_engine.filter(job_portal=job_portal, bundesland=bundesland, beschaeftigungsart=beschaeftigungsart,
+                                    zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                    unternehmensgroesse=unternehmensgroesse, branche=branche, job_titel=job_titel)
 
     # Extract available companies
-    verfuegbare_unternehmen = gefiltert['Unternehmen'].unique()
+    verfuegbare_unternehmen = ergebnis.values('Unternehmen')
 
     # Create options for dropdown
     optionen = [{'label': unternehmen, 'value': unternehmen}
@@ -1554,7 +1584,7 @@ def update_unternehmen_rechts(job_titel, job_portal, bundesland, beschaeftigungs
 
 
 # Callback for the job title filter on the left side (filters by company and global filters)
-@app.callback(
+@dashboard_callback(
     Output('filter-job-titel-links', 'options'),
     [Input('filter-unternehmen-links', 'value'),
      Input('filter-job-portal', 'value'),
@@ -1592,31 +1622,14 @@ def update_job_titel_links(unternehmen, job_portal, bundesland, beschaeftigungsa
     Returns:
         list: List of dictionaries with 'label' and 'value' for each available job title.
     """
-    # Create a copy of the dataset to apply filters
-    gefiltert = datenrahmen.copy()
-
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if beschaeftigungsart:
-        gefiltert = gefiltert[
-            gefiltert['Beschäftigungsart'].isin(beschaeftigungsart_mapping.get(beschaeftigungsart, []))]
-    if zeitmodell:
-        gefiltert = gefiltert[gefiltert['Zeitmodell'] == zeitmodell]
-    if berufserfahrung is not None:
-        gefiltert = gefiltert[gefiltert['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-    if monate:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monate)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if unternehmen:
-        gefiltert = gefiltert[gefiltert['Unternehmen'] == unternehmen]
+    filter_engine = app_kontext().filter_engine
+    # Resolve the selected filters via the shared filter engine
+    ergebnis = filter_engine.filter(job_portal=job_portal, bundesland=bundesland, beschaeftigungsart=beschaeftigungsart,
+                                    zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                    unternehmensgroesse=unternehmensgroesse, branche=branche, unternehmen=unternehmen)
 
     # Extract available job titles
-    verfuegbare_job_titel = gefiltert['Job_Titel'].unique()
+    verfuegbare_job_titel = ergebnis.values('Job_Titel')
 
     # Create options for dropdown
     optionen = [{'label': job_titel, 'value': job_titel}
@@ -1626,7 +1639,7 @@ def update_job_titel_links(unternehmen, job_portal, bundesland, beschaeftigungsa
 
 
 # Callback for the job title filter on the right side (filters by company and global filters)
-@app.callback(
+@dashboard_callback(
     Output('filter-job-titel-rechts', 'options'),
     [Input('filter-unternehmen-rechts', 'value'),
      Input('filter-job-portal', 'value'),
@@ -1661,31 +1674,14 @@ def update_job_titel_rechts(unternehmen, job_portal, bundesland, beschaeftigungs
     Returns:
         list: List of dictionaries with 'label' and 'value' for each available job title.
     """
-    # Create a copy of the dataset to apply filters
-    gefiltert = datenrahmen.copy()
-
-    if job_portal:
-        gefiltert = gefiltert[gefiltert['Portal_Name'].isin(job_portal)]
-    if bundesland:
-        gefiltert = gefiltert[gefiltert['Bundesland'].isin(bundesland)]
-    if beschaeftigungsart:
-        gefiltert = gefiltert[
-            gefiltert['Beschäftigungsart'].isin(beschaeftigungsart_mapping.get(beschaeftigungsart, []))]
-    if zeitmodell:
-        gefiltert = gefiltert[gefiltert['Zeitmodell'] == zeitmodell]
-    if berufserfahrung is not None:
-        gefiltert = gefiltert[gefiltert['Berufserfahrung_vorausgesetzt'] == berufserfahrung]
-    if monate:
-        gefiltert = gefiltert[gefiltert['Datum'].dt.strftime('%Y-%m').isin(monate)]
-    if unternehmensgroesse:
-        gefiltert = gefiltert[gefiltert['Unternehmensgröße'].isin(unternehmensgroesse)]
-    if branche:
-        gefiltert = gefiltert[gefiltert['Kategorie'].isin(branche)]
-    if unternehmen:
-        gefiltert = gefiltert[gefiltert['Unternehmen'] == unternehmen]
+    filter_engine = app_kontext().filter_engine
+    # Resolve the selected filters via the shared filter engine
+    ergebnis = filter_engine.filter(job_portal=job_portal, bundesland=bundesland, beschaeftigungsart=beschaeftigungsart,
+                                    zeitmodell=zeitmodell, berufserfahrung=berufserfahrung, monate=monate,
+                                    unternehmensgroesse=unternehmensgroesse, branche=branche, unternehmen=unternehmen)
 
     # Extract available job titles
-    verfuegbare_job_titel = gefiltert['Job_Titel'].unique()
+    verfuegbare_job_titel = ergebnis.values('Job_Titel')
 
     # Create dropdown options
     optionen = [{'label': job_titel, 'value': job_titel}
@@ -1695,8 +1691,39 @@ def update_job_titel_rechts(unternehmen, job_portal, bundesland, beschaeftigungs
 
 
 # Admin-Section Callbacks
+# Callback to switch the profiling of slow callbacks on or off
+@dashboard_callback(
+    Output('profiling-status', 'children'),
+    [Input('profiling-schalter', 'value')],
+    [State('admin-passwort-eingabe', 'value')],
+    prevent_initial_call=True
+)
+def schalte_profiling(aktiv, passwort):
+    """
+    Switches the callback profiler of the server process answering the request.
+
+    While active, the profile of every callback taking longer than the threshold is written together
+    with its inputs to the profile directory (see src.profiling.CallbackProfiler). The admin password
+    is checked again on the server, since the request can be sent without opening the admin section.
+
+    Parameters:
+        aktiv (bool): New state of the switch.
+        passwort (str or None): The password entered for the admin section.
+
+    Returns:
+        str: Status message below the switch.
+    """
+    if not is_admin_password(passwort):
+        return "Nicht berechtigt: Profiling bleibt unverändert."
+    kontext = app_kontext()
+    kontext.callback_profiler.aktiv = bool(aktiv)
+    if kontext.callback_profiler.aktiv:
+        return f"Profile werden in {kontext.callback_profiler.verzeichnis} gespeichert."
+    return "Profiling ist ausgeschaltet."
+
+
 # Callback to add a new job title by pressing Enter
-@app.callback(
+@dashboard_callback(
     [Output('jobtitel-temp-speicher', 'data', allow_duplicate=True),
      Output('jobtitel-eingabe', 'value')],
     [Input('jobtitel-eingabe', 'n_submit')],
@@ -1727,7 +1754,7 @@ def jobtitel_hinzufuegen(n_submit, neuer_jobtitel, aktuelle_liste):
 
 
 # Callback to update the list of job titles in the admin interface
-@app.callback(
+@dashboard_callback(
     Output('jobtitel-liste-container', 'children'),
     [Input('jobtitel-temp-speicher', 'data')]
 )
@@ -1776,7 +1803,7 @@ def jobtitel_liste_aktualisieren(jobtitel_liste):
 
 
 # Callback to delete individual job titles from the temporary list
-@app.callback(
+@dashboard_callback(
     Output('jobtitel-temp-speicher', 'data', allow_duplicate=True),
     [Input({'type': 'jobtitel-loeschen', 'index': ALL}, 'n_clicks')],
     [State('jobtitel-temp-speicher', 'data')],
@@ -1814,7 +1841,7 @@ def jobtitel_loeschen(clicks, jobtitel_liste):
 
 
 # Callback to control the visibility of the confirmation modal for clearing the job title list
-@app.callback(
+@dashboard_callback(
     Output('bestätigen-liste-leeren-modal', 'is_open'),
     [Input('liste-leeren', 'n_clicks'),
      Input('bestätigen-liste-leeren-ja', 'n_clicks'),
@@ -1857,7 +1884,7 @@ def steuere_loeschen_modal(open_clicks, confirm_clicks, cancel_clicks):
 
 
 # Callback to delete all job titles when confirmed via the modal
-@app.callback(
+@dashboard_callback(
     Output('jobtitel-temp-speicher', 'data', allow_duplicate=True),
     [Input('bestätigen-liste-leeren-ja', 'n_clicks')],
     prevent_initial_call=True
@@ -1879,7 +1906,7 @@ def alle_jobtitel_loeschen(n_clicks):
 
 
 # Callback to upload the job title list to MongoDB when button is clicked
-@app.callback(
+@dashboard_callback(
     Output('erfolg-modal', 'is_open'),
     [Input('liste-hochladen', 'n_clicks')],
     [State('jobtitel-temp-speicher', 'data')],
@@ -1925,7 +1952,7 @@ def jobtitel_hochladen(n_clicks, jobtitel_liste):
 
 
 # Callback to close the success modal when the close button is clicked
-@app.callback(
+@dashboard_callback(
     Output('erfolg-modal', 'is_open', allow_duplicate=True),
     [Input('erfolg-modal-schliessen', 'n_clicks')],
     prevent_initial_call=True
@@ -1953,7 +1980,7 @@ def schliesse_erfolgsmodal(n_clicks):
 
 
 # Callback to hide the left filter column when the Admin area is active
-@app.callback(
+@dashboard_callback(
     [Output('hauptinhalt', 'style'),
      Output('filter-spalte', 'style')],
     [Input('nav-allgemein', 'n_clicks'),
@@ -1,28 +1,425 @@
 import sqlite3
 import gdown
+import requests
 import pandas as pd
 import json
+import hashlib
+import shutil
+import tempfile
+import time
 from functools import lru_cache
+import glob
 import os
 from pathlib import Path
+from src.data_preparation import prepare_datenrahmen, PREPARATION_VERSION
+from src.map_geometry import DETAIL_LEVELS, build_simplified_geojson, print_report, simplified_path
+from src.memory_tracking import track
+
+try:
+    import pyarrow  # noqa: F401 - Parquet engine for the columnar snapshot
+except ImportError:
+    pyarrow = None
 
 # Determine base directory
 BASE_DIR = Path(__file__).parent
 
-DB_PATH = os.path.join(BASE_DIR, "job_analysis.db")
+DB_FILENAME = "job_analysis.db"
+MANIFEST_FILENAME = "job_analysis.manifest.json"
+
+DB_PATH = os.path.join(BASE_DIR, DB_FILENAME)
+MANIFEST_PATH = os.path.join(BASE_DIR, MANIFEST_FILENAME)
 DEFAULT_GEOJSON_PATH = os.path.join(BASE_DIR, "bundeslaender.json")
 GOOGLE_DRIVE_URL = "https://drive.google.com/uc?id=1av6u76MAICXikg6f7gLmBsU8NAaOquYc"
 
+# Level of detail of the state map: 'simplified' (default) or 'original'
+GEOJSON_DETAIL = os.getenv("GEOJSON_DETAIL", "simplified")
+
+# Directory of the columnar snapshots of the prepared job_analysis table
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(BASE_DIR, "cache"))
+
+# Source of the database: either a download URL or a local directory containing
+# job_analysis.db (and optionally job_analysis.manifest.json), e.g. for offline use
+DB_SOURCE = os.getenv("DB_SOURCE", GOOGLE_DRIVE_URL)
+
+# Optional URL of a manifest ({"version": ..., "sha256": ...}) describing the remote database.
+# Without it, a URL source is checked via the ETag/Last-Modified headers of a HEAD request.
+DB_MANIFEST_URL = os.getenv("DB_MANIFEST_URL")
+
+# Download the database and compare its checksum even if no change was detected (e.g. DB_REFRESH=1)
+DB_REFRESH = os.getenv("DB_REFRESH", "0") == "1"
+
+# Timeout of the change check of a URL source in seconds
+SOURCE_CHECK_TIMEOUT = 10
+
+# Result of the last refresh of the database by load_database() (reported under /healthz and /readyz)
+letzte_aktualisierung = None
+
+
+def _is_local_source(source: str) -> bool:
+    """Checks whether the configured database source is a local path rather than a URL."""
+    return not source.startswith(("http://", "https://"))
+
+
+def _sha256(dateipfad: str) -> str:
+    """Computes the SHA-256 checksum of a file in chunks to keep memory usage constant."""
+    pruefsumme = hashlib.sha256()
+    with open(dateipfad, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            pruefsumme.update(block)
+    return pruefsumme.hexdigest()
+
+
+def _read_manifest(dateipfad: str) -> dict | None:
+    """Reads a manifest file and returns None if it is missing or invalid."""
+    try:
+        with open(dateipfad, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) and manifest.get("sha256") else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomically(zielpfad: str, schreiben) -> None:
+    """Writes a file via a temporary file in the target directory and moves it into place.
+
+    Readers therefore never see a partially written file, even if the process is interrupted.
+
+    Args:
+        zielpfad (str): Final path of the file.
+        schreiben (callable): Function receiving the temporary path and filling it.
+    """
+    fd, temp_pfad = tempfile.mkstemp(dir=os.path.dirname(zielpfad), suffix=".part")
+    os.close(fd)
+    try:
+        schreiben(temp_pfad)
+        os.replace(temp_pfad, zielpfad)
+    finally:
+        if os.path.exists(temp_pfad):
+            os.remove(temp_pfad)
+
+
+def _write_json(dateipfad: str, daten: dict) -> None:
+    """Writes a dictionary as JSON file."""
+    with open(dateipfad, "w", encoding="utf-8") as f:
+        json.dump(daten, f, indent=2)
+
+
+def _fetch_remote_manifest(source: str) -> dict | None:
+    """Determines version and checksum of the database offered by the source.
+
+    For a local directory, the manifest next to the database is used; if there is none,
+    the checksum is computed directly from the file. For a URL source, the manifest is
+    only available if ``DB_MANIFEST_URL`` is configured.
+
+    Args:
+        source (str): Download URL or local directory of the database.
+
+    Returns:
+        dict | None: Manifest with at least a ``sha256`` entry, or None if it cannot be determined.
+    """
+    if _is_local_source(source):
+        manifest = _read_manifest(os.path.join(source, MANIFEST_FILENAME))
+        if manifest is None and os.path.exists(os.path.join(source, DB_FILENAME)):
+            manifest = {"sha256": _sha256(os.path.join(source, DB_FILENAME))}
+        return manifest
+
+    if not DB_MANIFEST_URL:
+        return None
+    fd, temp_pfad = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        gdown.download(DB_MANIFEST_URL, temp_pfad, quiet=True)
+        return _read_manifest(temp_pfad)
+    finally:
+        os.remove(temp_pfad)
+
+
+def _fetch_source_tag(source: str) -> str | None:
+    """Returns a cheap change marker of a URL source: its ETag, else its Last-Modified header.
+
+    Only a HEAD request is sent, the database itself is not downloaded.
+
+    Args:
+        source (str): Download URL of the database.
+
+    Returns:
+        str | None: The marker, or None if the source provides neither header or cannot be reached.
+    """
+    try:
+        antwort = requests.head(source, allow_redirects=True, timeout=SOURCE_CHECK_TIMEOUT)
+        antwort.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Database source could not be checked: {e}")
+        return None
+    return antwort.headers.get("ETag") or antwort.headers.get("Last-Modified")
+
+
+def _download_database(source: str, erwartete_pruefsumme: str | None,
+                       lokale_pruefsumme: str | None = None) -> tuple[str, bool]:
+    """Fetches the database into a temporary file, verifies it and moves it into place.
+
+    Args:
+        source (str): Download URL or local directory of the database.
+        erwartete_pruefsumme (str | None): Expected SHA-256 checksum, if known.
+        lokale_pruefsumme (str | None, optional): Checksum of the local copy; a download with
+            the same checksum is discarded instead of replacing the local copy.
+
+    Returns:
+        tuple[str, bool]: SHA-256 checksum of the installed database and whether it was replaced.
+
+    Raises:
+        ValueError: If the downloaded file does not match the expected checksum.
+    """
+    fd, temp_pfad = tempfile.mkstemp(dir=os.path.dirname(DB_PATH), suffix=".part")
+    os.close(fd)
+    try:
+        if _is_local_source(source):
+            shutil.copyfile(os.path.join(source, DB_FILENAME), temp_pfad)
+        elif gdown.download(source, temp_pfad, quiet=True) is None:
+            raise IOError(f"Download from {source} failed")
+        pruefsumme = _sha256(temp_pfad)
+        if erwartete_pruefsumme and pruefsumme != erwartete_pruefsumme:
+            raise ValueError("Checksum of the downloaded database does not match the manifest")
+        if pruefsumme == lokale_pruefsumme:
+            return pruefsumme, False
+        os.replace(temp_pfad, DB_PATH)
+        return pruefsumme, True
+    finally:
+        if os.path.exists(temp_pfad):
+            os.remove(temp_pfad)
+
+
+def refresh_database(source: str | None = None, erzwingen: bool | None = None) -> dict:
+    """Makes sure a current copy of the database is available at ``DB_PATH``.
+
+    The local copy is preferred and used without downloading the database unless the source
+    reports a change:
+
+    - a local directory or ``DB_MANIFEST_URL`` provides a manifest with a different checksum, or
+    - a URL source without manifest answers a HEAD request with an ETag or Last-Modified value
+      different from the one recorded in the local manifest. Sources without these headers are
+      never considered changed.
+
+    With ``erzwingen`` (or ``DB_REFRESH=1``), the database is downloaded even without a detected
+    change and only replaces the local copy if its checksum differs. Downloads are verified and
+    moved into place atomically, so an interrupted download never corrupts the local database.
+    If a refresh fails but a local copy exists, the local copy is kept.
+
+    Args:
+        source (str | None, optional): Download URL or local directory of the database.
+            Defaults to ``DB_SOURCE``.
+        erzwingen (bool | None, optional): Whether to download without a detected change.
+            Defaults to ``DB_REFRESH``.
+
+    Returns:
+        dict: Result of the refresh with the keys ``status`` (``"unchanged"``, ``"downloaded"``
+        or ``"fallback"``), ``sha256`` and ``version``.
+
+    Raises:
+        Exception: If no local copy exists and the database cannot be fetched.
+    """
+    source = source or DB_SOURCE
+    erzwingen = DB_REFRESH if erzwingen is None else erzwingen
+    lokales_manifest = _read_manifest(MANIFEST_PATH) if os.path.exists(DB_PATH) else None
+    if os.path.exists(DB_PATH) and lokales_manifest is None:
+        # Local copy without manifest (e.g. copied manually): record its checksum once
+        lokales_manifest = {"sha256": _sha256(DB_PATH)}
+        _write_atomically(MANIFEST_PATH, lambda p: _write_json(p, lokales_manifest))
+
+    def unveraendert(manifest):
+        if manifest != lokales_manifest:
+            _write_atomically(MANIFEST_PATH, lambda p: _write_json(p, manifest))
+        return {"status": "unchanged", "sha256": manifest["sha256"], "version": manifest.get("version")}
+
+    try:
+        entferntes_manifest = _fetch_remote_manifest(source)
+    except Exception as e:
+        print(f"Manifest could not be fetched: {e}")
+        entferntes_manifest = None
+
+    # Change marker of a URL source without manifest; the database itself is not downloaded for it
+    kennung = None
+    if entferntes_manifest is None and not _is_local_source(source):
+        kennung = _fetch_source_tag(source)
+
+    if lokales_manifest is not None and not erzwingen:
+        if entferntes_manifest is not None:
+            if entferntes_manifest["sha256"] == lokales_manifest["sha256"]:
+                return unveraendert(lokales_manifest)
+        elif kennung is None or kennung == lokales_manifest.get("kennung"):
+            return unveraendert(lokales_manifest)
+        elif lokales_manifest.get("kennung") is None:
+            # First check of this source: remember its marker for the next start
+            return unveraendert({**lokales_manifest, "kennung": kennung})
+
+    try:
+        erwartet = entferntes_manifest["sha256"] if entferntes_manifest else None
+        pruefsumme, ersetzt = _download_database(
+            source, erwartet, lokales_manifest["sha256"] if lokales_manifest else None)
+    except Exception as e:
+        if lokales_manifest is None:
+            raise
+        print(f"Database refresh failed, using local copy: {e}")
+        return {"status": "fallback", "sha256": lokales_manifest["sha256"],
+                "version": lokales_manifest.get("version")}
+
+    if not ersetzt:
+        # Downloaded, but identical to the local copy
+        return unveraendert({**lokales_manifest, "kennung": kennung} if kennung else lokales_manifest)
+
+    neues_manifest = {"sha256": pruefsumme,
+                      "version": entferntes_manifest.get("version") if entferntes_manifest else None}
+    if kennung:
+        neues_manifest["kennung"] = kennung
+    _write_atomically(MANIFEST_PATH, lambda p: _write_json(p, neues_manifest))
+    return {"status": "downloaded", "sha256": pruefsumme, "version": neues_manifest["version"]}
+
+
+def write_local_source(verzeichnis: str, schreiben, version: str | None = None) -> str:
+    """Writes a database into a directory that can be used as local ``DB_SOURCE``.
+
+    The database is written atomically as job_analysis.db, followed by its manifest, so the
+    directory has the same layout :func:`refresh_database` expects from a local source.
+
+    Args:
+        verzeichnis (str): Target directory; created if necessary.
+        schreiben (callable): Function receiving a temporary path and writing the SQLite database to it.
+        version (str | None, optional): Version recorded in the manifest.
+
+    Returns:
+        str: SHA-256 checksum of the written database.
+    """
+    os.makedirs(verzeichnis, exist_ok=True)
+    dateipfad = os.path.join(verzeichnis, DB_FILENAME)
+    _write_atomically(dateipfad, schreiben)
+    manifest = {"sha256": _sha256(dateipfad), "version": version}
+    _write_atomically(os.path.join(verzeichnis, MANIFEST_FILENAME), lambda p: _write_json(p, manifest))
+    return manifest["sha256"]
+
+
+def local_source_checksum(verzeichnis: str) -> str:
+    """Returns the checksum of the database in a local source directory.
+
+    The manifest next to the database is used if it is valid; otherwise the checksum is computed.
+
+    Args:
+        verzeichnis (str): Directory containing job_analysis.db.
+
+    Returns:
+        str: SHA-256 checksum of the database.
+    """
+    manifest = _read_manifest(os.path.join(verzeichnis, MANIFEST_FILENAME))
+    return manifest["sha256"] if manifest else _sha256(os.path.join(verzeichnis, DB_FILENAME))
+
+
+def snapshot_path(pruefsumme: str, verzeichnis: str | None = None) -> str:
+    """Returns the path of the snapshot belonging to a database checksum.
+
+    The file name combines the checksum of the database with ``PREPARATION_VERSION``, so a
+    snapshot is only reused if both the source data and the preparation steps are unchanged.
+
+    Args:
+        pruefsumme (str): SHA-256 checksum of the source database.
+        verzeichnis (str | None, optional): Directory of the snapshot. Defaults to ``SNAPSHOT_DIR``.
+
+    Returns:
+        str: Path of the Parquet snapshot.
+    """
+    return os.path.join(verzeichnis or SNAPSHOT_DIR, f"job_analysis.{pruefsumme[:16]}.v{PREPARATION_VERSION}.parquet")
+
+
+def read_snapshot(pruefsumme: str, verzeichnis: str | None = None) -> pd.DataFrame | None:
+    """Reads the prepared DataFrame from its snapshot via memory mapping.
+
+    Args:
+        pruefsumme (str): SHA-256 checksum of the source database.
+        verzeichnis (str | None, optional): Directory of the snapshot. Defaults to ``SNAPSHOT_DIR``.
+
+    Returns:
+        pd.DataFrame | None: The prepared DataFrame, or None if no valid snapshot exists.
+    """
+    pfad = snapshot_path(pruefsumme, verzeichnis)
+    if pyarrow is None or not os.path.exists(pfad):
+        return None
+    try:
+        return pd.read_parquet(pfad, engine="pyarrow", memory_map=True)
+    except Exception as e:
+        print(f"Snapshot {pfad} could not be read: {e}")
+        return None
+
+
+def write_snapshot(datenrahmen: pd.DataFrame, pruefsumme: str, verzeichnis: str | None = None) -> str | None:
+    """Stores the prepared DataFrame as a Parquet snapshot and removes outdated snapshots.
+
+    Args:
+        datenrahmen (pd.DataFrame): The prepared DataFrame.
+        pruefsumme (str): SHA-256 checksum of the source database.
+        verzeichnis (str | None, optional): Directory of the snapshot. Defaults to ``SNAPSHOT_DIR``.
+
+    Returns:
+        str | None: Path of the written snapshot, or None if pyarrow is not installed.
+    """
+    if pyarrow is None:
+        print("pyarrow is not installed - the columnar snapshot is skipped.")
+        return None
+
+    verzeichnis = verzeichnis or SNAPSHOT_DIR
+    os.makedirs(verzeichnis, exist_ok=True)
+    pfad = snapshot_path(pruefsumme, verzeichnis)
+    _write_atomically(pfad, lambda p: datenrahmen.to_parquet(p, engine="pyarrow", index=False))
+
+    # Snapshots of older database versions are no longer needed
+    for veraltet in glob.glob(os.path.join(verzeichnis, "job_analysis.*.parquet")):
+        if veraltet != pfad:
+            os.remove(veraltet)
+    return pfad
+
+
+def read_and_prepare(dateipfad: str | None = None) -> pd.DataFrame:
+    """Reads the job_analysis table from a SQLite database (default ``DB_PATH``) and prepares it.
+
+    Args:
+        dateipfad (str | None, optional): Path of the database. Defaults to ``DB_PATH``.
+
+    Returns:
+        pd.DataFrame: The prepared DataFrame (see :func:`src.data_preparation.prepare_datenrahmen`).
+    """
+    with track('startup.sql_read'), sqlite3.connect(dateipfad or DB_PATH) as verbindung:
+        datenrahmen = pd.read_sql_query(
+            "SELECT * FROM job_analysis;",
+            verbindung
+        )
+    with track('startup.preparation'):
+        return prepare_datenrahmen(datenrahmen)
+
+
+def build_snapshot() -> str | None:
+    """Build step that refreshes the database and writes the snapshot of the prepared frame.
+
+    Running this once (e.g. ``python -m src.data_download`` after an update of the database)
+    means that no dashboard start has to go through SQLite and the pandas conversions.
+
+    Returns:
+        str | None: Path of the written snapshot, or None if pyarrow is not installed.
+    """
+    aktualisierung = refresh_database()
+    return write_snapshot(read_and_prepare(), aktualisierung["sha256"])
+
 
 @lru_cache(maxsize=None)
 def load_database() -> pd.DataFrame | None:
-    """Downloads and loads a SQLite database from Google Drive as a pandas DataFrame.
+    """Loads the prepared job analysis data as a pandas DataFrame.
 
-    This function provides temporary access to job analysis data during development.
-    In production, the database will be accessed locally or via a Docker container.
+    The database is kept locally at ``DB_PATH``. Before loading, :func:`refresh_database`
+    compares the local copy with the manifest of the configured source (Google Drive by
+    default, or a local directory via the ``DB_SOURCE`` environment variable) and only
+    downloads the file if its content has changed.
 
-    All entries are loaded from the database, which contains all available information
-    about the job advertisements.
+    The prepared DataFrame (see :func:`src.data_preparation.prepare_datenrahmen`) is read
+    from a columnar Parquet snapshot keyed by the checksum of the database. Only if no
+    snapshot exists yet, all entries are read from SQLite, prepared and stored as a new
+    snapshot for the following starts. The checksum is available as dataset version in
+    ``datenrahmen.attrs['version']``.
 
     To improve performance, the result is cached using least-recently-used (LRU) caching,
     preventing repeated downloads.
@@ -35,39 +432,64 @@ def load_database() -> pd.DataFrame | None:
         pd.errors.DatabaseError: If the SQL query using pandas fails.
         Exception: For general errors during download or data loading.
     """
+    global letzte_aktualisierung
+    aktualisierung = None
     try:
-        # Download with absolute path
-        gdown.download(
-            GOOGLE_DRIVE_URL,
-            DB_PATH,
-            quiet=True
-        )
+        with track('startup.download'):
+            aktualisierung = refresh_database()
+        pruefsumme = aktualisierung["sha256"]
 
-        with sqlite3.connect(DB_PATH) as verbindung:
-            datenrahmen = pd.read_sql_query(
-                "SELECT * FROM job_analysis;",
-                verbindung
-            )
+        with track('startup.snapshot_read'):
+            datenrahmen = read_snapshot(pruefsumme)
+        if datenrahmen is None:
+            datenrahmen = read_and_prepare()
+            try:
+                write_snapshot(datenrahmen, pruefsumme)
+            except Exception as e:
+                print(f"Snapshot could not be written: {e}")
+
+        datenrahmen.attrs['version'] = pruefsumme
+        # Only reported as successful once the frame is loaded
+        letzte_aktualisierung = {**aktualisierung, "zeitpunkt": time.time()}
         return datenrahmen
     except Exception as e:
         print(f"Error loading data: {e}")
+        letzte_aktualisierung = {**(aktualisierung or {}), "status": "error", "fehler": str(e),
+                                 "zeitpunkt": time.time()}
         return None
 
 
-def load_geojson(dateipfad: str = 'bundeslaender.json') -> dict | None:
+def load_geojson(dateipfad: str = 'bundeslaender.json', detailgrad: str | None = None) -> dict | None:
     """Load a GeoJSON file for geographic visualization in the dashboard.
 
     The file contains the map of Germany divided into federal states ("Bundesländer").
     It is used to filter and display job postings by region.
 
+    With ``detailgrad='simplified'``, the simplified variant in ``SNAPSHOT_DIR`` is loaded
+    instead (see :mod:`src.map_geometry`). It is built on first use and rebuilt whenever the
+    original file is newer; the source tree itself is never written.
+
     Args:
         dateipfad (str, optional): Path to the GeoJSON file. Defaults to 'bundeslaender.json'.
+        detailgrad (str | None, optional): 'original' or 'simplified'. Defaults to the
+            environment variable GEOJSON_DETAIL ('simplified' if not set).
 
     Returns:
-        dict | None: Parsed GeoJSON data as a dictionary, or None if loading fails.
+        dict | None: Parsed GeoJSON data as a dictionary, or None if loading fails
+        (also for an unknown ``detailgrad``).
     """
+    detailgrad = detailgrad or GEOJSON_DETAIL
+    if detailgrad not in DETAIL_LEVELS:
+        print(f"Unknown GeoJSON detail level: {detailgrad} (allowed: {', '.join(DETAIL_LEVELS)})")
+        return None
+
     try:
         pfad = dateipfad if dateipfad else DEFAULT_GEOJSON_PATH
+        if detailgrad == 'simplified':
+            variante = simplified_path(pfad, SNAPSHOT_DIR)
+            if not os.path.exists(variante) or os.path.getmtime(variante) < os.path.getmtime(pfad):
+                print_report(build_simplified_geojson(pfad, verzeichnis=SNAPSHOT_DIR))
+            pfad = variante
         with open(pfad, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
@@ -75,3 +497,7 @@ def load_geojson(dateipfad: str = 'bundeslaender.json') -> dict | None:
     except Exception as e:
         print(f"Error loading GeoJSON file: {e}")
     return None
+
+
+if __name__ == '__main__':
+    print(f"Snapshot written to: {build_snapshot()}")
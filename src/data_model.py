@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+from src.data_preparation import BENEFIT_COLUMNS
+
+# Columns identifying an advertisement; they are neither dimensions nor bridge attributes
+KEY_COLUMNS = ['MongoDB_ID', 'Anzeige_Nr']
+
+
+def _codes(spalte: pd.Series) -> np.ndarray:
+    """Returns integer codes of a column (categorical codes or factorized values, -1 for missing)."""
+    if isinstance(spalte.dtype, pd.CategoricalDtype):
+        return spalte.cat.codes.to_numpy()
+    return pd.factorize(spalte)[0]
+
+
+@dataclass
+class StarSchema:
+    """In-memory star schema of the job advertisement data.
+
+    The joined ``job_analysis`` table contains several rows per advertisement, e.g. one per
+    location or industry. The star schema separates it into:
+
+    * ``zeilen``: the joined row-level table, used for filtering. Its column ``Anzeige_Nr``
+      references the fact table.
+    * ``anzeigen``: the fact table with exactly one row per advertisement (position equals
+      ``Anzeige_Nr``), holding all single-valued attributes and the benefit flags.
+    * ``bruecken``: one bridge table per multi-valued attribute with the distinct
+      (``Anzeige_Nr``, value) pairs.
+    * ``dimensionen``: the distinct values of every categorical attribute.
+
+    Counts of advertisements and benefit sums are computed on the fact table with integer
+    positions, instead of deduplicating the filtered row-level frame by ``MongoDB_ID``.
+    Selections of rows are passed as row positions in ``zeilen`` (see :mod:`src.filter_index`).
+
+    Attributes:
+        zeilen (pd.DataFrame): Row-level table.
+        anzeigen (pd.DataFrame): Fact table with one row per advertisement.
+        bruecken (dict[str, pd.DataFrame]): Bridge tables of the multi-valued attributes.
+        dimensionen (dict[str, pd.Index]): Dimension tables of the categorical attributes.
+        version (str | None): Version of the underlying dataset.
+    """
+    zeilen: pd.DataFrame
+    anzeigen: pd.DataFrame
+    bruecken: dict = field(default_factory=dict)
+    dimensionen: dict = field(default_factory=dict)
+    version: str | None = None
+
+    def is_multi_valued(self, spalte: str) -> bool:
+        """Checks whether an attribute can take several values per advertisement."""
+        return spalte in self.bruecken
+
+    def ad_numbers(self, positionen: np.ndarray) -> np.ndarray:
+        """Returns the sorted, distinct advertisement numbers contained in a selection of rows.
+
+        Args:
+            positionen (np.ndarray): Row positions of the selection in ``zeilen``.
+
+        Returns:
+            np.ndarray: Positions of the selected advertisements in the fact table.
+        """
+        return np.unique(self.zeilen['Anzeige_Nr'].to_numpy()[positionen])
+
+    def count_distinct(self, positionen: np.ndarray, anzeigen_nr: np.ndarray, spalte: str) -> int:
+        """Counts the distinct values of an attribute among the selected advertisements.
+
+        Args:
+            positionen (np.ndarray): Row positions of the selection in ``zeilen``.
+            anzeigen_nr (np.ndarray): Result of :meth:`ad_numbers` for the same selection.
+            spalte (str): Name of the attribute.
+
+        Returns:
+            int: Number of distinct non-missing values.
+        """
+        if self.is_multi_valued(spalte):
+            return self.zeilen[spalte].iloc[positionen].nunique()
+        return self.anzeigen[spalte].iloc[anzeigen_nr].nunique()
+
+    def ads_per_value(self, positionen: np.ndarray, anzeigen_nr: np.ndarray, spalte: str) -> pd.Series:
+        """Counts the selected advertisements per value of an attribute.
+
+        For single-valued attributes, the values are taken from the fact table. For multi-valued
+        attributes, each advertisement is counted once per distinct value among its selected rows.
+
+        Args:
+            positionen (np.ndarray): Row positions of the selection in ``zeilen``.
+            anzeigen_nr (np.ndarray): Result of :meth:`ad_numbers` for the same selection.
+            spalte (str): Name of the attribute.
+
+        Returns:
+            pd.Series: Number of advertisements per occurring value, indexed by value.
+        """
+        if self.is_multi_valued(spalte):
+            paare = self.zeilen[['Anzeige_Nr', spalte]].iloc[positionen].drop_duplicates()
+            return paare.groupby(spalte, observed=True).size()
+        return self.anzeigen[spalte].iloc[anzeigen_nr].value_counts(sort=False).loc[lambda s: s > 0]
+
+    def benefit_sums(self, anzeigen_nr: np.ndarray, spalten: list[str]) -> pd.Series:
+        """Counts how many of the selected advertisements offer each benefit.
+
+        Args:
+            anzeigen_nr (np.ndarray): Positions of the selected advertisements.
+            spalten (list[str]): Benefit columns to sum up.
+
+        Returns:
+            pd.Series: Number of advertisements per benefit column.
+        """
+        return self.anzeigen[spalten].iloc[anzeigen_nr].sum()
+
+
+def build_star_schema(datenrahmen: pd.DataFrame) -> StarSchema:
+    """Builds the star schema from the prepared row-level job advertisement frame.
+
+    An attribute is treated as multi-valued if at least one advertisement has rows with
+    different values for it. Benefit flags always belong to the advertisement and are taken
+    from its first row.
+
+    Args:
+        datenrahmen (pd.DataFrame): Prepared frame including the ``Anzeige_Nr`` column
+            (see :func:`src.data_preparation.prepare_datenrahmen`).
+
+    Returns:
+        StarSchema: The star schema referencing ``datenrahmen`` as its row-level table.
+    """
+    anzeigen_nr = datenrahmen['Anzeige_Nr'].to_numpy()
+    # Position of the first row of each advertisement; Anzeige_Nr is numbered by first occurrence
+    _, erste_zeilen = np.unique(anzeigen_nr, return_index=True)
+
+    bruecken = {}
+    for spalte in datenrahmen.columns:
+        if spalte in KEY_COLUMNS or spalte in BENEFIT_COLUMNS:
+            continue
+        codes = _codes(datenrahmen[spalte])
+        if (codes != codes[erste_zeilen][anzeigen_nr]).any():
+            bruecken[spalte] = (datenrahmen[['Anzeige_Nr', spalte]]
+                                .drop_duplicates()
+                                .reset_index(drop=True))
+
+    einwertige_spalten = [spalte for spalte in datenrahmen.columns if spalte not in bruecken]
+    anzeigen = datenrahmen[einwertige_spalten].iloc[erste_zeilen].reset_index(drop=True)
+
+    dimensionen = {spalte: datenrahmen[spalte].cat.categories
+                   for spalte in datenrahmen.columns
+                   if isinstance(datenrahmen[spalte].dtype, pd.CategoricalDtype)}
+
+    return StarSchema(
+        zeilen=datenrahmen,
+        anzeigen=anzeigen,
+        bruecken=bruecken,
+        dimensionen=dimensionen,
+        version=datenrahmen.attrs.get('version')
+    )
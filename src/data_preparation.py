@@ -0,0 +1,185 @@
+import pandas as pd
+from src.memory_tracking import track
+
+# Version of the preparation steps below. It is part of the snapshot key, so it must be
+# increased whenever the prepared frame changes (new derived columns, other dtypes, ...).
+PREPARATION_VERSION = 4
+
+# Low-cardinality text columns used as filter dimensions, stored as categoricals
+DIMENSION_COLUMNS = [
+    'Portal_Name',
+    'Bundesland',
+    'Kategorie',
+    'Position',
+    'Zeitmodell',
+    'Beschäftigungsart',
+    'Land'
+]
+
+# Desired order of company sizes for consistent display (smallest to largest)
+COMPANY_SIZE_ORDER = [
+    "0-10",
+    "11-50",
+    "51-250",
+    "251-500",
+    "501-1000",
+    "1001-2500",
+    "2501-10000",
+    "10000+",
+    "Keine Angaben"
+]
+
+# Compensation and benefit flags, grouped by the categories of the comparison dashboard
+FINANCIAL_COLUMNS = [
+    'Gehalt_anhand_von_Tarifklassen',
+    'Überstundenvergütung',
+    'Gehaltserhöhungen',
+    'Aktienoptionen_Gewinnbeteiligung',
+    'Boni',
+    'Sonderzahlungen',
+    '13. Gehalt',
+    'Betriebliche_Altersvorsorge'
+]
+
+WORK_ENVIRONMENT_COLUMNS = [
+    'Flexible_Arbeitsmodelle',
+    'Homeoffice',
+    'Arbeitsumfeld_Ausstattung'
+]
+
+ADDITIONAL_BENEFIT_COLUMNS = [
+    'Weiterbildung_und_Entwicklungsmöglichkeiten',
+    'Gesundheit_und_Wohlbefinden',
+    'Finanzielle_Vergünstigungen',
+    'Mobilitätsangebote',
+    'Verpflegung',
+    'Zusätzliche_Urlaubstage',
+    'Familien_Unterstützung',
+    'Onboarding_und_Mentoring_Programme',
+    'Teamevents_Firmenfeiern'
+]
+
+BENEFIT_COLUMNS = FINANCIAL_COLUMNS + WORK_ENVIRONMENT_COLUMNS + ADDITIONAL_BENEFIT_COLUMNS
+
+
+# German month names for the labels of the month filter, independent of the system locale
+MONTH_NAMES = [
+    'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
+    'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'
+]
+
+
+def month_key(monat: str) -> int:
+    """Converts a month in 'YYYY-MM' format (as used by the month filter) into its integer key YYYYMM."""
+    return int(monat[:4]) * 100 + int(monat[5:7])
+
+
+def month_keys(monate: list[str] | None) -> list[int]:
+    """Converts selected months in 'YYYY-MM' format into the integer keys of the ``Monat`` column."""
+    return [month_key(monat) for monat in monate or []]
+
+
+def month_value(schluessel: int) -> str:
+    """Converts an integer month key YYYYMM back into the 'YYYY-MM' format of the month filter."""
+    return f"{schluessel // 100:04d}-{schluessel % 100:02d}"
+
+
+def month_label(monat: str) -> str:
+    """Formats a month in 'YYYY-MM' format as German label, e.g. 'Mai 2025'."""
+    return f"{MONTH_NAMES[int(monat[5:7]) - 1]} {monat[:4]}"
+
+
+def apply_schema(datenrahmen: pd.DataFrame) -> pd.DataFrame:
+    """Converts the columns of the job advertisement frame into compact dtypes.
+
+    * Filter dimensions (``DIMENSION_COLUMNS``) become categoricals, which store each distinct
+      text only once and let ``isin`` filters compare integer codes instead of strings.
+    * ``Unternehmensgröße`` becomes an ordered categorical following ``COMPANY_SIZE_ORDER``.
+      Sizes not contained in that list are kept and appended at the end.
+    * Benefit flags (``BENEFIT_COLUMNS``) become booleans; missing values count as "not offered".
+
+    Columns that are not present in the frame are skipped.
+
+    Args:
+        datenrahmen (pd.DataFrame): The job advertisement frame.
+
+    Returns:
+        pd.DataFrame: The same frame with converted columns.
+    """
+    for spalte in DIMENSION_COLUMNS:
+        if spalte in datenrahmen.columns:
+            datenrahmen[spalte] = datenrahmen[spalte].astype('category')
+
+    if 'Unternehmensgröße' in datenrahmen.columns:
+        vorhandene_groessen = datenrahmen['Unternehmensgröße'].dropna().unique()
+        unbekannte_groessen = sorted(groesse for groesse in vorhandene_groessen
+                                     if groesse not in COMPANY_SIZE_ORDER)
+        datenrahmen['Unternehmensgröße'] = pd.Categorical(
+            datenrahmen['Unternehmensgröße'],
+            categories=COMPANY_SIZE_ORDER + unbekannte_groessen,
+            ordered=True
+        )
+
+    for spalte in BENEFIT_COLUMNS:
+        if spalte in datenrahmen.columns:
+            datenrahmen[spalte] = pd.to_numeric(datenrahmen[spalte], errors='coerce').fillna(0).astype(bool)
+
+    return datenrahmen
+
+
+def print_memory_usage(vorher: pd.Series, nachher: pd.Series) -> None:
+    """Prints the memory usage per column before and after the schema conversion.
+
+    Args:
+        vorher (pd.Series): Result of ``memory_usage(deep=True)`` before the conversion.
+        nachher (pd.Series): Result of ``memory_usage(deep=True)`` after the conversion.
+    """
+    print(f"{'Spalte':<45}{'vorher (KB)':>14}{'nachher (KB)':>14}")
+    for spalte in nachher.index:
+        if spalte == 'Index':
+            continue
+        print(f"{spalte:<45}{vorher.get(spalte, 0) / 1024:>14.1f}{nachher[spalte] / 1024:>14.1f}")
+    print(f"{'Gesamt':<45}{vorher.sum() / 1024:>14.1f}{nachher.sum() / 1024:>14.1f}")
+
+
+def prepare_datenrahmen(datenrahmen: pd.DataFrame, speicher_ausgeben: bool = True) -> pd.DataFrame:
+    """Prepares the raw job_analysis table for use in the dashboard.
+
+    All conversions that previously ran at dashboard startup are bundled here, so that the
+    prepared frame can be stored once as a columnar snapshot and reused on later starts.
+
+    Currently the following steps are applied:
+
+    * ``Datum`` is parsed from the German date format ``DD.MM.YYYY`` into ``datetime64``.
+    * The compact schema of :func:`apply_schema` is applied.
+    * ``Monat`` is derived from ``Datum`` as integer key YYYYMM, so month filters compare
+      integers instead of formatting every date as a string (see :func:`month_keys`).
+    * ``Anzeige_Nr`` numbers the advertisements (distinct ``MongoDB_ID`` values) in order of
+      their first occurrence. It links the rows to the fact table of :mod:`src.data_model`.
+
+    Args:
+        datenrahmen (pd.DataFrame): Raw content of the ``job_analysis`` table.
+        speicher_ausgeben (bool, optional): Whether to print the memory usage per column
+            before and after the preparation. Defaults to True.
+
+    Returns:
+        pd.DataFrame: The prepared DataFrame.
+    """
+    vorher = datenrahmen.memory_usage(deep=True) if speicher_ausgeben else None
+
+    # Convert date column to datetime format
+    with track('startup.date_parsing'):
+        datenrahmen['Datum'] = pd.to_datetime(datenrahmen['Datum'], format='%d.%m.%Y')
+
+    # Month key computed once for all month filters
+    datenrahmen['Monat'] = (datenrahmen['Datum'].dt.year * 100 + datenrahmen['Datum'].dt.month).astype('int32')
+
+    # Integer number of each advertisement, used instead of hashing MongoDB_ID strings
+    datenrahmen['Anzeige_Nr'] = pd.factorize(datenrahmen['MongoDB_ID'], use_na_sentinel=False)[0].astype('int32')
+
+    datenrahmen = apply_schema(datenrahmen)
+
+    if speicher_ausgeben:
+        print_memory_usage(vorher, datenrahmen.memory_usage(deep=True))
+
+    return datenrahmen
@@ -0,0 +1,253 @@
+from collections import OrderedDict
+from dataclasses import dataclass, fields, replace
+from functools import cached_property
+import threading
+import numpy as np
+import pandas as pd
+from src.data_model import StarSchema
+from src.data_preparation import month_keys
+from src.filter_index import BitmapIndex
+from src.metrics import phase
+
+# Filter fields of the dashboard and the column each of them restricts
+FILTER_COLUMNS = {
+    'job_portal': 'Portal_Name',
+    'bundesland': 'Bundesland',
+    'beschaeftigungsart': 'Beschäftigungsart',
+    'position': 'Position',
+    'zeitmodell': 'Zeitmodell',
+    'berufserfahrung': 'Berufserfahrung_vorausgesetzt',
+    'monate': 'Monat',
+    'unternehmensgroesse': 'Unternehmensgröße',
+    'branche': 'Kategorie',
+    'job_titel': 'Job_Titel',
+    'unternehmen': 'Unternehmen'
+}
+
+# Mapping of the employment type filter to the values of the 'Beschäftigungsart' column
+EMPLOYMENT_TYPE_MAPPING = {
+    'befristet': ['befristet'],
+    'unbefristet': ['Feste Anstellung']
+}
+
+# Number of filter results kept in memory per engine
+RESULT_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class FilterState:
+    """Normalized selection of all dashboard filters.
+
+    Multi-select filters are stored as sorted tuples without duplicates and empty selections
+    as empty tuple or None, so that equal selections compare (and hash) equal regardless of
+    the order in which the values were picked. Instances are created via :meth:`from_inputs`.
+    """
+    job_portal: tuple = ()
+    bundesland: tuple = ()
+    beschaeftigungsart: str | None = None
+    position: tuple = ()
+    zeitmodell: str | None = None
+    berufserfahrung: int | None = None
+    monate: tuple = ()
+    unternehmensgroesse: tuple = ()
+    branche: tuple = ()
+    job_titel: str | None = None
+    unternehmen: str | None = None
+
+    @classmethod
+    def from_inputs(cls, **auswahl) -> 'FilterState':
+        """Creates a normalized filter state from the raw values of the dashboard inputs.
+
+        Args:
+            **auswahl: Filter values by field name (see ``FILTER_COLUMNS``). Lists are
+                multi-select values, other values single selections; None means "not set".
+
+        Returns:
+            FilterState: The normalized filter state.
+        """
+        werte = {}
+        for feld, wert in auswahl.items():
+            if feld not in FILTER_COLUMNS:
+                raise ValueError(f"Unbekannter Filter: {feld}")
+            if isinstance(wert, (list, tuple, set)):
+                werte[feld] = tuple(sorted(set(wert), key=str))
+            elif wert is not None and wert != '':
+                werte[feld] = wert
+        return cls(**werte)
+
+    def without(self, *felder: str) -> 'FilterState':
+        """Returns a copy of the state in which the given filters are not set."""
+        return replace(self, **{feld: FilterState.__dataclass_fields__[feld].default for feld in felder})
+
+    def conditions(self) -> dict:
+        """Translates the state into conditions of the bitmap index (column to list of values)."""
+        bedingungen = {}
+        for feld in fields(self):
+            wert = getattr(self, feld.name)
+            if wert is None or wert == ():
+                continue
+            if feld.name == 'beschaeftigungsart':
+                bedingungen[FILTER_COLUMNS[feld.name]] = EMPLOYMENT_TYPE_MAPPING.get(wert, [])
+            elif feld.name == 'monate':
+                bedingungen[FILTER_COLUMNS[feld.name]] = month_keys(list(wert))
+            elif isinstance(wert, tuple):
+                bedingungen[FILTER_COLUMNS[feld.name]] = list(wert)
+            else:
+                bedingungen[FILTER_COLUMNS[feld.name]] = [wert]
+        return bedingungen
+
+
+class FilterResult:
+    """Result of one filter state: the selected rows and aggregates derived from them.
+
+    Aggregates are computed on first access and kept with the result, so that all callbacks
+    sharing a filter state also share the counts computed for it.
+
+    Args:
+        sternschema (StarSchema): Star schema of the dataset the rows belong to.
+        zeilen (np.ndarray): Sorted row positions of the selection.
+    """
+
+    def __init__(self, sternschema: StarSchema, zeilen: np.ndarray):
+        self.sternschema = sternschema
+        self.zeilen = zeilen
+        self._aggregate = {}
+
+    @cached_property
+    def anzeigen_nr(self) -> np.ndarray:
+        """Positions of the selected advertisements in the fact table."""
+        with phase('dedup'):
+            return self.sternschema.ad_numbers(self.zeilen)
+
+    @property
+    def anzahl_anzeigen(self) -> int:
+        """Number of distinct selected advertisements."""
+        return len(self.anzeigen_nr)
+
+    def _merken(self, schluessel: tuple, berechnen):
+        """Returns a cached aggregate, computing it on first access."""
+        if schluessel not in self._aggregate:
+            with phase('aggregation'):
+                self._aggregate[schluessel] = berechnen()
+        return self._aggregate[schluessel]
+
+    def values(self, spalte: str) -> np.ndarray:
+        """Returns the distinct non-missing values of a column among the selected rows."""
+        return self._merken(('values', spalte),
+                            lambda: self.sternschema.zeilen[spalte].iloc[self.zeilen].dropna().unique())
+
+    def value_counts(self, spalte: str) -> pd.Series:
+        """Counts the selected rows per value of a column (values without rows are omitted)."""
+        return self._merken(('value_counts', spalte),
+                            lambda: self.sternschema.zeilen[spalte].iloc[self.zeilen].value_counts(sort=False)
+                            .loc[lambda anzahl: anzahl > 0])
+
+    def count_distinct(self, spalte: str) -> int:
+        """Counts the distinct values of an attribute among the selected advertisements."""
+        return self._merken(('count_distinct', spalte),
+                            lambda: self.sternschema.count_distinct(self.zeilen, self.anzeigen_nr, spalte))
+
+    def ads_per_value(self, spalte: str) -> pd.Series:
+        """Counts the selected advertisements per value of an attribute."""
+        return self._merken(('ads_per_value', spalte),
+                            lambda: self.sternschema.ads_per_value(self.zeilen, self.anzeigen_nr, spalte))
+
+    def benefit_sums(self, spalten: list[str]) -> pd.Series:
+        """Counts how many of the selected advertisements offer each benefit."""
+        return self._merken(('benefit_sums', tuple(spalten)),
+                            lambda: self.sternschema.benefit_sums(self.anzeigen_nr, spalten))
+
+
+class FilterEngine:
+    """Shared filter engine of all dashboard callbacks.
+
+    The engine resolves a :class:`FilterState` via the bitmap index and memoizes the resulting
+    :class:`FilterResult` for the dataset version it was built for. Callbacks triggered by the
+    same user action with the same filter state therefore share one filter evaluation and its
+    aggregates instead of filtering the dataset separately.
+
+    Args:
+        sternschema (StarSchema): Star schema of the dataset; its row-level table is indexed.
+        cache_groesse (int, optional): Number of memoized results. Defaults to RESULT_CACHE_SIZE.
+    """
+
+    def __init__(self, sternschema: StarSchema, cache_groesse: int = RESULT_CACHE_SIZE):
+        self.sternschema = sternschema
+        self.version = sternschema.version
+        self.index = BitmapIndex(sternschema.zeilen, list(FILTER_COLUMNS.values()))
+        self.cache_groesse = cache_groesse
+        self._ergebnisse = OrderedDict()
+        self._sperre = threading.Lock()
+
+    def evaluate(self, zustand: FilterState) -> FilterResult:
+        """Returns the (memoized) result of a filter state.
+
+        Args:
+            zustand (FilterState): Normalized filter selection.
+
+        Returns:
+            FilterResult: Selected rows and their derived aggregates.
+        """
+        ergebnis = self._gespeichert(zustand)
+        if ergebnis is None:
+            with phase('filter'):
+                ergebnis = FilterResult(self.sternschema, self.index.select(zustand.conditions()))
+            self._speichern(zustand, ergebnis)
+        return ergebnis
+
+    def _gespeichert(self, zustand: FilterState) -> FilterResult | None:
+        """Returns the memoized result of a filter state, or None."""
+        schluessel = (self.version, zustand)
+        with self._sperre:
+            if schluessel in self._ergebnisse:
+                self._ergebnisse.move_to_end(schluessel)
+                return self._ergebnisse[schluessel]
+        return None
+
+    def _speichern(self, zustand: FilterState, ergebnis: FilterResult) -> None:
+        """Memoizes a result and drops the least recently used ones beyond the limit."""
+        with self._sperre:
+            self._ergebnisse[(self.version, zustand)] = ergebnis
+            while len(self._ergebnisse) > self.cache_groesse:
+                self._ergebnisse.popitem(last=False)
+
+    def clear(self) -> None:
+        """Discards all memoized filter results."""
+        with self._sperre:
+            self._ergebnisse.clear()
+
+    def filter(self, **auswahl) -> FilterResult:
+        """Normalizes the raw dashboard inputs and returns the result (see :meth:`evaluate`)."""
+        return self.evaluate(FilterState.from_inputs(**auswahl))
+
+    def facets(self, zustand: FilterState, felder: list[str]) -> dict[str, FilterResult]:
+        """Resolves the cascading options of several filters for one filter state.
+
+        The options of a filter depend on all other filters, but not on its own selection.
+        For every field, the result of the state without that field is returned. Fields that
+        are not set share the result of the full state. All missing results are resolved in one
+        pass over the bitmap index: the mask of every set filter is built once and the masks
+        leaving one filter out are combined from them (see
+        :meth:`src.filter_index.BitmapIndex.combine_leave_one_out`); memoized results are reused.
+
+        Args:
+            zustand (FilterState): Normalized filter selection.
+            felder (list[str]): Filter fields (see ``FILTER_COLUMNS``) to compute options for.
+
+        Returns:
+            dict[str, FilterResult]: Result of "all filters except this one" per field. The
+            options and their counts follow from e.g. ``ads_per_value(FILTER_COLUMNS[feld])``.
+        """
+        zustaende = {feld: zustand.without(feld) for feld in felder}
+        ergebnisse = {teilzustand: self._gespeichert(teilzustand) for teilzustand in set(zustaende.values())}
+        fehlend = [teilzustand for teilzustand, ergebnis in ergebnisse.items() if ergebnis is None]
+        if fehlend:
+            with phase('filter'):
+                gesamt, ohne = self.index.combine_leave_one_out(zustand.conditions())
+                for feld, teilzustand in zustaende.items():
+                    if ergebnisse[teilzustand] is None:
+                        maske = gesamt if teilzustand == zustand else ohne[FILTER_COLUMNS[feld]]
+                        ergebnisse[teilzustand] = FilterResult(self.sternschema, self.index.positions(maske))
+            for teilzustand in fehlend:
+                self._speichern(teilzustand, ergebnisse[teilzustand])
+        return {feld: ergebnisse[teilzustand] for feld, teilzustand in zustaende.items()}
@@ -0,0 +1,148 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Dimensions with up to this many distinct values get all their bitmaps built at load time.
+# Bitmaps of dimensions with more values (job titles, companies) are built on first use.
+EAGER_CARDINALITY_LIMIT = 256
+
+# Maximum number of lazily built bitmaps kept per dimension
+LAZY_BITMAP_LIMIT = 512
+
+
+class BitmapIndex:
+    """Bitmap index over the filter dimensions of the job advertisement frame.
+
+    For every (dimension, value) pair, the index holds a bit-packed row mask (one bit per row).
+    A filter request is resolved by OR-ing the masks of the selected values within a dimension
+    and AND-ing the results across dimensions. Only the final mask is unpacked into row
+    positions, so no intermediate copies of the DataFrame are created.
+
+    Args:
+        datenrahmen (pd.DataFrame): The row-level job advertisement frame.
+        spalten (list[str]): Columns to index.
+    """
+
+    def __init__(self, datenrahmen: pd.DataFrame, spalten: list[str]):
+        self.anzahl_zeilen = len(datenrahmen)
+        self._codes = {}
+        self._werte = {}
+        self._bitmaps = {}
+
+        for spalte in spalten:
+            if spalte not in datenrahmen.columns:
+                continue
+            serie = datenrahmen[spalte]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                codes, werte = serie.cat.codes.to_numpy(), serie.cat.categories
+            else:
+                codes, werte = pd.factorize(serie)
+            self._codes[spalte] = codes
+            self._werte[spalte] = {wert: code for code, wert in enumerate(werte)}
+
+            if len(werte) <= EAGER_CARDINALITY_LIMIT:
+                self._bitmaps[spalte] = self._build_all_bitmaps(codes, len(werte))
+            else:
+                self._bitmaps[spalte] = OrderedDict()
+
+    def _build_all_bitmaps(self, codes: np.ndarray, anzahl_werte: int) -> np.ndarray:
+        """Builds the packed bitmaps of all values of a dimension (one row per value)."""
+        bitmaps = np.empty((anzahl_werte, (self.anzahl_zeilen + 7) // 8), dtype=np.uint8)
+        for code in range(anzahl_werte):
+            bitmaps[code] = np.packbits(codes == code)
+        return bitmaps
+
+    def _bitmap(self, spalte: str, code: int) -> np.ndarray:
+        """Returns the packed bitmap of one value, building and caching it if necessary."""
+        bitmaps = self._bitmaps[spalte]
+        if isinstance(bitmaps, np.ndarray):
+            return bitmaps[code]
+        if code in bitmaps:
+            bitmaps.move_to_end(code)
+        else:
+            bitmaps[code] = np.packbits(self._codes[spalte] == code)
+            if len(bitmaps) > LAZY_BITMAP_LIMIT:
+                bitmaps.popitem(last=False)
+        return bitmaps[code]
+
+    def mask(self, spalte: str, werte: list) -> np.ndarray:
+        """Returns the packed row mask of all rows whose value is one of ``werte`` (OR).
+
+        Args:
+            spalte (str): Indexed column.
+            werte (list): Selected values; values that do not occur match no row.
+
+        Returns:
+            np.ndarray: Bit-packed row mask.
+        """
+        ergebnis = np.zeros((self.anzahl_zeilen + 7) // 8, dtype=np.uint8)
+        for wert in werte:
+            code = self._werte[spalte].get(wert)
+            if code is not None:
+                np.bitwise_or(ergebnis, self._bitmap(spalte, code), out=ergebnis)
+        return ergebnis
+
+    def combine(self, bedingungen: dict) -> np.ndarray | None:
+        """Combines the conditions of several dimensions (AND across dimensions).
+
+        Args:
+            bedingungen (dict): Mapping of indexed column to the list of selected values.
+
+        Returns:
+            np.ndarray | None: Bit-packed row mask, or None if there is no condition (all rows).
+        """
+        ergebnis = None
+        for spalte, werte in bedingungen.items():
+            maske = self.mask(spalte, werte)
+            if ergebnis is None:
+                ergebnis = maske
+            else:
+                np.bitwise_and(ergebnis, maske, out=ergebnis)
+        return ergebnis
+
+    def combine_leave_one_out(self, bedingungen: dict) -> tuple[np.ndarray | None, dict]:
+        """Combines the conditions of several dimensions, once with all and once without each of them.
+
+        The mask of every dimension is built once. The masks leaving one dimension out are the AND
+        of the running combinations before and after that dimension, so ``k`` conditions cost
+        about ``3k`` AND operations instead of ``k * k``.
+
+        Args:
+            bedingungen (dict): Mapping of indexed column to the list of selected values.
+
+        Returns:
+            tuple[np.ndarray | None, dict]: The mask of all conditions and, per column of
+            ``bedingungen``, the mask of all other conditions (None stands for all rows).
+        """
+        def und(links, rechts):
+            if links is None or rechts is None:
+                return rechts if links is None else links
+            return np.bitwise_and(links, rechts)
+
+        spalten = list(bedingungen)
+        masken = [self.mask(spalte, bedingungen[spalte]) for spalte in spalten]
+        davor, danach = [None], [None]
+        for maske in masken:
+            davor.append(und(davor[-1], maske))
+        for maske in reversed(masken):
+            danach.append(und(danach[-1], maske))
+        danach.reverse()
+        ohne = {spalte: und(davor[i], danach[i + 1]) for i, spalte in enumerate(spalten)}
+        return davor[-1], ohne
+
+    def positions(self, maske: np.ndarray | None) -> np.ndarray:
+        """Unpacks a packed row mask into row positions (all rows if ``maske`` is None)."""
+        if maske is None:
+            return np.arange(self.anzahl_zeilen)
+        return np.flatnonzero(np.unpackbits(maske, count=self.anzahl_zeilen))
+
+    def select(self, bedingungen: dict) -> np.ndarray:
+        """Returns the positions of all rows fulfilling the given conditions.
+
+        Args:
+            bedingungen (dict): Mapping of indexed column to the list of selected values.
+
+        Returns:
+            np.ndarray: Sorted row positions.
+        """
+        return self.positions(self.combine(bedingungen))
@@ -459,7 +459,7 @@ def get_comparison_dashboard_layout(datenrahmen, unternehmen):
     })
 
 
-def get_admin_dashboard_layout():
+def get_admin_dashboard_layout(profiling_aktiv=False, profiling_schwelle_ms=1000):
     """
     Builds the layout for the admin section of the dashboard.
 
@@ -480,6 +480,11 @@ def get_admin_dashboard_layout():
         - Action buttons for clearing and uploading the job title list.
         - Informational alert box guiding the user through the workflow.
         - Confirmation modal for list clearing and success modal after upload.
+        - Switch for profiling slow callbacks of the running server.
+
+    Parameters:
+        profiling_aktiv (bool): Current state of the callback profiler.
+        profiling_schwelle_ms (float): Duration from which the profile of a callback is kept.
 
     Returns:
         html.Div: A Dash HTML Div component containing the full layout of the admin dashboard.
@@ -578,6 +583,15 @@ def get_admin_dashboard_layout():
                         style={'width': '100%', 'padding': '10px'}
                     ),
 
+                    # Switch for profiling slow callbacks
+                    html.Hr(),
+                    dbc.Switch(
+                        id='profiling-schalter',
+                        label=f"Langsame Callbacks profilieren (ab {profiling_schwelle_ms:.0f} ms)",
+                        value=profiling_aktiv
+                    ),
+                    html.Div(id='profiling-status', style={'fontSize': '0.9em', 'color': 'gray'}),
+
                     # Confirmation modal for clearing the list
                     dbc.Modal(
                         [
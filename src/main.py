@@ -1,3 +1,4 @@
+import gc
 import os
 from src.data_download import load_database, load_geojson
 from src.jobs_upload import (
@@ -6,7 +7,82 @@ from src.jobs_upload import (
     delete_job_title,
     delete_all_job_titles
 )
-from src.dashboard import app  # Import the Dash app from dashboard.py
+from src.dashboard import app_kontext, create_app  # App factory of the dashboard and the data context of its apps
+
+# Server mode: 'development' (Dash development server with debug tools) or 'production' (gunicorn)
+SERVER_MODE = os.getenv("SERVER_MODE", "development")
+
+# Settings of the production server
+PORT = int(os.getenv("PORT", "8050"))
+GUNICORN_WORKERS = int(os.getenv("GUNICORN_WORKERS", str(min(2 * (os.cpu_count() or 1) + 1, 8))))
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "4"))
+GUNICORN_TIMEOUT = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def create_server():
+    """
+    Builds the dashboard and returns its Flask server, e.g. for `gunicorn --preload "src.main:create_server()"`.
+
+    Returns:
+        flask.Flask: The server of the dashboard application.
+    """
+    return create_app().server
+
+
+def run_production_server(server=None, workers: int = GUNICORN_WORKERS, threads: int = GUNICORN_THREADS,
+                          port: int = PORT):
+    """
+    Serves the dashboard with gunicorn.
+
+    The dashboard (including the dataset) is built once in the gunicorn master process.
+    The workers are forked afterwards and share the loaded data copy-on-write instead of
+    loading it again. Before forking, all objects existing so far are moved out of the reach of the
+    garbage collector (``gc.freeze``), so that its bookkeeping does not copy the shared memory pages.
+    The workers are only forked after the cache warm-up (see :mod:`src.cache_warmer`) has finished,
+    so all of them start with the precomputed results.
+
+    The number of worker processes and threads per worker is configured via the environment
+    variables GUNICORN_WORKERS and GUNICORN_THREADS; the port via PORT.
+
+    Args:
+        server (flask.Flask, optional): Server of an already built dashboard, e.g. on a synthetic
+            dataset. Defaults to the server of :func:`create_server`.
+        workers (int, optional): Number of worker processes. Defaults to GUNICORN_WORKERS.
+        threads (int, optional): Number of threads per worker. Defaults to GUNICORN_THREADS.
+        port (int, optional): Port of the server. Defaults to PORT.
+    """
+    # Import only in production mode: gunicorn is not available on Windows
+    from gunicorn.app.base import BaseApplication
+
+    class DashboardServer(BaseApplication):
+        """Gunicorn application serving the already built Flask server."""
+
+        def load_config(self):
+            einstellungen = {
+                'bind': f"0.0.0.0:{port}",
+                'workers': workers,
+                'threads': threads,
+                'worker_class': 'gthread',
+                'timeout': GUNICORN_TIMEOUT,
+                'preload_app': True,
+                'accesslog': '-'
+            }
+            for name, wert in einstellungen.items():
+                self.cfg.set(name, wert)
+
+        def load(self):
+            return server
+
+    if server is None:
+        server = create_server()
+    # Finish the cache warm-up before forking, so that every worker starts with the warm caches
+    print("Warming up the caches ...")
+    app_kontext(server).cache_warmer.wait()
+    gc.collect()
+    gc.freeze()
+    print(f"Dashboard running in production mode at: http://localhost:{port}/ "
+          f"({workers} workers, {threads} threads each)")
+    DashboardServer().run()
 
 
 def main():
@@ -24,6 +100,9 @@ def main():
     Dash/Flask server. While this address appears in the terminal output, it is primarily used
     for containerized environments such as Docker, where external access to the app is required.
 
+    With the environment variable ``SERVER_MODE=production``, the dashboard is served by gunicorn
+    with several worker processes and debug tooling disabled (see :func:`run_production_server`).
+
     The dashboard provides the following core functionalities:
 
     * Visualization and interactive exploration of job advertisement data
@@ -31,13 +110,20 @@ def main():
     * Administrative tools to manage job titles used for web scraping
     """
 
+    if SERVER_MODE == 'production':
+        run_production_server()
+        return
+    if SERVER_MODE != 'development':
+        raise ValueError(f"Unbekannter SERVER_MODE: {SERVER_MODE} (erlaubt: development, production)")
+
     # Only display on initial start (not during debug reload)
     if os.environ.get("WERKZEUG_RUN_MAIN") != "true":
-        print("Dashboard running locally at: http://localhost:8050/")
+        print(f"Dashboard running locally at: http://localhost:{PORT}/")
 
-    # Run the Dash application
-    app.run_server(host="0.0.0.0", port=8050, debug=True, use_reloader=False)
+    # Build and run the Dash application
+    app = create_app()
+    app.run_server(host="0.0.0.0", port=PORT, debug=True, use_reloader=False)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,217 @@
+import argparse
+import json
+import os
+import tempfile
+import numpy as np
+
+# Default maximum deviation of the simplified borders from the original ones (in degrees,
+# 0.005° are about 350-550 m in Germany) and number of decimal places kept per coordinate
+DEFAULT_TOLERANCE = 0.005
+DEFAULT_PRECISION = 3
+
+# Levels of detail served by src.data_download.load_geojson
+DETAIL_LEVELS = ('original', 'simplified')
+
+# Directory of the generated variants; the source tree is never written at runtime
+SIMPLIFIED_DIR = os.path.join(os.path.dirname(__file__), 'cache')
+
+
+def simplified_path(dateipfad: str, verzeichnis: str | None = None) -> str:
+    """Returns the path of the simplified variant of a GeoJSON file in the given directory
+    (default SIMPLIFIED_DIR)."""
+    basis, endung = os.path.splitext(os.path.basename(dateipfad))
+    return os.path.join(verzeichnis or SIMPLIFIED_DIR, f"{basis}.simplified{endung}")
+
+
+def _rings(geojson: dict) -> list[list]:
+    """Returns all rings (outer borders and holes) of the polygons of a feature collection."""
+    ringe = []
+    for feature in geojson['features']:
+        geometrie = feature['geometry']
+        if geometrie['type'] == 'Polygon':
+            polygone = [geometrie['coordinates']]
+        elif geometrie['type'] == 'MultiPolygon':
+            polygone = geometrie['coordinates']
+        else:
+            continue
+        for polygon in polygone:
+            ringe.extend(polygon)
+    return ringe
+
+
+def count_vertices(geojson: dict) -> int:
+    """Counts the vertices of all polygon rings of a feature collection."""
+    return sum(len(ring) for ring in _rings(geojson))
+
+
+def _douglas_peucker(punkte: np.ndarray, toleranz: float) -> np.ndarray:
+    """Simplifies an open chain of points; the first and last point are always kept."""
+    behalten = np.zeros(len(punkte), dtype=bool)
+    behalten[[0, -1]] = True
+    stapel = [(0, len(punkte) - 1)]
+    while stapel:
+        start, ende = stapel.pop()
+        if ende - start < 2:
+            continue
+        a, b = punkte[start], punkte[ende]
+        abschnitt = punkte[start + 1:ende]
+        richtung = b - a
+        laenge = np.hypot(*richtung)
+        if laenge == 0:
+            abstaende = np.hypot(*(abschnitt - a).T)
+        else:
+            abstaende = np.abs(richtung[0] * (abschnitt[:, 1] - a[1]) - richtung[1] * (abschnitt[:, 0] - a[0])) / laenge
+        index = int(np.argmax(abstaende))
+        if abstaende[index] > toleranz:
+            mitte = start + 1 + index
+            behalten[mitte] = True
+            stapel.extend([(start, mitte), (mitte, ende)])
+    return punkte[behalten]
+
+
+def simplify_geojson(geojson: dict, toleranz: float = DEFAULT_TOLERANCE,
+                     nachkommastellen: int = DEFAULT_PRECISION) -> dict:
+    """Simplifies the polygons of a feature collection while preserving shared borders.
+
+    Neighbouring federal states share the vertices of their common border. To keep the borders
+    free of gaps and overlaps, every ring is split into chains at its junctions (vertices at which
+    the set of rings sharing a vertex changes). Each chain is simplified once with the
+    Douglas-Peucker algorithm and reused, in the matching direction, by all rings containing it.
+    Afterwards, the coordinates are rounded to ``nachkommastellen`` decimal places.
+
+    Rings that would collapse to fewer than four vertices keep their original vertices.
+
+    Args:
+        geojson (dict): Feature collection with Polygon and MultiPolygon geometries.
+        toleranz (float, optional): Maximum deviation from the original borders in degrees.
+            Defaults to DEFAULT_TOLERANCE.
+        nachkommastellen (int, optional): Decimal places kept per coordinate.
+            Defaults to DEFAULT_PRECISION.
+
+    Returns:
+        dict: A simplified copy of the feature collection.
+    """
+    ringe = _rings(geojson)
+
+    # Rings containing each vertex
+    besitzer = {}
+    for nummer, ring in enumerate(ringe):
+        for punkt in ring:
+            besitzer.setdefault(tuple(punkt), set()).add(nummer)
+
+    # Junctions: start points of rings and vertices where the sharing rings change
+    knoten = set()
+    for ring in ringe:
+        punkte = [tuple(punkt) for punkt in ring]
+        knoten.add(punkte[0])
+        for vorher, punkt, nachher in zip(punkte[:-2], punkte[1:-1], punkte[2:]):
+            if besitzer[punkt] != besitzer[vorher] or besitzer[punkt] != besitzer[nachher]:
+                knoten.add(punkt)
+
+    vereinfacht = {}
+
+    def vereinfache_kette(kette: list[tuple]) -> list[tuple]:
+        # Simplify every chain in one canonical direction, so that both neighbours get the same result
+        umgekehrt = kette[::-1] > kette
+        schluessel = tuple(kette[::-1] if umgekehrt else kette)
+        if schluessel not in vereinfacht:
+            punkte = _douglas_peucker(np.array(schluessel), toleranz)
+            vereinfacht[schluessel] = [tuple(punkt) for punkt in np.round(punkte, nachkommastellen).tolist()]
+        ergebnis = vereinfacht[schluessel]
+        return ergebnis[::-1] if umgekehrt else ergebnis
+
+    def vereinfache_ring(ring: list) -> list:
+        punkte = [tuple(punkt) for punkt in ring]
+        ergebnis, kette = [], [punkte[0]]
+        for punkt in punkte[1:]:
+            kette.append(punkt)
+            if punkt in knoten:
+                ergebnis.extend(vereinfache_kette(kette)[:-1])
+                kette = [punkt]
+        ergebnis.extend(vereinfache_kette(kette))
+
+        # Remove vertices that became identical through rounding
+        bereinigt = [ergebnis[0]]
+        for punkt in ergebnis[1:]:
+            if punkt != bereinigt[-1]:
+                bereinigt.append(punkt)
+        if len(bereinigt) < 4:
+            return [[round(x, nachkommastellen), round(y, nachkommastellen)] for x, y in punkte]
+        return [list(punkt) for punkt in bereinigt]
+
+    def vereinfache_polygon(polygon: list) -> list:
+        return [vereinfache_ring(ring) for ring in polygon]
+
+    features = []
+    for feature in geojson['features']:
+        geometrie = dict(feature['geometry'])
+        if geometrie['type'] == 'Polygon':
+            geometrie['coordinates'] = vereinfache_polygon(geometrie['coordinates'])
+        elif geometrie['type'] == 'MultiPolygon':
+            geometrie['coordinates'] = [vereinfache_polygon(polygon) for polygon in geometrie['coordinates']]
+        features.append({**feature, 'geometry': geometrie})
+    return {**geojson, 'features': features}
+
+
+def build_simplified_geojson(dateipfad: str, toleranz: float = DEFAULT_TOLERANCE,
+                             nachkommastellen: int = DEFAULT_PRECISION, verzeichnis: str | None = None) -> dict:
+    """Builds the simplified variant of a GeoJSON file and stores it in the cache directory.
+
+    Args:
+        dateipfad (str): Path to the original GeoJSON file.
+        toleranz (float, optional): Maximum deviation in degrees. Defaults to DEFAULT_TOLERANCE.
+        nachkommastellen (int, optional): Decimal places per coordinate. Defaults to DEFAULT_PRECISION.
+        verzeichnis (str | None, optional): Target directory. Defaults to SIMPLIFIED_DIR.
+
+    Returns:
+        dict: Report with the path of the variant and the vertex counts and file sizes
+        before and after the simplification.
+    """
+    with open(dateipfad, 'r', encoding='utf-8') as f:
+        original = json.load(f)
+    vereinfacht = simplify_geojson(original, toleranz, nachkommastellen)
+
+    zielpfad = simplified_path(dateipfad, verzeichnis)
+    os.makedirs(os.path.dirname(zielpfad), exist_ok=True)
+    fd, temp_pfad = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(zielpfad)), suffix='.part')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(vereinfacht, f, ensure_ascii=False, separators=(',', ':'))
+        os.chmod(temp_pfad, 0o644)
+        os.replace(temp_pfad, zielpfad)
+    except BaseException:
+        if os.path.exists(temp_pfad):
+            os.remove(temp_pfad)
+        raise
+
+    return {
+        'pfad': zielpfad,
+        'punkte_vorher': count_vertices(original),
+        'punkte_nachher': count_vertices(vereinfacht),
+        'bytes_vorher': os.path.getsize(dateipfad),
+        'bytes_nachher': os.path.getsize(zielpfad)
+    }
+
+
+def print_report(bericht: dict) -> None:
+    """Prints the vertex and size savings of a simplification report."""
+    print(f"Simplified GeoJSON written to: {bericht['pfad']}")
+    print(f"{'':<10}{'vorher':>12}{'nachher':>12}{'Ersparnis':>12}")
+    for name, schluessel in [('Punkte', 'punkte'), ('Bytes', 'bytes')]:
+        vorher, nachher = bericht[f'{schluessel}_vorher'], bericht[f'{schluessel}_nachher']
+        print(f"{name:<10}{vorher:>12}{nachher:>12}{1 - nachher / vorher:>12.1%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Builds the simplified GeoJSON variant of the state map.")
+    parser.add_argument('dateipfad', nargs='?',
+                        default=os.path.join(os.path.dirname(__file__), 'bundeslaender.json'))
+    parser.add_argument('--toleranz', type=float, default=DEFAULT_TOLERANCE,
+                        help="Maximum deviation from the original borders in degrees")
+    parser.add_argument('--nachkommastellen', type=int, default=DEFAULT_PRECISION,
+                        help="Decimal places kept per coordinate")
+    parser.add_argument('--verzeichnis', default=SIMPLIFIED_DIR,
+                        help="Target directory of the simplified variant")
+    argumente = parser.parse_args()
+    print_report(build_simplified_geojson(argumente.dateipfad, argumente.toleranz, argumente.nachkommastellen,
+                                          argumente.verzeichnis))
@@ -0,0 +1,146 @@
+import atexit
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+import os
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+
+# Diagnostics mode tracing all allocations (e.g. MEMORY_TRACKING=1); slows down the dashboard noticeably
+MEMORY_TRACKING = os.getenv("MEMORY_TRACKING", "0") == "1"
+
+# Directory of the summaries written on shutdown
+MEMORY_REPORT_DIR = os.getenv("MEMORY_REPORT_DIR", os.path.join(Path(__file__).parent, "cache", "memory"))
+
+_aktiv = False
+_sperre = threading.RLock()
+_stapel = []
+_abschnitte = {}
+
+
+def enable() -> None:
+    """Starts tracing allocations and writes the summary when the process exits.
+
+    Called on import if MEMORY_TRACKING is set, so the startup phases are traced from the beginning.
+    """
+    global _aktiv
+    if _aktiv:
+        return
+    tracemalloc.start()
+    _aktiv = True
+    atexit.register(write_summary)
+
+
+def is_enabled() -> bool:
+    """Returns whether the diagnostics mode is active."""
+    return _aktiv
+
+
+@contextmanager
+def track(name: str):
+    """Records the peak traced memory and the retained memory of a section.
+
+    The peak is measured relative to the traced memory at the start of the section, i.e. it is the
+    additional memory the section needed at most (temporary copies included). Sections may be
+    nested. ``tracemalloc`` only knows one peak per process, so traced sections of different threads
+    run one after another; without the diagnostics mode, the block runs unmeasured.
+
+    Args:
+        name (str): Name of the section in the summary, e.g. 'startup.sql_read' or 'callback.<name>'.
+    """
+    if not _aktiv:
+        yield
+        return
+    with _sperre:
+        if _stapel:
+            # Keep the peak of the enclosing section before the inner section resets it
+            _stapel[-1]['spitze'] = max(_stapel[-1]['spitze'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        aktuell = tracemalloc.get_traced_memory()[0]
+        abschnitt = {'start': aktuell, 'spitze': aktuell, 'bloecke': sys.getallocatedblocks()}
+        _stapel.append(abschnitt)
+        try:
+            yield
+        finally:
+            aktuell, spitze = tracemalloc.get_traced_memory()
+            spitze = max(abschnitt['spitze'], spitze)
+            _stapel.pop()
+            if _stapel:
+                _stapel[-1]['spitze'] = max(_stapel[-1]['spitze'], spitze)
+            _record(name, spitze - abschnitt['start'], aktuell - abschnitt['start'],
+                    sys.getallocatedblocks() - abschnitt['bloecke'])
+
+
+def _record(name: str, spitze: int, netto: int, netto_bloecke: int) -> None:
+    eintrag = _abschnitte.setdefault(name, {'aufrufe': 0, 'spitze_max': 0, 'spitze_summe': 0,
+                                            'netto_max': 0, 'netto_bloecke_summe': 0})
+    eintrag['aufrufe'] += 1
+    eintrag['spitze_max'] = max(eintrag['spitze_max'], spitze)
+    eintrag['spitze_summe'] += spitze
+    eintrag['netto_max'] = max(eintrag['netto_max'], netto)
+    eintrag['netto_bloecke_summe'] += netto_bloecke
+
+
+def tracked(funktion):
+    """Wraps a callback so that its memory is recorded as section 'callback.<name>'."""
+    @wraps(funktion)
+    def wrapper(*args, **kwargs):
+        with track(f"callback.{funktion.__name__}"):
+            return funktion(*args, **kwargs)
+    return wrapper
+
+
+def summary() -> str:
+    """Formats the recorded sections as a table, sorted by their highest peak.
+
+    Columns: number of calls, highest and mean peak (MB), highest retained memory (MB) and the
+    mean change of the live memory blocks per call (``sys.getallocatedblocks()`` after minus
+    before). The last column counts net live blocks, not allocations: blocks allocated and freed
+    within the call do not show up, and it is zero or negative if the call freed more than it kept.
+
+    Returns:
+        str: The table, or a note if the diagnostics mode is not active.
+    """
+    if not _aktiv:
+        return "Speicherdiagnose ist nicht aktiv (MEMORY_TRACKING=1 setzen).\n"
+    with _sperre:
+        abschnitte = {name: dict(eintrag) for name, eintrag in _abschnitte.items()}
+        aktuell, spitze = tracemalloc.get_traced_memory()
+
+    mb = 1024 * 1024
+    breite = max([len(name) for name in abschnitte] + [len('Abschnitt')])
+    zeilen = [f"Speicherdiagnose (Prozess {os.getpid()}, aktuell {aktuell / mb:.1f} MB verfolgt)",
+              f"{'Abschnitt':<{breite}}  {'Aufrufe':>8}  {'Spitze max':>11}  {'Spitze Ø':>10}  "
+              f"{'Netto max':>10}  {'Netto-Blöcke Ø':>15}"]
+    for name, eintrag in sorted(abschnitte.items(), key=lambda element: -element[1]['spitze_max']):
+        zeilen.append(f"{name:<{breite}}  {eintrag['aufrufe']:>8}  {eintrag['spitze_max'] / mb:>8.1f} MB  "
+                      f"{eintrag['spitze_summe'] / eintrag['aufrufe'] / mb:>7.1f} MB  "
+                      f"{eintrag['netto_max'] / mb:>7.1f} MB  "
+                      f"{eintrag['netto_bloecke_summe'] / eintrag['aufrufe']:>+15.0f}")
+    return '\n'.join(zeilen) + '\n'
+
+
+def write_summary(verzeichnis: str = MEMORY_REPORT_DIR) -> str | None:
+    """Prints the summary and writes it to a file named after the time and the process.
+
+    Args:
+        verzeichnis (str, optional): Target directory. Defaults to MEMORY_REPORT_DIR.
+
+    Returns:
+        str | None: Path of the written file, or None if the diagnostics mode is not active.
+    """
+    if not _aktiv:
+        return None
+    tabelle = summary()
+    print(tabelle)
+    os.makedirs(verzeichnis, exist_ok=True)
+    pfad = os.path.join(verzeichnis, f"{datetime.now():%Y%m%d-%H%M%S}_{os.getpid()}.txt")
+    with open(pfad, 'w', encoding='utf-8') as datei:
+        datei.write(tabelle)
+    return pfad
+
+
+if MEMORY_TRACKING:
+    enable()
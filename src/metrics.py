@@ -0,0 +1,228 @@
+import bisect
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+import os
+import threading
+import time
+import flask
+
+# Upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path of the Dash endpoint executing the callbacks
+CALLBACK_PATH = '_dash-update-component'
+
+# Header marking the requests of the cache warm-up, which are not counted as user requests
+WARMUP_HEADER = 'X-Dashboard-Warmup'
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Phases reported in the Server-Timing header of callback responses, with their descriptions
+PHASES = {
+    'filter': 'Filtering',
+    'dedup': 'Deduplication',
+    'aggregation': 'Aggregation',
+    'figure': 'Figure construction',
+    'cache': 'Result cache',
+    'serialization': 'JSON serialization',
+    'other': 'Other callback code'
+}
+
+# Print one line with the phases of every callback request (e.g. SERVER_TIMING_LOG=1)
+SERVER_TIMING_LOG = os.getenv("SERVER_TIMING_LOG", "0") == "1"
+
+
+def parse_outputs(output: str) -> list[tuple[str, str]]:
+    """Splits the output string of a Dash callback into (component id, property) pairs.
+
+    Multi-output callbacks are encoded as '..id1.prop1...id2.prop2..'; outputs allowing
+    duplicates carry an '@hash' suffix, which is not part of the property.
+    """
+    teile = output[2:-2].split('...') if output.startswith('..') else [output]
+    return [tuple(teil.split('@')[0].rsplit('.', 1)) for teil in teile]
+
+
+def callback_label(output: str) -> str:
+    """Short name of a callback: its first output and the number of further outputs."""
+    ausgaben = parse_outputs(output)
+    label = '.'.join(ausgaben[0])
+    return f"{label} (+{len(ausgaben) - 1})" if len(ausgaben) > 1 else label
+
+
+@contextmanager
+def phase(name: str):
+    """Attributes the time spent in the block to a phase of the current callback request.
+
+    Phases may be nested; the time of an inner phase is only counted for the inner phase.
+    Outside of a timed callback request (e.g. in the benchmarks), the block runs unmeasured.
+
+    Args:
+        name (str): Name of the phase (see ``PHASES``).
+    """
+    messung = flask.g.get('phasen') if flask.has_request_context() else None
+    if messung is None:
+        yield
+        return
+    start = time.perf_counter()
+    messung['stapel'].append(0.0)
+    try:
+        yield
+    finally:
+        dauer = time.perf_counter() - start
+        messung['dauer'][name] += dauer - messung['stapel'].pop()
+        if messung['stapel']:
+            messung['stapel'][-1] += dauer
+
+
+def timed_callback(funktion):
+    """Wraps a callback so that the time of its code outside any phase is reported as 'other'."""
+    @wraps(funktion)
+    def wrapper(*args, **kwargs):
+        messung = flask.g.get('phasen') if flask.has_request_context() else None
+        if messung is None:
+            return funktion(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            with phase('other'):
+                return funktion(*args, **kwargs)
+        finally:
+            messung['callback'] += time.perf_counter() - start
+    return wrapper
+
+
+def server_timing(messung: dict, gesamt: float) -> str:
+    """Formats the measured phases of a request as value of the Server-Timing header.
+
+    The time of the request outside the callback (mostly the JSON serialization of the outputs
+    by Dash) is added to the phase 'serialization'.
+
+    Args:
+        messung (dict): Phase durations collected during the request.
+        gesamt (float): Total duration of the request in seconds.
+
+    Returns:
+        str: Header value, e.g. 'filter;desc="Filtering";dur=3.1, ..., total;dur=120.4'.
+    """
+    dauer = dict(messung['dauer'])
+    dauer['serialization'] = dauer.get('serialization', 0.0) + max(gesamt - messung['callback'], 0.0)
+    eintraege = [f'{name};desc="{beschreibung}";dur={dauer[name] * 1000:.1f}'
+                 for name, beschreibung in PHASES.items() if dauer.get(name)]
+    return ', '.join(eintraege + [f'total;dur={gesamt * 1000:.1f}'])
+
+
+def _escape(wert: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return str(wert).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(wert)}"' for name, wert in labels.items()) + '}'
+
+
+def format_metric(name: str, typ: str, hilfe: str, werte: list[tuple[dict, float]]) -> str:
+    """Formats one metric family in the Prometheus text exposition format.
+
+    Args:
+        name (str): Name of the metric.
+        typ (str): 'counter', 'gauge' or 'histogram'.
+        hilfe (str): Description of the metric.
+        werte (list[tuple[dict, float]]): Samples as (labels, value) pairs. Histogram samples
+            carry their full name (``_bucket``, ``_sum``, ``_count``) in the label '__name__'.
+
+    Returns:
+        str: The lines of the metric family.
+    """
+    zeilen = [f"# HELP {name} {hilfe}", f"# TYPE {name} {typ}"]
+    for labels, wert in werte:
+        labels = dict(labels)
+        zeilen.append(f"{labels.pop('__name__', name)}{_labels(labels)} {wert}")
+    return '\n'.join(zeilen) + '\n'
+
+
+class CallbackMetrics:
+    """Latency histogram, call counter and error counter per Dash callback.
+
+    :meth:`install` times every request to ``/_dash-update-component`` via the ``before_request``
+    and ``after_request`` hooks of the Flask server, so the callbacks themselves stay unchanged.
+    Callbacks are labelled with :func:`callback_label` of their output. A response with status
+    500 or higher counts as error; ``PreventUpdate`` (204) does not. Every callback response also
+    carries a ``Server-Timing`` header with the durations of the phases measured via :func:`phase`.
+
+    The values are kept per process: with several gunicorn workers, each worker reports the
+    callbacks it executed itself.
+
+    Args:
+        buckets (tuple, optional): Upper bounds of the histogram buckets in seconds. Defaults to LATENCY_BUCKETS.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._sperre = threading.Lock()
+        self._callbacks = {}
+
+    def observe(self, callback: str, sekunden: float, fehler: bool = False) -> None:
+        """Records one execution of a callback."""
+        with self._sperre:
+            eintrag = self._callbacks.get(callback)
+            if eintrag is None:
+                eintrag = self._callbacks[callback] = {
+                    'buckets': [0] * (len(self.buckets) + 1), 'summe': 0.0, 'anzahl': 0, 'fehler': 0}
+            eintrag['buckets'][bisect.bisect_left(self.buckets, sekunden)] += 1
+            eintrag['summe'] += sekunden
+            eintrag['anzahl'] += 1
+            eintrag['fehler'] += int(fehler)
+
+    def install(self, server: flask.Flask) -> None:
+        """Times all callback requests of a Flask server and adds their Server-Timing header."""
+
+        @server.before_request
+        def _start():
+            if flask.request.path.endswith(CALLBACK_PATH) and WARMUP_HEADER not in flask.request.headers:
+                flask.g.callback_start = time.perf_counter()
+                flask.g.phasen = {'dauer': defaultdict(float), 'stapel': [], 'callback': 0.0}
+
+        @server.after_request
+        def _erfassen(antwort):
+            start = flask.g.pop('callback_start', None)
+            if start is not None:
+                gesamt = time.perf_counter() - start
+                daten = flask.request.get_json(silent=True) or {}
+                label = callback_label(daten.get('output', 'unbekannt'))
+                self.observe(label, gesamt, antwort.status_code >= 500)
+
+                zeiten = server_timing(flask.g.pop('phasen'), gesamt)
+                antwort.headers['Server-Timing'] = zeiten
+                if SERVER_TIMING_LOG:
+                    print(f"Server-Timing {label}: {zeiten}")
+            return antwort
+
+    def render(self) -> str:
+        """Returns the metrics of all callbacks in the Prometheus text format."""
+        with self._sperre:
+            callbacks = {name: {**eintrag, 'buckets': list(eintrag['buckets'])}
+                         for name, eintrag in sorted(self._callbacks.items())}
+
+        histogramm, aufrufe, fehler = [], [], []
+        for name, eintrag in callbacks.items():
+            kumuliert = 0
+            for grenze, anzahl in zip(self.buckets + (float('inf'),), eintrag['buckets']):
+                kumuliert += anzahl
+                histogramm.append(({'__name__': 'dashboard_callback_duration_seconds_bucket', 'output': name,
+                                    'le': '+Inf' if grenze == float('inf') else f"{grenze:g}"}, kumuliert))
+            histogramm.append(({'__name__': 'dashboard_callback_duration_seconds_sum', 'output': name},
+                               round(eintrag['summe'], 6)))
+            histogramm.append(({'__name__': 'dashboard_callback_duration_seconds_count', 'output': name},
+                               eintrag['anzahl']))
+            aufrufe.append(({'output': name}, eintrag['anzahl']))
+            fehler.append(({'output': name}, eintrag['fehler']))
+
+        return (format_metric('dashboard_callback_duration_seconds', 'histogram',
+                              'Duration of the Dash callback requests in seconds.', histogramm)
+                + format_metric('dashboard_callback_calls_total', 'counter',
+                                'Number of executed Dash callbacks.', aufrufe)
+                + format_metric('dashboard_callback_errors_total', 'counter',
+                                'Number of Dash callbacks that failed with a server error.', fehler))
@@ -0,0 +1,123 @@
+import cProfile
+from datetime import datetime
+from functools import wraps
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from pathlib import Path
+import dash
+from dash.exceptions import MissingCallbackContextException
+from src.access_log import normalize_inputs
+
+# Profile callbacks from the start (e.g. CALLBACK_PROFILING=1); can also be switched in the admin section
+PROFILING_ENABLED = os.getenv("CALLBACK_PROFILING", "0") == "1"
+
+# Callbacks taking at least this long (in milliseconds) keep their profile
+PROFILE_THRESHOLD_MS = float(os.getenv("CALLBACK_PROFILE_THRESHOLD_MS", "1000"))
+
+# Directory of the kept profiles and the number of profiles kept there (oldest are removed first)
+PROFILE_DIR = os.getenv("CALLBACK_PROFILE_DIR", os.path.join(Path(__file__).parent, "cache", "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("CALLBACK_PROFILE_MAX_FILES", "50"))
+
+# Number of functions listed in the summary of a profile
+SUMMARY_LINES = 25
+
+
+def _callback_inputs() -> dict:
+    """Returns the triggering properties and the filter values of the running callback.
+
+    Like the access log, only filter values are kept (see :func:`src.access_log.normalize_inputs`);
+    states and other inputs, e.g. the admin password, are never written to the profile directory.
+    """
+    try:
+        kontext = dash.callback_context
+        return {'ausloeser': list(kontext.triggered_prop_ids),
+                'eingaben': normalize_inputs({'inputs': kontext.inputs_list})}
+    except MissingCallbackContextException:
+        # Called outside of a Dash request: the arguments are not recorded, they may hold user entries
+        return {}
+
+
+class CallbackProfiler:
+    """Opt-in profiler keeping the profiles of slow callback invocations.
+
+    While :attr:`aktiv` is set, every callback wrapped via :meth:`wrap` runs under ``cProfile``.
+    If an invocation takes at least ``schwelle_ms``, its profile is written to ``verzeichnis``:
+
+    - ``<name>.prof``: the raw profile, e.g. for ``python -m pstats`` or snakeviz
+    - ``<name>.json``: callback, duration, time, process, the triggering properties and the filter
+      values of the request, with a summary of the functions with the highest cumulative time
+
+    Only the newest ``max_profile`` profiles are kept. ``cProfile`` cannot profile several threads
+    at the same time, so concurrent invocations run unprofiled while another one is profiled.
+    The switch applies to the process it is set in; with several gunicorn workers, profiling of all
+    workers is enabled via CALLBACK_PROFILING.
+
+    Args:
+        aktiv (bool, optional): Whether callbacks are profiled. Defaults to PROFILING_ENABLED.
+        schwelle_ms (float, optional): Minimum duration of a kept profile. Defaults to PROFILE_THRESHOLD_MS.
+        verzeichnis (str, optional): Directory of the profiles. Defaults to PROFILE_DIR.
+        max_profile (int, optional): Number of kept profiles. Defaults to PROFILE_MAX_FILES.
+    """
+
+    def __init__(self, aktiv: bool = PROFILING_ENABLED, schwelle_ms: float = PROFILE_THRESHOLD_MS,
+                 verzeichnis: str = PROFILE_DIR, max_profile: int = PROFILE_MAX_FILES):
+        self.aktiv = aktiv
+        self.schwelle_ms = schwelle_ms
+        self.verzeichnis = Path(verzeichnis)
+        self.max_profile = max_profile
+        self._sperre = threading.Lock()
+
+    def wrap(self, funktion):
+        """Wraps a callback so that it is profiled while the profiler is active."""
+        @wraps(funktion)
+        def wrapper(*args, **kwargs):
+            if not self.aktiv or not self._sperre.acquire(blocking=False):
+                return funktion(*args, **kwargs)
+            try:
+                profil = cProfile.Profile()
+                start = time.perf_counter()
+                profil.enable()
+                try:
+                    return funktion(*args, **kwargs)
+                finally:
+                    profil.disable()
+                    dauer_ms = (time.perf_counter() - start) * 1000
+                    if dauer_ms >= self.schwelle_ms:
+                        self._save(funktion.__name__, profil, dauer_ms, _callback_inputs())
+            finally:
+                self._sperre.release()
+        return wrapper
+
+    def _save(self, callback: str, profil: cProfile.Profile, dauer_ms: float, eingaben: dict) -> None:
+        """Writes a profile with its inputs and removes the oldest profiles beyond the limit."""
+        try:
+            self.verzeichnis.mkdir(parents=True, exist_ok=True)
+            zeitpunkt = datetime.now()
+            name = f"{zeitpunkt:%Y%m%d-%H%M%S-%f}_{callback}_{dauer_ms:.0f}ms_{os.getpid()}"
+            profil.dump_stats(self.verzeichnis / f"{name}.prof")
+
+            zusammenfassung = io.StringIO()
+            pstats.Stats(profil, stream=zusammenfassung).sort_stats('cumulative').print_stats(SUMMARY_LINES)
+            bericht = {
+                'callback': callback,
+                'dauer_ms': round(dauer_ms, 1),
+                'zeitpunkt': zeitpunkt.isoformat(timespec='seconds'),
+                'prozess': os.getpid(),
+                **eingaben,
+                'zusammenfassung': zusammenfassung.getvalue().splitlines()
+            }
+            with open(self.verzeichnis / f"{name}.json", 'w', encoding='utf-8') as datei:
+                json.dump(bericht, datei, ensure_ascii=False, indent=2, default=str)
+            print(f"Profil von {callback} gespeichert ({dauer_ms:.0f} ms): {self.verzeichnis / name}.prof")
+
+            profile = sorted(self.verzeichnis.glob('*.prof'), key=lambda pfad: pfad.stat().st_mtime)
+            for alt in profile[:max(len(profile) - self.max_profile, 0)]:
+                alt.unlink(missing_ok=True)
+                alt.with_suffix('.json').unlink(missing_ok=True)
+        except OSError as fehler:
+            # A full or read-only disk must not break the callback
+            print(f"Profil von {callback} konnte nicht gespeichert werden: {fehler}")
@@ -0,0 +1,393 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from src.access_log import note_cache
+from src.metrics import phase
+
+# Limits of the result cache, configurable via environment variables
+CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_MB", "128")) * 1024 * 1024
+
+# Backend of the result cache: 'memory' (per process) or 'sqlite' (shared by all workers on a host)
+CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")
+CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(Path(__file__).parent, "cache", "results.sqlite"))
+
+# Interval in seconds in which the SQLite backend writes the collected access times of its hits
+CACHE_ACCESS_FLUSH_SECONDS = float(os.getenv("RESULT_CACHE_ACCESS_FLUSH_SECONDS", "5"))
+
+
+class CacheBackend(ABC):
+    """Interface of the storage backends of :class:`ResultCache`.
+
+    Backends store pickled values under string keys and count hits, misses, evictions and
+    expirations. They are bounded by the number of entries, the lifetime of an entry and the
+    total size of the pickled values. Subclasses implement all abstract methods; an incomplete
+    backend cannot be created.
+
+    Args:
+        max_eintraege (int, optional): Maximum number of entries. Defaults to CACHE_MAX_ENTRIES.
+        ttl_sekunden (float, optional): Lifetime of an entry in seconds. Defaults to CACHE_TTL_SECONDS.
+        max_bytes (int, optional): Maximum total size of all entries. Defaults to CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, max_eintraege: int = CACHE_MAX_ENTRIES, ttl_sekunden: float = CACHE_TTL_SECONDS,
+                 max_bytes: int = CACHE_MAX_BYTES):
+        self.max_eintraege = max_eintraege
+        self.ttl_sekunden = ttl_sekunden
+        self.max_bytes = max_bytes
+        self._zaehler = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    @abstractmethod
+    def get(self, schluessel: str) -> bytes | None:
+        """Returns the pickled value stored under a key, or None if there is no valid entry."""
+
+    @abstractmethod
+    def set(self, schluessel: str, daten: bytes, version: str | None) -> None:
+        """Stores a pickled value and evicts entries if a limit is exceeded."""
+
+    @abstractmethod
+    def invalidate(self, version: str | None) -> None:
+        """Removes all entries that do not belong to the given dataset version."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all entries (the counters are kept)."""
+
+    @abstractmethod
+    def size(self) -> tuple[int, int]:
+        """Returns the number of entries and their total size in bytes."""
+
+    def stats(self) -> dict:
+        """Returns the hit/miss/eviction counters of this process and the current size of the cache."""
+        anzahl, groesse = self.size()
+        return {**self._zaehler, 'entries': anzahl, 'bytes': groesse}
+
+
+class MemoryBackend(CacheBackend):
+    """In-memory backend with LRU eviction; every worker process has its own entries."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._eintraege = OrderedDict()
+        self._bytes = 0
+        self._sperre = threading.Lock()
+
+    def _entfernen(self, schluessel: str, zaehler: str | None = None) -> None:
+        """Removes an entry and counts the reason of its removal."""
+        self._bytes -= len(self._eintraege.pop(schluessel)[0])
+        if zaehler:
+            self._zaehler[zaehler] += 1
+
+    def get(self, schluessel: str) -> bytes | None:
+        with self._sperre:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is not None and time.monotonic() - eintrag[1] > self.ttl_sekunden:
+                self._entfernen(schluessel, 'expirations')
+                eintrag = None
+            if eintrag is None:
+                self._zaehler['misses'] += 1
+                return None
+            self._eintraege.move_to_end(schluessel)
+            self._zaehler['hits'] += 1
+            return eintrag[0]
+
+    def set(self, schluessel: str, daten: bytes, version: str | None) -> None:
+        if len(daten) > self.max_bytes:
+            return
+        with self._sperre:
+            if schluessel in self._eintraege:
+                self._entfernen(schluessel)
+            self._eintraege[schluessel] = (daten, time.monotonic(), version)
+            self._bytes += len(daten)
+            while len(self._eintraege) > self.max_eintraege or self._bytes > self.max_bytes:
+                self._entfernen(next(iter(self._eintraege)), 'evictions')
+
+    def invalidate(self, version: str | None) -> None:
+        with self._sperre:
+            for schluessel in [schluessel for schluessel, eintrag in self._eintraege.items() if eintrag[2] != version]:
+                self._entfernen(schluessel)
+
+    def clear(self) -> None:
+        with self._sperre:
+            self._eintraege.clear()
+            self._bytes = 0
+
+    def size(self) -> tuple[int, int]:
+        with self._sperre:
+            return len(self._eintraege), self._bytes
+
+
+class SQLiteBackend(CacheBackend):
+    """On-disk backend in a SQLite file, shared by all worker processes on a host.
+
+    Every write runs in its own transaction, so readers in other processes never see partially
+    written entries. The file uses write-ahead logging, which lets workers read while another
+    one writes. Entries are evicted by their last access across all processes.
+
+    Hits are answered by a plain read: their access times are collected per process and written
+    in one transaction at most every CACHE_ACCESS_FLUSH_SECONDS and before every new entry, so
+    reads do not contend for the single writer lock of the file.
+
+    Args:
+        pfad (str, optional): Path of the SQLite file. Defaults to CACHE_PATH.
+        *args, **kwargs: Limits of the cache (see :class:`CacheBackend`).
+    """
+
+    def __init__(self, pfad: str = CACHE_PATH, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pfad = pfad
+        self.abgleich_sekunden = CACHE_ACCESS_FLUSH_SECONDS
+        self._lokal = threading.local()
+        self._sperre = threading.Lock()
+        self._zugriffe = {}
+        self._letzter_abgleich = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(pfad)), exist_ok=True)
+        with self._transaktion() as verbindung:
+            verbindung.execute(
+                "CREATE TABLE IF NOT EXISTS eintraege ("
+                " schluessel TEXT PRIMARY KEY, version TEXT, daten BLOB NOT NULL,"
+                " groesse INTEGER NOT NULL, erstellt REAL NOT NULL, zugriff REAL NOT NULL)"
+            )
+            verbindung.execute("CREATE INDEX IF NOT EXISTS eintraege_zugriff ON eintraege (zugriff)")
+
+    def _verbindung(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread.
+
+        Connections can neither be shared between threads nor be inherited by forked worker
+        processes, so a new one is opened per thread and process.
+        """
+        verbindung = getattr(self._lokal, 'verbindung', None)
+        if verbindung is None or self._lokal.prozess != os.getpid():
+            verbindung = sqlite3.connect(self.pfad, timeout=30, isolation_level=None)
+            verbindung.execute("PRAGMA journal_mode=WAL")
+            verbindung.execute("PRAGMA synchronous=NORMAL")
+            self._lokal.verbindung = verbindung
+            self._lokal.prozess = os.getpid()
+        return verbindung
+
+    @contextmanager
+    def _transaktion(self):
+        """Runs the enclosed statements in one write transaction (BEGIN IMMEDIATE ... COMMIT/ROLLBACK)."""
+        verbindung = self._verbindung()
+        verbindung.execute("BEGIN IMMEDIATE")
+        try:
+            yield verbindung
+        except BaseException:
+            verbindung.execute("ROLLBACK")
+            raise
+        verbindung.execute("COMMIT")
+
+    def _zaehlen(self, zaehler: str, anzahl: int = 1) -> None:
+        """Increments a counter; the threads of a worker share the counters."""
+        with self._sperre:
+            self._zaehler[zaehler] += anzahl
+
+    def _zugriffe_schreiben(self, verbindung: sqlite3.Connection) -> None:
+        """Writes the collected access times within the given transaction."""
+        with self._sperre:
+            zugriffe, self._zugriffe = self._zugriffe, {}
+            self._letzter_abgleich = time.monotonic()
+        if zugriffe:
+            verbindung.executemany("UPDATE eintraege SET zugriff = MAX(zugriff, ?) WHERE schluessel = ?",
+                                   [(zugriff, schluessel) for schluessel, zugriff in zugriffe.items()])
+
+    def get(self, schluessel: str) -> bytes | None:
+        jetzt = time.time()
+        zeile = self._verbindung().execute(
+            "SELECT daten, erstellt FROM eintraege WHERE schluessel = ?", (schluessel,)
+        ).fetchone()
+        if zeile is not None and jetzt - zeile[1] > self.ttl_sekunden:
+            with self._transaktion() as verbindung:
+                verbindung.execute("DELETE FROM eintraege WHERE schluessel = ?", (schluessel,))
+            self._zaehlen('expirations')
+            zeile = None
+        if zeile is None:
+            self._zaehlen('misses')
+            return None
+        with self._sperre:
+            self._zaehler['hits'] += 1
+            self._zugriffe[schluessel] = jetzt
+            faellig = time.monotonic() - self._letzter_abgleich >= self.abgleich_sekunden
+        if faellig:
+            with self._transaktion() as verbindung:
+                self._zugriffe_schreiben(verbindung)
+        return zeile[0]
+
+    def set(self, schluessel: str, daten: bytes, version: str | None) -> None:
+        if len(daten) > self.max_bytes:
+            return
+        jetzt = time.time()
+        with self._transaktion() as verbindung:
+            # Eviction below needs the current access times
+            self._zugriffe_schreiben(verbindung)
+            verbindung.execute(
+                "INSERT OR REPLACE INTO eintraege VALUES (?, ?, ?, ?, ?, ?)",
+                (schluessel, version, sqlite3.Binary(daten), len(daten), jetzt, jetzt)
+            )
+            abgelaufen = verbindung.execute(
+                "DELETE FROM eintraege WHERE erstellt < ?", (jetzt - self.ttl_sekunden,)
+            ).rowcount
+            # Keep the most recently used entries within the entry and size limits
+            verdraengt = verbindung.execute(
+                "DELETE FROM eintraege WHERE schluessel IN ("
+                " SELECT schluessel FROM ("
+                "  SELECT schluessel,"
+                "   ROW_NUMBER() OVER (ORDER BY zugriff DESC) AS rang,"
+                "   SUM(groesse) OVER (ORDER BY zugriff DESC ROWS UNBOUNDED PRECEDING) AS summe"
+                "  FROM eintraege)"
+                " WHERE rang > ? OR summe > ?)",
+                (self.max_eintraege, self.max_bytes)
+            ).rowcount
+        self._zaehlen('expirations', abgelaufen)
+        self._zaehlen('evictions', verdraengt)
+
+    def invalidate(self, version: str | None) -> None:
+        with self._transaktion() as verbindung:
+            verbindung.execute("DELETE FROM eintraege WHERE version IS NOT ?", (version,))
+
+    def clear(self) -> None:
+        with self._transaktion() as verbindung:
+            verbindung.execute("DELETE FROM eintraege")
+
+    def size(self) -> tuple[int, int]:
+        anzahl, groesse = self._verbindung().execute(
+            "SELECT COUNT(*), COALESCE(SUM(groesse), 0) FROM eintraege"
+        ).fetchone()
+        return anzahl, groesse
+
+
+def _plain(wert):
+    """Replaces Plotly figures (also inside tuples and lists) by their plain dict representation.
+
+    Dash serializes both forms identically, but plain dicts are pickled and unpickled much faster
+    than figure objects, which validate all their properties again when they are restored.
+    """
+    if hasattr(wert, 'to_plotly_json'):
+        return wert.to_plotly_json()
+    if isinstance(wert, (list, tuple)):
+        return type(wert)(_plain(element) for element in wert)
+    return wert
+
+
+def create_backend(name: str | None = None) -> CacheBackend:
+    """Creates the cache backend selected by name or by the environment variable RESULT_CACHE_BACKEND.
+
+    Args:
+        name (str | None, optional): 'memory' or 'sqlite'. Defaults to CACHE_BACKEND.
+
+    Returns:
+        CacheBackend: The backend with the configured limits.
+    """
+    name = name or CACHE_BACKEND
+    if name == 'memory':
+        return MemoryBackend()
+    if name == 'sqlite':
+        return SQLiteBackend(CACHE_PATH)
+    raise ValueError(f"Unbekanntes Cache-Backend: {name} (erlaubt: memory, sqlite)")
+
+
+class ResultCache:
+    """Cache for the outputs of dashboard callbacks, stored in a pluggable backend.
+
+    Keys consist of the name of the cached function, the dataset version and a canonical,
+    deterministic representation of its arguments. They are hashed, so that every backend
+    (and every worker process) derives the same key for the same filter selection. Values
+    are stored pickled; Plotly figures are stored as plain dicts.
+
+    Args:
+        backend (CacheBackend | None, optional): Storage backend. Defaults to :func:`create_backend`.
+        version (str | None, optional): Version of the loaded dataset. Entries of other versions
+            are removed from the backend when the cache is created.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None, version: str | None = None):
+        self.configure(backend if backend is not None else create_backend(), version)
+
+    def configure(self, backend: CacheBackend, version: str | None) -> None:
+        """Switches the cache to another backend and dataset version (see the constructor)."""
+        self.backend = backend
+        self.version = version
+        self.backend.invalidate(version)
+
+    def _schluessel(self, name: str, teil) -> str:
+        """Hashes the canonical representation of a key."""
+        return hashlib.sha256(repr((name, self.version, teil)).encode('utf-8')).hexdigest()
+
+    def get(self, name: str, teil) -> tuple[bool, object]:
+        """Looks up an entry.
+
+        Args:
+            name (str): Name of the cached function.
+            teil: Canonical representation of the arguments (its ``repr`` must be deterministic).
+
+        Returns:
+            tuple[bool, object]: Whether a valid entry was found, and its value (None if not).
+        """
+        daten = self.backend.get(self._schluessel(name, teil))
+        if daten is None:
+            return False, None
+        return True, pickle.loads(daten)
+
+    def set(self, name: str, teil, wert) -> None:
+        """Stores an entry (see :meth:`get`); the value must be picklable."""
+        daten = pickle.dumps(wert, protocol=pickle.HIGHEST_PROTOCOL)
+        self.backend.set(self._schluessel(name, teil), daten, self.version)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """Returns the counters and the current size of the cache (see :meth:`CacheBackend.stats`)."""
+        return {'backend': type(self.backend).__name__, **self.backend.stats()}
+
+    def memoize(self, name: str, schluessel_funktion):
+        """Decorator caching the return value of a callback.
+
+        Args:
+            name (str): Name of the cached function, part of every key.
+            schluessel_funktion (callable): Receives the arguments of the function and returns
+                their canonical representation (e.g. the normalized filter state).
+
+        Returns:
+            callable: Decorator for the function.
+        """
+        def decorator(funktion):
+            @wraps(funktion)
+            def wrapper(*args, **kwargs):
+                return self.get_or_compute(name, schluessel_funktion(*args, **kwargs),
+                                           lambda: funktion(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def get_or_compute(self, name: str, teil, berechnen):
+        """Returns a cached value, computing and storing it on a miss.
+
+        Args:
+            name (str): Name of the cached function.
+            teil: Canonical representation of the arguments (see :meth:`get`).
+            berechnen (callable): Computes the value without arguments.
+
+        Returns:
+            object: The cached or newly computed value (Plotly figures as plain dicts).
+        """
+        with phase('cache'):
+            gefunden, wert = self.get(name, teil)
+        note_cache(gefunden)
+        if gefunden:
+            return wert
+        wert = berechnen()
+        with phase('serialization'):
+            wert = _plain(wert)
+        with phase('cache'):
+            self.set(name, teil, wert)
+        return wert
@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+import numpy as np
+import pandas as pd
+from src.data_download import (
+    DB_FILENAME,
+    local_source_checksum,
+    read_and_prepare,
+    read_snapshot,
+    write_local_source,
+    write_snapshot
+)
+from src.data_preparation import BENEFIT_COLUMNS, COMPANY_SIZE_ORDER
+
+# Supported number of rows of a synthetic job_analysis table
+MIN_ROWS = 10_000
+MAX_ROWS = 10_000_000
+
+# Default seed, first month and number of months of the generated advertisements
+DEFAULT_SEED = 2025
+DEFAULT_START_MONTH = '2025-01'
+DEFAULT_MONTHS = 6
+
+# Number of rows generated and written at once (bounds the memory usage for large tables)
+BLOCK_SIZE = 500_000
+
+# Default directory of the generated datasets (one subdirectory per row count)
+DEFAULT_TARGET_DIR = os.path.join(os.path.dirname(__file__), 'cache', 'synthetic')
+
+# Rows per advertisement (one row per location and industry of the advertisement)
+ROWS_PER_AD = {1: 0.45, 2: 0.25, 3: 0.15, 4: 0.08, 5: 0.04, 6: 0.03}
+
+# Share of advertisements offered nationwide (Bundesland 'bundesweit') and located in Austria
+NATIONWIDE_SHARE = 0.10
+AUSTRIA_SHARE = 0.02
+
+# Federal states weighted by population (in millions)
+STATE_WEIGHTS = {
+    'Baden-Württemberg': 11.1,
+    'Bayern': 13.2,
+    'Berlin': 3.8,
+    'Brandenburg': 2.6,
+    'Bremen': 0.7,
+    'Hamburg': 1.9,
+    'Hessen': 6.3,
+    'Mecklenburg-Vorpommern': 1.6,
+    'Niedersachsen': 8.1,
+    'Nordrhein-Westfalen': 18.1,
+    'Rheinland-Pfalz': 4.2,
+    'Saarland': 1.0,
+    'Sachsen': 4.1,
+    'Sachsen-Anhalt': 2.2,
+    'Schleswig-Holstein': 2.9,
+    'Thüringen': 2.1
+}
+
+PORTAL_WEIGHTS = {'stepstone': 0.55, 'indeed': 0.45}
+EMPLOYMENT_TYPE_WEIGHTS = {'Feste Anstellung': 0.70, 'befristet': 0.20, 'Praktikum': 0.10}
+POSITION_WEIGHTS = {'Junior': 0.30, 'Senior': 0.45, 'Lead': 0.25}
+WORKING_TIME_WEIGHTS = {'Vollzeit': 0.80, 'Teilzeit': 0.20}
+
+# Share of companies per size class, in the order of COMPANY_SIZE_ORDER
+COMPANY_SIZE_WEIGHTS = [0.06, 0.10, 0.16, 0.11, 0.11, 0.12, 0.12, 0.14, 0.08]
+
+# Industries of the rows; None stands for rows without a recognized industry
+INDUSTRY_WEIGHTS = {
+    'IT': 0.20,
+    'Finanzen': 0.14,
+    'Beratung': 0.12,
+    'Handel': 0.11,
+    'Industrie': 0.10,
+    'Gesundheit': 0.08,
+    'Öffentlicher Dienst': 0.05,
+    'Bildung': 0.03,
+    None: 0.17
+}
+
+# Searched job titles; their frequency decreases with the position in the list
+JOB_TITLES = [
+    'Software Engineer', 'Pflegekraft', 'Marketing Manager', 'Accounting Manager', 'Data Analyst',
+    'Projektmanager', 'Vertriebsmitarbeiter', 'Consultant', 'Controller', 'Personalreferent',
+    'eCommerce Manager', 'Tester', 'Architekt', 'Einkäufer', 'Systemadministrator',
+    'Steuerberater', 'Erzieher', 'Elektroniker', 'Produktmanager', 'Sachbearbeiter'
+]
+
+# Share of advertisements offering each benefit (benefit flags are sparse)
+BENEFIT_SHARES = {
+    'Gehalt_anhand_von_Tarifklassen': 0.07,
+    'Überstundenvergütung': 0.05,
+    'Gehaltserhöhungen': 0.05,
+    'Aktienoptionen_Gewinnbeteiligung': 0.03,
+    'Boni': 0.12,
+    'Sonderzahlungen': 0.10,
+    '13. Gehalt': 0.08,
+    'Betriebliche_Altersvorsorge': 0.22,
+    'Flexible_Arbeitsmodelle': 0.30,
+    'Homeoffice': 0.35,
+    'Arbeitsumfeld_Ausstattung': 0.10,
+    'Weiterbildung_und_Entwicklungsmöglichkeiten': 0.28,
+    'Gesundheit_und_Wohlbefinden': 0.18,
+    'Finanzielle_Vergünstigungen': 0.09,
+    'Mobilitätsangebote': 0.14,
+    'Verpflegung': 0.10,
+    'Zusätzliche_Urlaubstage': 0.06,
+    'Familien_Unterstützung': 0.07,
+    'Onboarding_und_Mentoring_Programme': 0.06,
+    'Teamevents_Firmenfeiern': 0.15
+}
+
+# Column order of the job_analysis table
+COLUMNS = [
+    'MongoDB_ID', 'Job_Titel', 'Unternehmen', 'Portal_Name', 'Datum', 'Beschäftigungsart',
+    'Position', 'Zeitmodell', 'Berufserfahrung_vorausgesetzt', 'Unternehmensgröße',
+    *BENEFIT_COLUMNS, 'Bundesland', 'Land', 'Kategorie'
+]
+
+
+def parse_row_count(wert: str) -> int:
+    """Parses a row count such as '250000', '250k' or '10M'."""
+    faktoren = {'k': 1_000, 'm': 1_000_000}
+    wert = wert.strip().lower().replace('_', '')
+    if wert and wert[-1] in faktoren:
+        return int(float(wert[:-1]) * faktoren[wert[-1]])
+    return int(wert)
+
+
+def _zipf_weights(anzahl: int, exponent: float = 1.1) -> np.ndarray:
+    """Returns normalized weights decreasing with the rank, as typical for companies and titles."""
+    gewichte = 1.0 / np.arange(1, anzahl + 1) ** exponent
+    return gewichte / gewichte.sum()
+
+
+def _sample(rng: np.random.Generator, gewichte: dict, anzahl: int) -> np.ndarray:
+    """Draws ``anzahl`` values of a weighted dictionary as object array."""
+    werte = np.array(list(gewichte.keys()), dtype=object)
+    wahrscheinlichkeiten = np.array(list(gewichte.values()), dtype=float)
+    return werte[rng.choice(len(werte), size=anzahl, p=wahrscheinlichkeiten / wahrscheinlichkeiten.sum())]
+
+
+def _publication_days(startmonat: str, monate: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the days of the period in German date format and their publication weights.
+
+    Fewer advertisements are published on weekends, and the volume grows slightly over the period.
+    """
+    tage = pd.date_range(pd.Timestamp(f"{startmonat}-01"), periods=monate, freq='MS')
+    tage = pd.date_range(tage[0], tage[-1] + pd.offsets.MonthEnd(0), freq='D')
+    gewichte = np.where(tage.dayofweek >= 5, 0.3, 1.0) * np.linspace(1.0, 1.5, len(tage))
+    return tage.strftime('%d.%m.%Y').to_numpy(dtype=object), gewichte / gewichte.sum()
+
+
+def generate_blocks(zeilen: int, seed: int = DEFAULT_SEED, startmonat: str = DEFAULT_START_MONTH,
+                    monate: int = DEFAULT_MONTHS, blockgroesse: int = BLOCK_SIZE) -> Iterator[pd.DataFrame]:
+    """Generates a synthetic job_analysis table block by block.
+
+    The table mirrors the structure of the scraped data: every advertisement (``MongoDB_ID``)
+    spans several rows, one per location and industry, while all other attributes and the
+    benefit flags are identical across its rows. Company sizes are fixed per company, companies
+    and job titles follow a long-tailed distribution, a share of the advertisements is offered
+    nationwide (``Bundesland == 'bundesweit'``) and benefit flags are sparse. Publication dates
+    are spread over ``monate`` months starting with ``startmonat``.
+
+    The output depends only on the arguments, so the same dataset can be regenerated anywhere.
+
+    Args:
+        zeilen (int): Total number of rows (between MIN_ROWS and MAX_ROWS).
+        seed (int, optional): Seed of the random generator. Defaults to DEFAULT_SEED.
+        startmonat (str, optional): First month in 'YYYY-MM' format. Defaults to DEFAULT_START_MONTH.
+        monate (int, optional): Number of months covered. Defaults to DEFAULT_MONTHS.
+        blockgroesse (int, optional): Approximate number of rows per block. Defaults to BLOCK_SIZE.
+
+    Yields:
+        pd.DataFrame: Consecutive blocks of the raw table; advertisements never span two blocks.
+
+    Raises:
+        ValueError: If the row count is outside the supported range.
+    """
+    if not MIN_ROWS <= zeilen <= MAX_ROWS:
+        raise ValueError(f"Zeilenanzahl muss zwischen {MIN_ROWS} und {MAX_ROWS} liegen: {zeilen}")
+
+    rng = np.random.default_rng(seed)
+    zeilen_je_anzeige = np.array(list(ROWS_PER_AD.keys()))
+    zeilen_gewichte = np.array(list(ROWS_PER_AD.values()))
+    zeilen_gewichte = zeilen_gewichte / zeilen_gewichte.sum()
+
+    # Companies scale with the number of advertisements; each has one size class
+    geschaetzte_anzeigen = int(zeilen / (zeilen_je_anzeige * zeilen_gewichte).sum())
+    unternehmen = np.array([f"Unternehmen {nummer}" for nummer in range(1, max(200, geschaetzte_anzeigen // 25) + 1)],
+                           dtype=object)
+    unternehmen_gewichte = _zipf_weights(len(unternehmen), exponent=0.9)
+    unternehmen_groesse = np.array(COMPANY_SIZE_ORDER, dtype=object)[
+        rng.choice(len(COMPANY_SIZE_ORDER), size=len(unternehmen), p=COMPANY_SIZE_WEIGHTS)]
+
+    titel = np.array(JOB_TITLES, dtype=object)
+    titel_gewichte = _zipf_weights(len(titel), exponent=0.8)
+    tage, tage_gewichte = _publication_days(startmonat, monate)
+
+    erzeugt, erste_anzeige = 0, 0
+    while erzeugt < zeilen:
+        # Draw advertisements until the block is full; the last one is cut at the total row count
+        anzahl = zeilen_je_anzeige[rng.choice(len(zeilen_je_anzeige), size=blockgroesse, p=zeilen_gewichte)]
+        ende = int(np.searchsorted(np.cumsum(anzahl), min(blockgroesse, zeilen - erzeugt)))
+        anzahl = anzahl[:ende + 1]
+        anzahl[-1] -= int(anzahl.sum()) - min(blockgroesse, zeilen - erzeugt)
+        anzeigen = len(anzahl)
+
+        # Attributes per advertisement
+        firma = rng.choice(len(unternehmen), size=anzeigen, p=unternehmen_gewichte)
+        anzeige = {
+            'MongoDB_ID': np.array([f"{nummer:024x}" for nummer in range(erste_anzeige, erste_anzeige + anzeigen)],
+                                   dtype=object),
+            'Job_Titel': titel[rng.choice(len(titel), size=anzeigen, p=titel_gewichte)],
+            'Unternehmen': unternehmen[firma],
+            'Portal_Name': _sample(rng, PORTAL_WEIGHTS, anzeigen),
+            'Datum': tage[rng.choice(len(tage), size=anzeigen, p=tage_gewichte)],
+            'Beschäftigungsart': _sample(rng, EMPLOYMENT_TYPE_WEIGHTS, anzeigen),
+            'Position': _sample(rng, POSITION_WEIGHTS, anzeigen),
+            'Zeitmodell': _sample(rng, WORKING_TIME_WEIGHTS, anzeigen),
+            'Berufserfahrung_vorausgesetzt': (rng.random(anzeigen) < 0.6).astype('int64'),
+            'Unternehmensgröße': unternehmen_groesse[firma]
+        }
+        for spalte in BENEFIT_COLUMNS:
+            anzeige[spalte] = (rng.random(anzeigen) < BENEFIT_SHARES[spalte]).astype('int64')
+        reichweite = rng.random(anzeigen)
+
+        # Expand to one row per location and industry
+        zeilen_anzeige = np.repeat(np.arange(anzeigen), anzahl)
+        block = {spalte: werte[zeilen_anzeige] for spalte, werte in anzeige.items()}
+        bundesland = _sample(rng, STATE_WEIGHTS, len(zeilen_anzeige))
+        bundesweit = (reichweite < NATIONWIDE_SHARE)[zeilen_anzeige]
+        oesterreich = (reichweite > 1 - AUSTRIA_SHARE)[zeilen_anzeige]
+        bundesland[bundesweit] = 'bundesweit'
+        bundesland[oesterreich] = 'Wien'
+        block['Bundesland'] = bundesland
+        block['Land'] = np.where(oesterreich, 'Österreich', 'Deutschland').astype(object)
+        block['Kategorie'] = _sample(rng, INDUSTRY_WEIGHTS, len(zeilen_anzeige))
+
+        yield pd.DataFrame(block, columns=COLUMNS)
+        erzeugt += len(zeilen_anzeige)
+        erste_anzeige += anzeigen
+
+
+def generate_job_analysis(zeilen: int, seed: int = DEFAULT_SEED, startmonat: str = DEFAULT_START_MONTH,
+                          monate: int = DEFAULT_MONTHS) -> pd.DataFrame:
+    """Generates a synthetic job_analysis table in memory (see :func:`generate_blocks`).
+
+    Returns:
+        pd.DataFrame: Raw table with the columns of the SQLite ``job_analysis`` table.
+    """
+    return pd.concat(list(generate_blocks(zeilen, seed, startmonat, monate)), ignore_index=True)
+
+
+def write_database(zielverzeichnis: str, zeilen: int, seed: int = DEFAULT_SEED,
+                   startmonat: str = DEFAULT_START_MONTH, monate: int = DEFAULT_MONTHS,
+                   snapshot: bool = False) -> dict:
+    """Writes a synthetic job_analysis database, its manifest and optionally its snapshot.
+
+    The directory has the layout of a local database source, so the dashboard can be started on
+    the synthetic data with ``DB_SOURCE=<zielverzeichnis>``, or built directly from it via
+    ``create_app(data_source=lambda: load_synthetic(zielverzeichnis))``.
+
+    Args:
+        zielverzeichnis (str): Directory receiving job_analysis.db and its manifest.
+        zeilen (int): Number of rows (between MIN_ROWS and MAX_ROWS).
+        seed (int, optional): Seed of the random generator. Defaults to DEFAULT_SEED.
+        startmonat (str, optional): First month in 'YYYY-MM' format. Defaults to DEFAULT_START_MONTH.
+        monate (int, optional): Number of months covered. Defaults to DEFAULT_MONTHS.
+        snapshot (bool, optional): Whether to also write the Parquet snapshot of the prepared
+            table into the directory. Defaults to False.
+
+    Returns:
+        dict: Report with the path, row and advertisement counts, checksum, snapshot path
+        and duration in seconds.
+    """
+    dateipfad = os.path.join(zielverzeichnis, DB_FILENAME)
+    start = time.perf_counter()
+    bericht = {'pfad': dateipfad, 'zeilen': 0, 'anzeigen': 0}
+
+    def schreiben(temp_pfad):
+        with sqlite3.connect(temp_pfad) as verbindung:
+            verbindung.execute("PRAGMA journal_mode=OFF")
+            verbindung.execute("PRAGMA synchronous=OFF")
+            for block in generate_blocks(zeilen, seed, startmonat, monate):
+                block.to_sql('job_analysis', verbindung, if_exists='append', index=False)
+                bericht['zeilen'] += len(block)
+                bericht['anzeigen'] += block['MongoDB_ID'].nunique()
+        verbindung.close()
+
+    bericht['sha256'] = write_local_source(zielverzeichnis, schreiben, f"synthetic-{zeilen}-seed{seed}")
+
+    bericht['snapshot'] = None
+    if snapshot:
+        bericht['snapshot'] = write_snapshot(read_and_prepare(dateipfad), bericht['sha256'], zielverzeichnis)
+    bericht['sekunden'] = round(time.perf_counter() - start, 1)
+    return bericht
+
+
+def load_synthetic(verzeichnis: str) -> pd.DataFrame:
+    """Loads the prepared DataFrame of a synthetic dataset written by :func:`write_database`.
+
+    The snapshot in the directory is used if it exists; otherwise the table is read from SQLite
+    and prepared. The checksum of the database is set as ``datenrahmen.attrs['version']``.
+
+    Args:
+        verzeichnis (str): Directory of the synthetic dataset.
+
+    Returns:
+        pd.DataFrame: The prepared DataFrame.
+    """
+    pruefsumme = local_source_checksum(verzeichnis)
+
+    datenrahmen = read_snapshot(pruefsumme, verzeichnis)
+    if datenrahmen is None:
+        datenrahmen = read_and_prepare(os.path.join(verzeichnis, DB_FILENAME))
+    datenrahmen.attrs['version'] = pruefsumme
+    return datenrahmen
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generates a synthetic job_analysis database.")
+    parser.add_argument('zeilen', type=parse_row_count,
+                        help=f"Number of rows, e.g. 250k or 10M ({MIN_ROWS} to {MAX_ROWS})")
+    parser.add_argument('--ziel', help="Target directory (default: src/cache/synthetic/<zeilen>)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Seed of the random generator")
+    parser.add_argument('--startmonat', default=DEFAULT_START_MONTH, help="First month (YYYY-MM)")
+    parser.add_argument('--monate', type=int, default=DEFAULT_MONTHS, help="Number of months covered")
+    parser.add_argument('--snapshot', action='store_true', help="Also write the Parquet snapshot")
+    argumente = parser.parse_args()
+
+    ziel = argumente.ziel or os.path.join(DEFAULT_TARGET_DIR, str(argumente.zeilen))
+    ergebnis = write_database(ziel, argumente.zeilen, argumente.seed, argumente.startmonat,
+                              argumente.monate, argumente.snapshot)
+    print(json.dumps(ergebnis, indent=2))